@@ -0,0 +1,99 @@
+"""Soak SeqTracker / StageDirector sequence tracking with millions of utterance ids.
+
+Simulates a long stream on a virtual clock: every utterance is split into 1-4 chunks
+(the last one final=True), with a few duplicated and reordered stragglers. Prints size
+and traced memory at checkpoints; both should stay flat once the tracker fills up.
+
+  python tests/soak_seq_tracker.py [--ids 2000000] [--rate 50] [--director 50000]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from veildaemon.event_bus import EventBus  # noqa: E402
+from veildaemon.stage_director import StageDirector  # noqa: E402
+from veildaemon.stage_director.seq_tracker import SeqTracker  # noqa: E402
+
+
+def soak_tracker(ids: int, rate: float, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    tracker = SeqTracker()
+    now = 0.0
+    step = 1.0 / rate
+    checkpoints = {ids * k // 10 for k in range(1, 11)}
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for i in range(ids):
+        uid = f"u{i}"
+        chunks = rng.randint(1, 4)
+        expiry = now + 5.0 if rng.random() < 0.8 else 0.0  # some plans carry no expiry
+        for seq in range(chunks):
+            assert tracker.accept(uid, seq, final=seq == chunks - 1, expiry_ts=expiry, now=now)
+            now += step
+        if rng.random() < 0.05:
+            # Straggler: a duplicate of an earlier chunk must be rejected
+            assert not tracker.accept(uid, 0, final=False, expiry_ts=expiry, now=now)
+        if i + 1 in checkpoints:
+            cur, peak = tracemalloc.get_traced_memory()
+            print(
+                f"[soak] ids={i + 1:>9,} size={len(tracker):>5} "
+                f"traced={cur / 1024:8.1f} KiB peak={peak / 1024:8.1f} KiB "
+                f"stream={now / 3600:5.1f} h"
+            )
+    dt = time.perf_counter() - t0
+    tracemalloc.stop()
+    print(f"[soak] {ids / dt:,.0f} ids/s; {tracker.stats()}")
+    assert tracker.peak <= tracker.max_ids
+
+
+async def soak_director(ids: int) -> None:
+    bus = EventBus()
+    speak = await bus.subscribe("speak", maxsize=1)
+    director = StageDirector(bus)
+    task = asyncio.create_task(director.run())
+    await asyncio.sleep(0)
+    exp = time.monotonic() + 3600
+    for i in range(ids):
+        plan = {
+            "utterance_id": f"d{i}",
+            "seq": 0,
+            "final": True,
+            "priority": 1,
+            "scene": "Gaming",
+            "budget_ms": 500,
+            "expiry_ts": exp,
+            "safe_mode": "clean",
+            "beats": ["banter"],
+            "text": "gg",
+        }
+        await bus.publish("utterance", plan)
+        if i % 16 == 15:
+            await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    task.cancel()
+    del speak
+    stats = director._seqs.stats()
+    print(f"[soak] director ids={ids:,} {stats}")
+    assert stats["size"] <= stats["max_ids"]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Soak the bounded sequence tracker")
+    ap.add_argument("--ids", type=int, default=2_000_000)
+    ap.add_argument("--rate", type=float, default=50.0, help="chunks per virtual second")
+    ap.add_argument("--director", type=int, default=50_000, help="ids through StageDirector")
+    args = ap.parse_args()
+    soak_tracker(args.ids, args.rate)
+    if args.director:
+        asyncio.run(soak_director(args.director))
+
+
+if __name__ == "__main__":
+    main()
@@ -60,6 +60,7 @@ def main():
     ap.add_argument("--debug", action="store_true")
     ap.add_argument("--train-cmd", type=str, default=None, help="Optional command to run after mining (e.g., a finetune script)")
     ap.add_argument("--vtt-map", type=str, default=None, help="Optional JSON mapping: {\"#channel\": \"https://.../captions.vtt\"}")
+    ap.add_argument("--bus-socket", type=str, default=None, help="Optional BusBridgeServer socket; watchers publish chat to it live")
     # Optional: HRM fine-tune on mined data (byte-level text dataset)
     ap.add_argument("--hrm-train", action="store_true", help="After mining, build text dataset and run a short HRM fine-tune")
     ap.add_argument("--hrm-data-out", type=str, default="data/text-sft-384", help="Output dir for HRM text dataset")
@@ -88,6 +89,8 @@ def main():
             "--limit", str(args.limit),
             "--max-viewers", str(args.max_viewers or 0),
         ]
+        if args.bus_socket:
+            watcher_args += ["--bus-socket", args.bus_socket]
 
         # Optionally start VTT watchers for known channels (if present in map)
         vtt_procs: list[subprocess.Popen] = []
@@ -0,0 +1,147 @@
+"""
+Micro-benchmark for veildaemon.event_bus.EventBus.
+
+fanout: publishes/sec across 50 channels with 1, 10 and 100 subscribers per channel,
+comparing the original single-lock bus ("before") against the current bus ("after").
+Each round publishes once to every channel; queues are drained between batches (untimed)
+so the numbers reflect fan-out cost rather than the queue-full eviction path.
+
+burst: end-to-end events/sec for Twitch-style recv bursts (a 4 KB read holds roughly
+10-40 PRIVMSGs), per-event publish + get versus publish_many + drain.
+
+Usage:
+  python tools/bench_event_bus.py [--mode all|fanout|burst] [--channels 50]
+      [--subs 1,10,100] [--batches 20] [--bursts 8,32,64]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from veildaemon.event_bus import EventBus, drain  # noqa: E402
+
+
+class LockedEventBus:
+    """Reference copy of the pre-change bus: one global lock around every publish."""
+
+    def __init__(self) -> None:
+        self._subs: Dict[str, List[asyncio.Queue]] = {}
+        self._latest: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+
+    async def publish(self, channel: str, payload: Any) -> None:
+        if not channel:
+            return
+        async with self._lock:
+            self._latest[channel] = payload
+            subs = list(self._subs.get(channel, []))
+        for q in subs:
+            try:
+                q.put_nowait(payload)
+            except asyncio.QueueFull:
+                try:
+                    _ = q.get_nowait()
+                except Exception:
+                    pass
+                try:
+                    q.put_nowait(payload)
+                except Exception:
+                    pass
+
+    async def subscribe(self, channel: str, maxsize: int = 32) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        async with self._lock:
+            self._subs.setdefault(channel, []).append(q)
+        return q
+
+    async def latest(self, channel: str) -> Optional[Any]:
+        async with self._lock:
+            return self._latest.get(channel)
+
+
+def _drain(queues: list[asyncio.Queue]) -> None:
+    for q in queues:
+        while not q.empty():
+            q.get_nowait()
+
+
+async def bench(bus_cls, channels: int, subs: int, batches: int, rounds: int = 16) -> float:
+    bus = bus_cls()
+    names = [f"chat.ch{i}" for i in range(channels)]
+    queues: list[asyncio.Queue] = []
+    for name in names:
+        for _ in range(subs):
+            queues.append(await bus.subscribe(name))
+    payload = {"risk": 0.3, "phase": "lane"}
+    elapsed = 0.0
+    total = 0
+    for _ in range(batches):
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for name in names:
+                await bus.publish(name, payload)
+        elapsed += time.perf_counter() - t0
+        total += rounds * channels
+        _drain(queues)
+    return total / max(elapsed, 1e-9)
+
+
+async def bench_burst(burst: int, batched: bool, subs: int = 3, events: int = 100_000) -> float:
+    bus = EventBus()
+    channel = "chat.#xqc.privmsg"
+    queues = [await bus.subscribe(channel, maxsize=burst * 2) for _ in range(subs)]
+    msgs = [{"user": f"u{i}", "text": "PogChamp"} for i in range(burst)]
+    rounds = max(1, events // burst)
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        if batched:
+            await bus.publish_many(channel, msgs)
+            for q in queues:
+                await drain(q, max_items=burst)
+        else:
+            for m in msgs:
+                await bus.publish(channel, m)
+            for q in queues:
+                for _ in range(burst):
+                    await q.get()
+    return rounds * burst / max(time.perf_counter() - t0, 1e-9)
+
+
+async def main_async(args) -> None:
+    if args.mode in ("all", "fanout"):
+        subs_list = [int(s) for s in args.subs.split(",") if s.strip()]
+        print(f"[fanout] channels={args.channels} batches={args.batches}")
+        print(f"{'subs':>6} {'before (pub/s)':>16} {'after (pub/s)':>16} {'speedup':>8}")
+        for subs in subs_list:
+            before = await bench(LockedEventBus, args.channels, subs, args.batches)
+            after = await bench(EventBus, args.channels, subs, args.batches)
+            print(f"{subs:>6} {before:>16,.0f} {after:>16,.0f} {after / before:>7.2f}x")
+    if args.mode in ("all", "burst"):
+        bursts = [int(b) for b in args.bursts.split(",") if b.strip()]
+        print("[burst] 3 subscribers, end-to-end publish -> consume")
+        print(f"{'burst':>6} {'per-event (ev/s)':>18} {'batched (ev/s)':>16} {'speedup':>8}")
+        for burst in bursts:
+            single = await bench_burst(burst, batched=False)
+            batched = await bench_burst(burst, batched=True)
+            print(f"{burst:>6} {single:>18,.0f} {batched:>16,.0f} {batched / single:>7.2f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="EventBus publish micro-benchmark")
+    ap.add_argument("--mode", choices=("all", "fanout", "burst"), default="all")
+    ap.add_argument("--channels", type=int, default=50)
+    ap.add_argument("--subs", default="1,10,100")
+    ap.add_argument("--batches", type=int, default=20)
+    ap.add_argument("--bursts", default="8,32,64")
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Compare dict utterance plans with stage_director.messages.UtterancePlan.
+
+memory: bytes retained per plan (tracemalloc), dict vs frozen slots dataclass.
+validate: the compiled schema_guard validator (single and batch) vs the old per-field
+loop over REQUIRED_FIELDS, on valid plans.
+hops: plans/sec through N in-process hops. The dict path re-validates and copies the
+plan at each hop (what a consumer must do to safely set "priority"); the typed path
+validates once at the edge and passes the same object along.
+director: end-to-end plans/sec through StageDirector fed dicts vs UtterancePlans,
+with the airtime governor out of the way so every plan is spoken.
+
+Usage:
+  python tools/bench_messages.py [--n 100000] [--hops 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from veildaemon.event_bus import EventBus  # noqa: E402
+from veildaemon.stage_director import StageDirector  # noqa: E402
+from veildaemon.stage_director.airtime import AirtimeGovernor  # noqa: E402
+from veildaemon.stage_director.messages import UtterancePlan  # noqa: E402
+from veildaemon.stage_director.schema_guard import (  # noqa: E402
+    REQUIRED_FIELDS,
+    validate_utterance_plan,
+    validate_utterance_plans,
+)
+
+
+def make_dicts(n: int) -> list[dict]:
+    exp = time.monotonic() + 3600
+    return [
+        {
+            "utterance_id": f"u{i}",
+            "seq": 0,
+            "final": True,
+            "priority": 1 + i % 5,
+            "scene": "Gaming",
+            "budget_ms": 900,
+            "expiry_ts": exp,
+            "safe_mode": "clean",
+            "beats": ["banter"],
+            "text": "gg that was close",
+        }
+        for i in range(n)
+    ]
+
+
+def measure_memory(n: int) -> None:
+    base = make_dicts(n)  # shared strings are allocated outside the measurement
+    tracemalloc.start()
+    snap0 = tracemalloc.take_snapshot()
+    dicts = [dict(d, beats=list(d["beats"])) for d in base]
+    snap1 = tracemalloc.take_snapshot()
+    plans = [UtterancePlan.from_dict(d) for d in base]
+    snap2 = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    d_bytes = sum(s.size_diff for s in snap1.compare_to(snap0, "filename"))
+    p_bytes = sum(s.size_diff for s in snap2.compare_to(snap1, "filename"))
+    print(f"[memory] n={n}")
+    print(f"  dict plan:     {d_bytes / n:7.1f} B/plan")
+    print(f"  UtterancePlan: {p_bytes / n:7.1f} B/plan ({p_bytes / d_bytes:.2f}x)")
+    del dicts, plans
+
+
+def _validate_loop(plan) -> bool:
+    # The validator as it was before it was compiled, for comparison
+    if not isinstance(plan, dict):
+        return False
+    for key, ftype in REQUIRED_FIELDS.items():
+        if key not in plan:
+            return False
+        if not isinstance(plan.get(key), ftype):
+            return False
+    return True
+
+
+def measure_validate(n: int) -> None:
+    base = make_dicts(n)
+    t0 = time.perf_counter()
+    for d in base:
+        _validate_loop(d)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for d in base:
+        validate_utterance_plan(d)
+    t_comp = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    validate_utterance_plans(base)
+    t_batch = time.perf_counter() - t0
+    print(f"[validate] n={n}")
+    print(f"  field loop: {n / t_loop:12,.0f} plans/s")
+    print(f"  compiled:   {n / t_comp:12,.0f} plans/s ({t_loop / t_comp:.2f}x)")
+    print(f"  batch:      {n / t_batch:12,.0f} plans/s ({t_loop / t_batch:.2f}x)")
+
+
+def measure_hops(n: int, hops: int) -> None:
+    base = make_dicts(n)
+    t0 = time.perf_counter()
+    for d in base:
+        p = d
+        for _ in range(hops):
+            if not validate_utterance_plan(p):
+                continue
+            p = dict(p)
+            p["priority"] = max(int(p.get("priority") or 1), 2)
+    t_dict = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for d in base:
+        p = UtterancePlan.from_dict(d)
+        for _ in range(hops):
+            prio = max(p.priority or 1, 2)
+            _ = prio
+    t_typed = time.perf_counter() - t0
+    print(f"[hops] n={n} hops={hops}")
+    print(f"  dict (validate+copy per hop): {n / t_dict:12,.0f} plans/s")
+    speedup = t_dict / t_typed
+    print(f"  typed (validate once):        {n / t_typed:12,.0f} plans/s ({speedup:.2f}x)")
+
+
+async def _director_rate(plans: list) -> float:
+    bus = EventBus()
+    speak = await bus.subscribe("speak", maxsize=0)
+    # Unmetered airtime: a governed director would shed most of the flood
+    director = StageDirector(bus, airtime=AirtimeGovernor(1e12, 1.0, burst_s=1e12))
+    task = asyncio.create_task(director.run())
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    # Batches fit the director's default utterance queue (32), so nothing is dropped
+    for i in range(0, len(plans), 16):
+        batch = plans[i : i + 16]
+        await bus.publish_many("utterance", batch)
+        while speak.qsize() < i + len(batch):
+            await asyncio.sleep(0)
+    dt = time.perf_counter() - t0
+    task.cancel()
+    return len(plans) / dt
+
+
+def measure_director(n: int) -> None:
+    dicts = make_dicts(n)
+    typed = [UtterancePlan.from_dict(d) for d in dicts]
+    r_dict = asyncio.run(_director_rate(dicts))
+    r_typed = asyncio.run(_director_rate(typed))
+    print(f"[director] n={n}")
+    print(f"  dict input:  {r_dict:12,.0f} plans/s")
+    print(f"  typed input: {r_typed:12,.0f} plans/s ({r_typed / r_dict:.2f}x)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark typed vs dict utterance plans")
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--hops", type=int, default=3)
+    args = ap.parse_args()
+    measure_memory(args.n)
+    measure_validate(args.n)
+    measure_hops(args.n, args.hops)
+    measure_director(min(args.n, 50_000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark StageDirector arbitration on the virtual-clock simulator.
+
+Replays a seeded random raid/donation/banter/beats trace (or the scripted boss-fight
+scenario) through stage_director.simulator and prints the report: decision latency,
+drops by reason, barge-ins, queueing delay and sustained utterances/sec. The trace is
+deterministic, so two runs differ only in the wall-clock numbers; compare a policy
+change by running before and after with the same --seed.
+
+--min-rate makes the run exit non-zero when throughput falls below it (CI guard).
+
+Usage:
+  python tools/bench_stage_director.py [--n 20000] [--rate 0.5] [--seed 0]
+                                       [--scenario] [--min-rate 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from veildaemon.stage_director.simulator import random_trace, scenario, simulate  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark StageDirector on a virtual clock")
+    ap.add_argument("--n", type=int, default=20_000, help="utterances in the random trace")
+    ap.add_argument("--rate", type=float, default=0.5, help="utterances per virtual second")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--stream-share", type=float, default=0.2)
+    ap.add_argument("--speed", type=float, default=1.0, help="TTS time per budget_ms")
+    ap.add_argument("--scenario", action="store_true", help="run the scripted boss fight")
+    ap.add_argument("--min-rate", type=float, default=0.0, help="fail below this utt/s")
+    args = ap.parse_args()
+    if args.scenario:
+        trace = scenario()
+    else:
+        trace = random_trace(args.n, rate=args.rate, seed=args.seed, stream_share=args.stream_share)
+    report = asyncio.run(simulate(trace, speed=args.speed))
+    print(json.dumps(report, indent=2))
+    if args.min_rate and report["utt_per_s"] < args.min_rate:
+        print(f"[bench] {report['utt_per_s']:,} utt/s is below --min-rate {args.min_rate:,.0f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
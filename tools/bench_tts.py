@@ -0,0 +1,132 @@
+"""
+TTS latency benchmark.
+
+piper: cold (a new Piper process per line, as _piper_bytes does) vs warm (one
+PiperPool worker per model) synthesis latency on a short and a long line. Needs
+PIPER_EXE and PIPER_MODEL (or --exe/--model).
+
+edge, elevenlabs: time to first audio of a buffered line (the whole MP3 has arrived)
+vs a streamed one (the first chunk has arrived and could be fed to the player).
+Needs network access, plus edge-tts or an ElevenLabs key and ELEVENLABS_VOICE.
+
+Nothing is played.
+
+Usage:
+  python tools/bench_tts.py [--reps 10] [--only piper,edge,elevenlabs]
+                            [--exe PATH] [--model PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from veildaemon.tts.manager import (  # noqa: E402
+    _edge_tts_stream,
+    _elevenlabs_stream,
+    _piper_bytes,
+)
+from veildaemon.tts.piper_pool import PiperPool  # noqa: E402
+
+LINES = {
+    "short": "GG, that was close.",
+    "long": (
+        "Welcome back, chat. We are three bosses deep, the healer just disconnected, "
+        "and somebody in the raid thought now was the perfect time to pull the next pack, "
+        "so grab a drink and let's see how long this lasts."
+    ),
+}
+
+
+def _summary(samples: list) -> str:
+    ms = sorted(s * 1000 for s in samples)
+    return (
+        f"p50 {statistics.median(ms):8.1f} ms  mean {statistics.fmean(ms):8.1f} ms  "
+        f"max {ms[-1]:8.1f} ms"
+    )
+
+
+async def bench_piper(exe: str, model: str, reps: int) -> None:
+    pool = PiperPool(exe)
+    t0 = time.perf_counter()
+    await pool.start(model)
+    print(f"[piper] warm-up (spawn + model load): {(time.perf_counter() - t0) * 1000:.1f} ms")
+    try:
+        for name, text in LINES.items():
+            cold, warm = [], []
+            for _ in range(reps):
+                t0 = time.perf_counter()
+                await _piper_bytes(text, exe, model)
+                cold.append(time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                await pool.synth_bytes(text, model)
+                warm.append(time.perf_counter() - t0)
+            print(f"[piper] {name} ({len(text.split())} words), {reps} reps")
+            print(f"  cold: {_summary(cold)}")
+            speedup = statistics.median(cold) / statistics.median(warm)
+            print(f"  warm: {_summary(warm)} ({speedup:.1f}x)")
+    finally:
+        await pool.close()
+
+
+def _stream_factory(backend: str):
+    if backend == "edge":
+        voice = os.environ.get("EDGE_VOICE", "en-US-JennyNeural")
+        rate = os.environ.get("EDGE_RATE", "+0%")
+        return lambda text: _edge_tts_stream(text, voice, rate, [], [])
+    voice = os.environ.get("ELEVENLABS_VOICE", "")
+    model = os.environ.get("ELEVENLABS_MODEL_ID", "eleven_multilingual_v2")
+    return lambda text: _elevenlabs_stream(text, voice, model)
+
+
+async def bench_stream(backend: str, reps: int) -> None:
+    stream = _stream_factory(backend)
+    for name, text in LINES.items():
+        first, whole, size = [], [], 0
+        for _ in range(reps):
+            t0 = time.perf_counter()
+            t_first = None
+            size = 0
+            async for chunk in stream(text):
+                if t_first is None:
+                    t_first = time.perf_counter() - t0
+                size += len(chunk)
+            whole.append(time.perf_counter() - t0)
+            first.append(t_first if t_first is not None else whole[-1])
+        print(f"[{backend}] {name} ({len(text.split())} words, {size} bytes), {reps} reps")
+        print(f"  buffered ttfa: {_summary(whole)}")
+        speedup = statistics.median(whole) / statistics.median(first)
+        print(f"  streamed ttfa: {_summary(first)} ({speedup:.1f}x)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark TTS synthesis latency")
+    ap.add_argument("--reps", type=int, default=10)
+    ap.add_argument("--only", default="piper,edge,elevenlabs")
+    ap.add_argument("--exe", default=os.environ.get("PIPER_EXE", ""))
+    ap.add_argument("--model", default=os.environ.get("PIPER_MODEL", ""))
+    args = ap.parse_args()
+    only = {b.strip() for b in args.only.split(",") if b.strip()}
+    if "piper" in only:
+        if args.exe and os.path.exists(args.exe) and args.model and os.path.exists(args.model):
+            asyncio.run(bench_piper(args.exe, args.model, args.reps))
+        else:
+            print("[piper] skipped: set PIPER_EXE and PIPER_MODEL (or --exe/--model)")
+    for backend in ("edge", "elevenlabs"):
+        if backend not in only:
+            continue
+        try:
+            asyncio.run(bench_stream(backend, args.reps))
+        except (ImportError, RuntimeError) as e:
+            print(f"[{backend}] skipped: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Replay a recorded EventBus log (veildaemon.event_bus.event_log) through a StageDirector.
+
+Useful for reproducing an arbitration decision from a live stream or for timing the
+director against real traffic. Recorded 'speak' events are skipped so the director's
+own output can be compared with what happened live, and so are 'speak.done' reports:
+they describe the live session's lines, not the replayed director's, and would drive
+its pacing, dead-air and hold queue.
+
+Usage:
+  python tools/replay_event_log.py LOG_DIR [--speed 1.0|0] [--start TS] [--end TS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from veildaemon.event_bus import EventBus  # noqa: E402
+from veildaemon.event_bus.event_log import EventLogReader, replay  # noqa: E402
+from veildaemon.stage_director import StageDirector  # noqa: E402
+
+
+async def main_async(args) -> None:
+    bus = EventBus()
+    director = StageDirector(bus)
+    speak = await bus.subscribe("speak", maxsize=0)
+    task = asyncio.create_task(director.run())
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    with EventLogReader(args.log_dir) as reader:
+        print(f"[replay] {len(reader)} records in {args.log_dir}")
+        n = await replay(
+            reader,
+            bus,
+            speed=args.speed,
+            start_ts=args.start,
+            end_ts=args.end,
+            skip=("speak", "speak.done"),
+        )
+    await asyncio.sleep(0.05)
+    task.cancel()
+    elapsed = time.perf_counter() - t0
+    spoken = []
+    while not speak.empty():
+        spoken.append(speak.get_nowait())
+    print(f"[replay] published {n} events in {elapsed:.3f}s; director spoke {len(spoken)}")
+    for plan in spoken[: args.show]:
+        print(f"  prio={plan.get('priority')} id={plan.get('utterance_id')} {plan.get('text')!r}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Replay an EventBus log through StageDirector")
+    ap.add_argument("log_dir")
+    ap.add_argument("--speed", type=float, default=1.0, help="1.0 = recorded pace, 0 = max")
+    ap.add_argument("--start", type=float, default=None, help="Start at this epoch timestamp")
+    ap.add_argument("--end", type=float, default=None, help="Stop after this epoch timestamp")
+    ap.add_argument("--show", type=int, default=20, help="Print the first N speak decisions")
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
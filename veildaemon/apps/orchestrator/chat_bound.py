@@ -31,11 +31,13 @@ class Message:
 
 
 class ChatBoundUI:
-    def __init__(self, root: Any, role: str = "whisper") -> None:
+    def __init__(self, root: Any, role: str = "whisper", bus: Any | None = None) -> None:
         tk, scrolledtext = _load_tkinter()
         self._tk = tk
         self.root = root
         self.role = role
+        # Optional EventBus; replies are published from the worker thread
+        self.bus = bus
         self.root.title("🜏 VeilDaemon — Chat")
         self.root.geometry("720x560")
         self.root.configure(bg="black")
@@ -99,6 +101,13 @@ class ChatBoundUI:
         reply = ask_daemon(self.role, prompt)
         self.conversation.append(Message("assistant", reply))
         self.root.after(0, lambda: self._insert("daemon", reply))
+        if self.bus is not None:
+            try:
+                self.bus.publish_threadsafe(
+                    "chat.ui.reply", {"role": self.role, "prompt": prompt, "text": reply}
+                )
+            except RuntimeError:
+                pass  # bus loop not running yet
 
 
 def main() -> None:
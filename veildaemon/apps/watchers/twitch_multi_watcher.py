@@ -67,8 +67,25 @@ def discover_channels(
         return CHANNELS
 
 
-def _watch_pass(targets: list[str], debug: bool, inactivity_seconds: int) -> list[dict]:
-    """Watch a list of channels once; skip a channel early if no chat for inactivity_seconds."""
+def _bus_publisher(path: str | None):
+    """Optional live feed into a BusBridgeServer (see veildaemon.event_bus.bridge)."""
+    if not path:
+        return None
+    try:
+        from veildaemon.event_bus.bridge import BridgePublisher
+
+        return BridgePublisher(path)
+    except Exception:
+        return None
+
+
+def _watch_pass(
+    targets: list[str], debug: bool, inactivity_seconds: int, bus=None
+) -> list[dict]:
+    """Watch a list of channels once; skip a channel early if no chat for inactivity_seconds.
+
+    With a bus publisher, each recv burst is also published live on chat.<#channel>.privmsg.
+    """
     log: list[dict] = []
     for channel in targets:
         if debug:
@@ -99,6 +116,7 @@ def _watch_pass(targets: list[str], debug: bool, inactivity_seconds: int) -> lis
                 break
             if not data:
                 continue
+            burst: list[dict] = []
             for line in data.split("\r\n"):
                 if not line:
                     continue
@@ -131,11 +149,14 @@ def _watch_pass(targets: list[str], debug: bool, inactivity_seconds: int) -> lis
                         if display and message:
                             entry = {"channel": chan, "user": display, "message": message}
                             log.append(entry)
+                            burst.append(entry)
                             last_msg_time = time.time()
                             if debug:
                                 print(f"[{chan}]{display}: {message[:140]}")
                     except Exception:
                         continue
+            if bus is not None and burst:
+                bus.publish_many(f"chat.{channel}.privmsg", burst)
         try:
             s.close()
         except Exception:
@@ -151,13 +172,15 @@ def watch_channels(
     max_viewers: int | None = 250,
     inactivity_seconds: int = 45,
     rediscover_on_inactive: bool = True,
+    bus_socket: str | None = None,
 ):
     targets = discover_channels(
         min_viewers=min_viewers, limit=limit, language=language, max_viewers=max_viewers
     )
     if debug:
         print(f"[DBG] rotating channels: {targets}")
-    log = _watch_pass(targets, debug=debug, inactivity_seconds=inactivity_seconds)
+    bus = _bus_publisher(bus_socket)
+    log = _watch_pass(targets, debug=debug, inactivity_seconds=inactivity_seconds, bus=bus)
 
     # If completely inactive, optionally rediscover once and try again
     if rediscover_on_inactive and not log:
@@ -167,7 +190,11 @@ def watch_channels(
         if debug:
             print(f"[DBG] re-discovered channels: {targets2}")
         if targets2:
-            log = _watch_pass(targets2, debug=debug, inactivity_seconds=inactivity_seconds)
+            log = _watch_pass(
+                targets2, debug=debug, inactivity_seconds=inactivity_seconds, bus=bus
+            )
+    if bus is not None:
+        bus.close()
 
     if log:
         try:
@@ -208,6 +235,12 @@ if __name__ == "__main__":
         help="Disable re-discovery on inactivity",
     )
     ap.set_defaults(rediscover_on_inactive=True)
+    ap.add_argument(
+        "--bus-socket",
+        type=str,
+        default=os.getenv("VEIL_BUS_SOCKET") or None,
+        help="Unix socket of a BusBridgeServer to publish chat bursts to live",
+    )
     args = ap.parse_args()
 
     PER_CHANNEL_SECONDS = args.seconds
@@ -221,4 +254,5 @@ if __name__ == "__main__":
         ),
         inactivity_seconds=args.inactive_seconds,
         rediscover_on_inactive=args.rediscover_on_inactive,
+        bus_socket=args.bus_socket,
     )
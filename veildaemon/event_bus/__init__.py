@@ -1,5 +1,23 @@
 import asyncio
-from typing import Any, Dict, List, Optional
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .history import RingHistory
+from .state import StateCell
+from .subscription import (
+    BLOCK,
+    COALESCE,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    POLICIES,
+    KeySpec,
+    Subscription,
+)
+from .topics import TopicTrie, is_pattern
+
+# Resolved-route cache cap; cleared wholesale when exceeded (channels are few in practice)
+_MAX_ROUTES = 4096
 
 
 class EventBus:
@@ -7,50 +25,363 @@ class EventBus:
 
     - publish(channel, payload): fan-out to subscribers, update latest
     - subscribe(channel): returns an asyncio.Queue that will receive future events
-    - latest(channel): returns the most recent payload or None
+    - latest(channel) / latest_nowait(channel): returns the most recent payload or None
+
+    Subscriber tables are kept per channel and swapped copy-on-write: subscribe and
+    unsubscribe install a fresh tuple, so publish iterates a stable snapshot without
+    taking a lock. All methods must be called from the loop that owns the queues, except
+    publish_threadsafe(), which is the entry point for other threads.
+
+    Each subscriber picks a backpressure policy (see `subscription.POLICIES`) and keeps
+    delivered/dropped/coalesced counters, readable via stats(q).
+
+    Channels are dot-separated topics. subscribe() also accepts patterns with `*` (one
+    segment) and `#` (any number of segments), e.g. ``chat.*.privmsg`` or ``beats.#``.
+    Patterns live in a TopicTrie; the subscribers for each concrete channel are resolved
+    once and cached until the subscription set changes.
+
+    enable_history(channel, capacity) keeps a ring of recent events with sequence
+    numbers; subscribe(channel, since=cursor) replays everything after cursor before
+    live delivery, so a restarted consumer can catch up.
+
+    State channels (declare_state) carry snapshots rather than events: watch(channel,
+    last_version) returns the newest (version, value) and skips intermediate versions,
+    so a slow reader never queues up stale snapshots.
     """
 
     def __init__(self) -> None:
-        self._subs: Dict[str, List[asyncio.Queue]] = {}
+        self._subs: Dict[str, Tuple[Subscription, ...]] = {}
+        self._patterns = TopicTrie()
+        self._routes: Dict[str, Tuple[Subscription, ...]] = {}
+        self._by_queue: Dict[asyncio.Queue, Subscription] = {}
         self._latest: Dict[str, Any] = {}
-        self._lock = asyncio.Lock()
+        self._history: Dict[str, RingHistory] = {}
+        self._state: Dict[str, StateCell] = {}
+        # publish_threadsafe() hand-off: producers append, the loop flushes once per wakeup
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ts_lock = threading.Lock()
+        self._ts_pending: deque = deque()
+        self._ts_armed = False
+        self._ts_wakeups = 0
+        # Block-policy deliveries still owed by a flush, kept alive until they finish
+        self._ts_blocked: set = set()
+        self._ts_failures = 0
+
+    def _resolve(self, channel: str) -> Tuple[Subscription, ...]:
+        subs = self._subs.get(channel, ())
+        if len(self._patterns):
+            subs = subs + tuple(s for s in self._patterns.match(channel) if s not in subs)
+        if len(self._routes) >= _MAX_ROUTES:
+            self._routes.clear()
+        self._routes[channel] = subs
+        return subs
+
+    def _invalidate(self, channel: str) -> None:
+        if is_pattern(channel):
+            self._routes.clear()
+        else:
+            self._routes.pop(channel, None)
 
     async def publish(self, channel: str, payload: Any) -> None:
         if not channel:
             return
-        async with self._lock:
-            self._latest[channel] = payload
-            subs = list(self._subs.get(channel, []))
-        # Don't hold the lock while putting
-        for q in subs:
-            try:
-                q.put_nowait(payload)
-            except asyncio.QueueFull:
-                try:
-                    _ = q.get_nowait()
-                except Exception:
-                    pass
+        blocked = self._fanout(channel, payload)
+        if blocked:
+            await asyncio.gather(*blocked)
+
+    def _fanout(self, channel: str, payload: Any) -> Optional[List[Any]]:
+        """Deliver without waiting; returns put coroutines owed to full block-policy queues."""
+        self._latest[channel] = payload
+        hist = self._history.get(channel)
+        seq = hist.append(payload) if hist is not None else 0
+        cell = self._state.get(channel)
+        if cell is not None:
+            cell.set(payload)
+        subs = self._routes.get(channel)
+        if subs is None:
+            subs = self._resolve(channel)
+        blocked = None
+        for sub in subs:
+            if sub._fast:
+                # Inlined common case: room in a drop-policy queue
                 try:
-                    q.put_nowait(payload)
-                except Exception:
+                    sub.queue.put_nowait(payload)
+                    sub.delivered += 1
+                    continue
+                except asyncio.QueueFull:
                     pass
+            if sub.with_topic:
+                item = (channel, payload)
+            elif sub.with_seq:
+                item = (seq, payload)
+            else:
+                item = payload
+            if not sub.offer(item):
+                if blocked is None:
+                    blocked = []
+                blocked.append(sub.put_blocking(item))
+        return blocked
 
-    async def subscribe(self, channel: str, maxsize: int = 32) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
-        async with self._lock:
-            self._subs.setdefault(channel, []).append(q)
-        return q
+    async def publish_many(self, channel: str, payloads: Iterable[Any]) -> None:
+        """Publish a burst in order, resolving routes once for the whole batch.
 
-    async def unsubscribe(self, channel: str, q: asyncio.Queue) -> None:
-        async with self._lock:
-            arr = self._subs.get(channel)
-            if not arr:
+        Equivalent to publishing each payload in turn; latest() ends on the last one.
+        """
+        if not channel:
+            return
+        items = payloads if isinstance(payloads, (list, tuple)) else list(payloads)
+        if not items:
+            return
+        blocked = self._fanout_many(channel, items)
+        if blocked:
+            await asyncio.gather(*blocked)
+
+    def _fanout_many(self, channel: str, items: List[Any]) -> Optional[List[Any]]:
+        self._latest[channel] = items[-1]
+        hist = self._history.get(channel)
+        seqs = [hist.append(p) for p in items] if hist is not None else None
+        cell = self._state.get(channel)
+        if cell is not None:
+            cell.set(items[-1])
+        subs = self._routes.get(channel)
+        if subs is None:
+            subs = self._resolve(channel)
+        blocked = None
+        tagged = numbered = None
+        for sub in subs:
+            batch = items
+            if sub.with_topic:
+                if tagged is None:
+                    tagged = [(channel, p) for p in items]
+                batch = tagged
+            elif sub.with_seq:
+                if numbered is None:
+                    numbered = list(zip(seqs or [0] * len(items), items))
+                batch = numbered
+            done = sub.offer_many(batch)
+            if done < len(batch):
+                if blocked is None:
+                    blocked = []
+                blocked.append(sub.put_blocking_many(batch[done:]))
+        return blocked
+
+    def bind_loop(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Pin the loop that publish_threadsafe() hands events to (default: running loop)."""
+        self._loop = loop or asyncio.get_running_loop()
+
+    def publish_threadsafe(self, channel: str, payload: Any) -> None:
+        """Publish from any thread (Tk callbacks, executor jobs, blocking watchers).
+
+        Submissions are queued and delivered on the bus loop in order; however many
+        arrive between loop iterations, they cost a single call_soon_threadsafe wakeup.
+        Block-policy subscribers that are full get their events from a follow-up task.
+        """
+        if not channel:
+            return
+        loop = self._loop
+        if loop is None:
+            raise RuntimeError("EventBus has no loop yet; call bind_loop() or subscribe() first")
+        with self._ts_lock:
+            self._ts_pending.append((channel, payload))
+            if self._ts_armed:
                 return
-            try:
-                arr.remove(q)
-            except ValueError:
-                pass
+            self._ts_armed = True
+        try:
+            loop.call_soon_threadsafe(self._flush_threadsafe)
+        except BaseException:
+            # Loop closed: disarm so a later bind_loop() can flush what is pending
+            with self._ts_lock:
+                self._ts_armed = False
+            raise
+
+    def _flush_threadsafe(self) -> None:
+        with self._ts_lock:
+            pending = self._ts_pending
+            self._ts_pending = deque()
+            self._ts_armed = False
+        self._ts_wakeups += 1
+        blocked: List[Any] = []
+        # Consecutive submissions to one channel go out as a single batch
+        run: List[Any] = []
+        run_channel = None
+        for channel, payload in pending:
+            if channel != run_channel and run:
+                blocked.extend(self._fanout_many(run_channel, run) or ())
+                run = []
+            run_channel = channel
+            run.append(payload)
+        if run:
+            blocked.extend(self._fanout_many(run_channel, run) or ())
+        if blocked:
+            fut = asyncio.gather(*blocked)
+            self._ts_blocked.add(fut)
+            fut.add_done_callback(self._blocked_done)
+
+    def _blocked_done(self, fut: asyncio.Future) -> None:
+        self._ts_blocked.discard(fut)
+        if not fut.cancelled() and fut.exception() is not None:
+            self._ts_failures += 1
+
+    async def subscribe(
+        self,
+        channel: str,
+        maxsize: int = 32,
+        *,
+        policy: str = DROP_OLDEST,
+        timeout: float = 0.05,
+        key: Optional[KeySpec] = None,
+        with_topic: bool = False,
+        since: Optional[int] = None,
+        with_seq: bool = False,
+    ) -> asyncio.Queue:
+        """Subscribe to future events on a channel or topic pattern.
+
+        policy: drop_oldest (default), drop_newest, block (waits up to `timeout`
+        seconds for room) or coalesce (pending items sharing `key` are replaced).
+        with_topic: queue (channel, payload) tuples instead of bare payloads.
+        since: replay history entries with seq > since first (history channels only);
+        entries already overwritten are counted as dropped.
+        with_seq: queue (seq, payload) tuples so the consumer can keep its cursor.
+        """
+        hist = self._history.get(channel)
+        if (since is not None or with_seq) and hist is None:
+            raise ValueError(f"channel {channel!r} has no history; call enable_history() first")
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        sub = Subscription(
+            channel,
+            maxsize,
+            policy=policy,
+            timeout=timeout,
+            key=key,
+            with_topic=with_topic,
+            with_seq=with_seq,
+        )
+        if since is not None and hist is not None:
+            backlog, missed = hist.since(since)
+            sub.dropped += missed
+            if with_topic:
+                backlog = [(channel, p) for _, p in backlog]
+            elif not with_seq:
+                backlog = [p for _, p in backlog]
+            # Replay without waiting; whatever a block-policy queue cannot take is lost
+            done = sub.offer_many(backlog)
+            sub.dropped += len(backlog) - done
+        if is_pattern(channel):
+            self._patterns.add(channel, sub)
+        else:
+            self._subs[channel] = self._subs.get(channel, ()) + (sub,)
+        self._by_queue[sub.queue] = sub
+        self._invalidate(channel)
+        return sub.queue
+
+    async def unsubscribe(self, channel: str, q: asyncio.Queue) -> None:
+        sub = self._by_queue.get(q)
+        if sub is None or sub.channel != channel:
+            return
+        del self._by_queue[q]
+        if is_pattern(channel):
+            self._patterns.remove(channel, sub)
+        else:
+            rest = tuple(s for s in self._subs.get(channel, ()) if s is not sub)
+            if rest:
+                self._subs[channel] = rest
+            else:
+                self._subs.pop(channel, None)
+        self._invalidate(channel)
+
+    def enable_history(self, channel: str, capacity: int = 256) -> None:
+        """Keep the last `capacity` events of a concrete channel for replay."""
+        if is_pattern(channel):
+            raise ValueError("history is per concrete channel, not per pattern")
+        if channel not in self._history:
+            self._history[channel] = RingHistory(capacity)
+
+    def seq(self, channel: str) -> int:
+        """Sequence number of the newest event on a history channel (0 if none)."""
+        hist = self._history.get(channel)
+        return hist.last_seq if hist is not None else 0
+
+    def history(self, channel: str, since: int = 0) -> List[Tuple[int, Any]]:
+        """(seq, payload) entries after `since` still held for channel."""
+        hist = self._history.get(channel)
+        return hist.since(since)[0] if hist is not None else []
+
+    def declare_state(self, channel: str) -> StateCell:
+        """Make channel a state channel (idempotent), seeded with its latest value."""
+        if is_pattern(channel):
+            raise ValueError("state channels are concrete, not patterns")
+        cell = self._state.get(channel)
+        if cell is None:
+            cur = self._latest.get(channel)
+            cell = self._state[channel] = StateCell(cur, 1 if channel in self._latest else 0)
+        return cell
+
+    async def watch(
+        self, channel: str, last_version: int = 0, timeout: Optional[float] = None
+    ) -> Tuple[int, Any]:
+        """Wait for a snapshot newer than last_version on a state channel.
+
+        Returns (version, value) immediately if one is already available; pass the
+        returned version back in on the next call. Declares the channel if needed.
+        """
+        return await self.declare_state(channel).wait_newer(last_version, timeout)
+
+    def snapshot(self, channel: str) -> Tuple[int, Any]:
+        """(version, value) of a state channel without waiting; (0, None) if undeclared."""
+        cell = self._state.get(channel)
+        return cell.snapshot() if cell is not None else (0, None)
+
+    def stats(self, q: asyncio.Queue) -> Optional[Dict[str, Any]]:
+        """Delivery counters for a subscriber queue, or None if it is not subscribed."""
+        sub = self._by_queue.get(q)
+        return sub.stats() if sub is not None else None
 
     async def latest(self, channel: str) -> Optional[Any]:
-        async with self._lock:
-            return self._latest.get(channel)
+        return self._latest.get(channel)
+
+    def latest_nowait(self, channel: str) -> Optional[Any]:
+        """Synchronous snapshot read; safe from any coroutine on the bus loop."""
+        return self._latest.get(channel)
+
+
+async def drain(
+    q: asyncio.Queue, max_items: int = 64, timeout: Optional[float] = None
+) -> List[Any]:
+    """Consumer-side batch read: wait up to `timeout` for the first item, then take
+    whatever else is already queued, up to max_items.
+
+    timeout=None waits indefinitely; timeout<=0 never waits. Returns [] on timeout.
+    """
+    out: List[Any] = []
+    if q.empty():
+        if timeout is not None and timeout <= 0:
+            return out
+        try:
+            if timeout is None:
+                out.append(await q.get())
+            else:
+                out.append(await asyncio.wait_for(q.get(), timeout))
+        except asyncio.TimeoutError:
+            return out
+    get = q.get_nowait
+    while len(out) < max_items:
+        try:
+            out.append(get())
+        except asyncio.QueueEmpty:
+            break
+    return out
+
+
+__all__ = [
+    "BLOCK",
+    "COALESCE",
+    "DROP_NEWEST",
+    "DROP_OLDEST",
+    "POLICIES",
+    "EventBus",
+    "StateCell",
+    "TopicTrie",
+    "drain",
+    "is_pattern",
+]
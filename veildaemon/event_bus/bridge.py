@@ -0,0 +1,360 @@
+"""Cross-process EventBus bridge over a Unix domain socket.
+
+The process that owns the real bus (typically the one running StageDirector) starts a
+BusBridgeServer. Other processes connect with BusBridgeClient (asyncio) or
+BridgePublisher (blocking sockets, for the Twitch/VTT watchers) and publish or
+subscribe as if the bus were local.
+
+Wire format: every frame is a 4-byte big-endian length followed by a compact JSON array.
+  client -> server: ["p", channel, payload]        publish
+                    ["m", channel, [payload, ...]]  publish_many
+                    ["s", sid, pattern]             subscribe (topic patterns allowed)
+                    ["u", sid]                      unsubscribe
+  server -> client: ["e", sid, [[channel, payload], ...]]  batched events for sid
+
+Payloads must be JSON-serialisable. A client subscribed to a channel it also publishes
+on receives its own events back, as with a local bus.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import EventBus, drain
+from .subscription import DROP_OLDEST, KeySpec, Subscription
+
+_HDR = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+_FORWARD_BATCH = 256
+
+
+class FrameTooLarge(ValueError):
+    """A frame exceeds MAX_FRAME; on the read side the stream can no longer be trusted."""
+
+
+def _to_wire(o: Any) -> Any:
+    # Typed messages (e.g. stage_director.messages) cross the socket as dicts
+    to_dict = getattr(o, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    raise TypeError(f"{type(o).__name__} is not JSON serializable")
+
+
+def encode_frame(msg: Any) -> bytes:
+    """Raises TypeError for non-JSON payloads and FrameTooLarge for oversized frames."""
+    text = json.dumps(msg, separators=(",", ":"), ensure_ascii=False, default=_to_wire)
+    body = text.encode("utf-8")
+    if len(body) > MAX_FRAME:
+        raise FrameTooLarge(f"frame too large ({len(body)} bytes)")
+    return _HDR.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Any:
+    """Read one frame; raises asyncio.IncompleteReadError at EOF.
+
+    An undecodable body raises json.JSONDecodeError after the whole frame has been
+    consumed, so the caller may skip it and keep reading.
+    """
+    (n,) = _HDR.unpack(await reader.readexactly(_HDR.size))
+    if n > MAX_FRAME:
+        raise FrameTooLarge(f"frame too large ({n} bytes)")
+    return json.loads(await reader.readexactly(n))
+
+
+class BusBridgeServer:
+    """Expose a local EventBus to other processes on a Unix socket path.
+
+    bad_frames counts client frames that were skipped (undecodable or malformed);
+    dropped counts events that could not be encoded for a subscriber and were skipped.
+    """
+
+    def __init__(self, bus: EventBus, path: str, *, forward_maxsize: int = 1024) -> None:
+        self.bus = bus
+        self.path = path
+        self.forward_maxsize = int(forward_maxsize)
+        self.bad_frames = 0
+        self.dropped = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._conns: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        try:
+            os.unlink(self.path)  # stale socket from a previous run
+        except FileNotFoundError:
+            pass
+        self._server = await asyncio.start_unix_server(self._on_client, path=self.path)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for t in list(self._conns):
+            t.cancel()
+        if self._conns:
+            await asyncio.gather(*self._conns, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def __aenter__(self) -> "BusBridgeServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        if task is not None:
+            self._conns.add(task)
+        subs: Dict[Any, Tuple[str, asyncio.Queue, asyncio.Task]] = {}
+        try:
+            while True:
+                try:
+                    msg = await read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError, FrameTooLarge):
+                    break  # EOF, or framing lost: drop the connection
+                except ValueError:
+                    self.bad_frames += 1  # undecodable body; framing is intact
+                    continue
+                try:
+                    await self._dispatch(msg, subs, writer)
+                except (IndexError, KeyError, TypeError, ValueError):
+                    self.bad_frames += 1
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for entry in subs.values():
+                await self._drop_sub(*entry)
+            writer.close()
+            if task is not None:
+                self._conns.discard(task)
+
+    async def _dispatch(self, msg: Any, subs: Dict[Any, Any], writer: asyncio.StreamWriter):
+        op = msg[0]
+        if op == "p":
+            if not isinstance(msg[1], str):
+                raise ValueError("bad publish frame")
+            await self.bus.publish(msg[1], msg[2])
+        elif op == "m":
+            if not (isinstance(msg[1], str) and isinstance(msg[2], list)):
+                raise ValueError("bad publish_many frame")
+            await self.bus.publish_many(msg[1], msg[2])
+        elif op == "s":
+            sid, pattern = msg[1], msg[2]
+            if not isinstance(pattern, str) or sid in subs:
+                raise ValueError("bad subscribe frame")
+            q = await self.bus.subscribe(pattern, maxsize=self.forward_maxsize, with_topic=True)
+            fwd = asyncio.create_task(self._forward(sid, q, writer))
+            subs[sid] = (pattern, q, fwd)
+        elif op == "u":
+            entry = subs.pop(msg[1], None)
+            if entry is not None:
+                await self._drop_sub(*entry)
+        else:
+            raise ValueError(f"unknown op {op!r}")
+
+    async def _drop_sub(self, pattern: str, q: asyncio.Queue, fwd: asyncio.Task) -> None:
+        fwd.cancel()
+        await self.bus.unsubscribe(pattern, q)
+
+    async def _forward(self, sid: Any, q: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                batch = await drain(q, max_items=_FORWARD_BATCH)
+                frames = self._encode_batch(sid, batch)
+                if not frames:
+                    continue
+                writer.writelines(frames)
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+
+    def _encode_batch(self, sid: Any, batch: list) -> List[bytes]:
+        """Encode a forward batch; events that cannot be sent are skipped and counted.
+
+        If the batch only fails as a whole (too large together), events go one per frame.
+        """
+        try:
+            return [encode_frame(["e", sid, batch])]
+        except (TypeError, ValueError):
+            pass
+        frames = []
+        for item in batch:
+            try:
+                frames.append(encode_frame(["e", sid, [item]]))
+            except (TypeError, ValueError):
+                self.dropped += 1
+        return frames
+
+
+class BusBridgeClient:
+    """asyncio client: publish to and subscribe from a remote BusBridgeServer.
+
+    subscribe() returns a local asyncio.Queue with the same policy options as
+    EventBus.subscribe; remote events are delivered into it by a reader task.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._rx: Optional[asyncio.Task] = None
+        self._subs: Dict[int, Subscription] = {}
+        self._sids: Dict[asyncio.Queue, int] = {}
+        self._next_sid = 0
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._rx = asyncio.create_task(self._read_loop())
+
+    async def close(self) -> None:
+        if self._rx is not None:
+            self._rx.cancel()
+            await asyncio.gather(self._rx, return_exceptions=True)
+            self._rx = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+            self._writer = None
+
+    async def __aenter__(self) -> "BusBridgeClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _send(self, msg: Any) -> None:
+        if self._writer is None:
+            raise RuntimeError("bridge client is not connected")
+        self._writer.write(encode_frame(msg))
+        await self._writer.drain()
+
+    async def publish(self, channel: str, payload: Any) -> None:
+        if channel:
+            await self._send(["p", channel, payload])
+
+    async def publish_many(self, channel: str, payloads: Iterable[Any]) -> None:
+        items = list(payloads)
+        if channel and items:
+            await self._send(["m", channel, items])
+
+    async def subscribe(
+        self,
+        channel: str,
+        maxsize: int = 32,
+        *,
+        policy: str = DROP_OLDEST,
+        timeout: float = 0.05,
+        key: Optional[KeySpec] = None,
+        with_topic: bool = False,
+    ) -> asyncio.Queue:
+        sub = Subscription(
+            channel, maxsize, policy=policy, timeout=timeout, key=key, with_topic=with_topic
+        )
+        sid = self._next_sid
+        self._next_sid += 1
+        self._subs[sid] = sub
+        self._sids[sub.queue] = sid
+        await self._send(["s", sid, channel])
+        return sub.queue
+
+    async def unsubscribe(self, channel: str, q: asyncio.Queue) -> None:
+        sid = self._sids.pop(q, None)
+        if sid is None:
+            return
+        self._subs.pop(sid, None)
+        await self._send(["u", sid])
+
+    def stats(self, q: asyncio.Queue) -> Optional[Dict[str, Any]]:
+        sid = self._sids.get(q)
+        sub = self._subs.get(sid) if sid is not None else None
+        return sub.stats() if sub is not None else None
+
+    async def _read_loop(self) -> None:
+        assert self._reader is not None
+        try:
+            while True:
+                msg = await read_frame(self._reader)
+                if msg[0] != "e":
+                    continue
+                sub = self._subs.get(msg[1])
+                if sub is None:
+                    continue  # unsubscribed while events were in flight
+                if sub.with_topic:
+                    items = [(ch, p) for ch, p in msg[2]]
+                else:
+                    items = [p for _, p in msg[2]]
+                done = sub.offer_many(items)
+                if done < len(items):
+                    await sub.put_blocking_many(items[done:])
+        except (asyncio.CancelledError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+class BridgePublisher:
+    """Blocking publish-only client for threads and plain-socket watchers.
+
+    Connection failures are swallowed and retried on the next publish, so a watcher
+    keeps running when the bus process is down.
+    """
+
+    def __init__(self, path: str, timeout: float = 1.0) -> None:
+        self.path = path
+        self.timeout = float(timeout)
+        self._sock: Optional[socket.socket] = None
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            s.settimeout(self.timeout)
+            s.connect(self.path)
+            self._sock = s
+        return self._sock
+
+    def _send(self, msg: Any) -> bool:
+        frame = encode_frame(msg)
+        try:
+            self._connect().sendall(frame)
+            return True
+        except OSError:
+            self.close()
+            return False
+
+    def publish(self, channel: str, payload: Any) -> bool:
+        return bool(channel) and self._send(["p", channel, payload])
+
+    def publish_many(self, channel: str, payloads: Iterable[Any]) -> bool:
+        items = list(payloads)
+        return bool(channel and items) and self._send(["m", channel, items])
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+
+__all__ = [
+    "MAX_FRAME",
+    "BridgePublisher",
+    "FrameTooLarge",
+    "BusBridgeClient",
+    "BusBridgeServer",
+    "encode_frame",
+    "read_frame",
+]
@@ -0,0 +1,300 @@
+"""Durable append-only log of EventBus traffic with memory-mapped replay.
+
+A log directory holds numbered segments. Each segment is a pair of files:
+  events-000001.log  records: <ts f64><payload_len u32><channel_len u16> channel payload
+  events-000001.idx  one <ts f64><offset u64> entry per record, in write order
+
+Timestamps are wall-clock seconds, clamped to be non-decreasing, so the index of a
+segment is sorted and a replay can binary-search its start position instead of
+scanning records. Payloads are stored as compact JSON.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from . import EventBus, drain
+
+_REC = struct.Struct("<dIH")
+_IDX = struct.Struct("<dQ")
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+
+Record = Tuple[float, str, Any]
+
+
+def _jsonable(o: Any) -> Any:
+    to_dict = getattr(o, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    return str(o)
+
+
+def _segment_paths(directory: Path) -> List[Tuple[Path, Path]]:
+    out = []
+    for log in sorted(directory.glob("events-*.log")):
+        out.append((log, log.with_suffix(".idx")))
+    return out
+
+
+def _last_index_ts(idx_path: Path) -> float:
+    try:
+        with open(idx_path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            whole = size - size % _IDX.size  # ignore a torn trailing entry
+            if whole < _IDX.size:
+                return 0.0
+            f.seek(whole - _IDX.size)
+            return _IDX.unpack(f.read(_IDX.size))[0]
+    except OSError:
+        return 0.0
+
+
+class EventLogWriter:
+    """Append records to the newest segment, rolling over at segment_bytes."""
+
+    def __init__(self, directory: str | os.PathLike, segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = int(segment_bytes)
+        self._log = None
+        self._idx = None
+        self._offset = 0
+        self._last_ts = 0.0
+        existing = _segment_paths(self.directory)
+        self._segment_no = 0
+        if existing:
+            self._segment_no = int(existing[-1][0].stem.split("-")[-1])
+            # Resume the clamp where the last run stopped, so a restart cannot write
+            # timestamps older than what the log already holds
+            self._last_ts = _last_index_ts(existing[-1][1])
+        self.records = 0
+
+    def _roll(self) -> None:
+        self._close_files()
+        self._segment_no += 1
+        stem = self.directory / f"events-{self._segment_no:06d}"
+        self._log = open(stem.with_suffix(".log"), "ab")
+        self._idx = open(stem.with_suffix(".idx"), "ab")
+        self._offset = 0
+
+    def append(self, channel: str, payload: Any, ts: Optional[float] = None) -> None:
+        if self._log is None or self._offset >= self.segment_bytes:
+            self._roll()
+        ts = float(time.time() if ts is None else ts)
+        if ts < self._last_ts:
+            ts = self._last_ts  # keep the index sortable across clock steps
+        self._last_ts = ts
+        ch = channel.encode("utf-8")
+        body = json.dumps(
+            payload, separators=(",", ":"), ensure_ascii=False, default=_jsonable
+        ).encode("utf-8")
+        self._log.write(_REC.pack(ts, len(body), len(ch)))
+        self._log.write(ch)
+        self._log.write(body)
+        self._idx.write(_IDX.pack(ts, self._offset))
+        self._offset += _REC.size + len(ch) + len(body)
+        self.records += 1
+
+    def flush(self) -> None:
+        # Log before index, so an index entry never points past durable data
+        if self._log is not None:
+            self._log.flush()
+        if self._idx is not None:
+            self._idx.flush()
+
+    def _close_files(self) -> None:
+        self.flush()
+        for f in (self._log, self._idx):
+            if f is not None:
+                f.close()
+        self._log = self._idx = None
+
+    def close(self) -> None:
+        self._close_files()
+
+
+class _Segment:
+    __slots__ = ("log", "idx", "count")
+
+    def __init__(self, log_path: Path, idx_path: Path) -> None:
+        with open(log_path, "rb") as f:
+            self.log = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(idx_path, "rb") as f:
+            self.idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = len(self.idx) // _IDX.size
+
+    def ts_at(self, i: int) -> float:
+        return _IDX.unpack_from(self.idx, i * _IDX.size)[0]
+
+    def lower_bound(self, ts: float) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ts_at(mid) < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def records(self, start: int = 0) -> Iterator[Record]:
+        log = self.log
+        size = len(log)
+        for i in range(start, self.count):
+            _, off = _IDX.unpack_from(self.idx, i * _IDX.size)
+            if off + _REC.size > size:
+                return  # index ahead of a torn tail write
+            ts, n_body, n_ch = _REC.unpack_from(log, off)
+            p = off + _REC.size
+            if p + n_ch + n_body > size:
+                return
+            channel = log[p : p + n_ch].decode("utf-8")
+            payload = json.loads(log[p + n_ch : p + n_ch + n_body])
+            yield ts, channel, payload
+
+    def close(self) -> None:
+        self.log.close()
+        self.idx.close()
+
+
+class EventLogReader:
+    """Memory-mapped reader over every segment in a log directory."""
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        self._segments: List[_Segment] = []
+        for log_path, idx_path in _segment_paths(Path(directory)):
+            try:
+                if log_path.stat().st_size and idx_path.stat().st_size:
+                    self._segments.append(_Segment(log_path, idx_path))
+            except (OSError, ValueError):
+                continue
+
+    def __enter__(self) -> "EventLogReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for seg in self._segments:
+            seg.close()
+        self._segments = []
+
+    def __len__(self) -> int:
+        return sum(s.count for s in self._segments)
+
+    def records(
+        self, start_ts: Optional[float] = None, end_ts: Optional[float] = None
+    ) -> Iterator[Record]:
+        """Yield (ts, channel, payload) in log order from start_ts up to end_ts."""
+        segs = self._segments
+        first = 0
+        if start_ts is not None:
+            # Last segment starting strictly before start_ts: records equal to start_ts
+            # may continue from it into the following segments
+            for i, seg in enumerate(segs):
+                if seg.count and seg.ts_at(0) < start_ts:
+                    first = i
+        for i in range(first, len(segs)):
+            seg = segs[i]
+            start = seg.lower_bound(start_ts) if (start_ts is not None and i == first) else 0
+            for rec in seg.records(start):
+                if end_ts is not None and rec[0] > end_ts:
+                    return
+                yield rec
+
+
+class EventRecorder:
+    """Subscribe to bus patterns and append everything that crosses them to a log."""
+
+    def __init__(
+        self,
+        bus: EventBus,
+        directory: str | os.PathLike,
+        patterns: Sequence[str] = ("#",),
+        *,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        maxsize: int = 4096,
+    ) -> None:
+        self.bus = bus
+        self.patterns = tuple(patterns)
+        self.maxsize = int(maxsize)
+        self.writer = EventLogWriter(directory, segment_bytes)
+        self._queues: List[Tuple[str, asyncio.Queue]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        for pat in self.patterns:
+            q = await self.bus.subscribe(pat, maxsize=self.maxsize, with_topic=True)
+            self._queues.append((pat, q))
+            self._tasks.append(asyncio.create_task(self._pump(q)))
+
+    async def _pump(self, q: asyncio.Queue) -> None:
+        while True:
+            batch = await drain(q, max_items=512)
+            for channel, payload in batch:
+                self.writer.append(channel, payload)
+            if q.empty():
+                self.writer.flush()
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for pat, q in self._queues:
+            # Write out anything still queued before closing
+            while not q.empty():
+                channel, payload = q.get_nowait()
+                self.writer.append(channel, payload)
+            await self.bus.unsubscribe(pat, q)
+        self._tasks, self._queues = [], []
+        self.writer.close()
+
+
+async def replay(
+    reader: EventLogReader,
+    bus: EventBus,
+    *,
+    speed: float = 1.0,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+    skip: Sequence[str] = (),
+) -> int:
+    """Publish recorded events onto bus; returns the number replayed.
+
+    speed=1.0 preserves the recorded spacing, 2.0 halves it, and speed<=0 replays as
+    fast as possible (yielding to the loop between records so consumers keep up).
+    Channels listed in `skip` are not republished.
+    """
+    loop = asyncio.get_running_loop()
+    t0 = base = None
+    n = 0
+    for ts, channel, payload in reader.records(start_ts, end_ts):
+        if channel in skip:
+            continue
+        if speed > 0:
+            if t0 is None:
+                t0, base = loop.time(), ts
+            delay = t0 + (ts - base) / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await bus.publish(channel, payload)
+        if speed <= 0:
+            await asyncio.sleep(0)
+        n += 1
+    return n
+
+
+__all__ = [
+    "DEFAULT_SEGMENT_BYTES",
+    "EventLogReader",
+    "EventLogWriter",
+    "EventRecorder",
+    "replay",
+]
@@ -0,0 +1,45 @@
+"""Fixed-size per-channel event history for EventBus replay."""
+
+from __future__ import annotations
+
+from typing import Any, List, Tuple
+
+
+class RingHistory:
+    """Preallocated ring of the last `capacity` payloads with sequence numbers.
+
+    Sequence numbers start at 1 and increase by one per append; the payload for seq
+    lives at slot seq % capacity, so appends only store a reference and never
+    allocate. A cursor of 0 means "nothing seen yet".
+    """
+
+    __slots__ = ("capacity", "last_seq", "_slots")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("history capacity must be positive")
+        self.capacity = int(capacity)
+        self.last_seq = 0
+        self._slots: List[Any] = [None] * self.capacity
+
+    def append(self, payload: Any) -> int:
+        seq = self.last_seq + 1
+        self._slots[seq % self.capacity] = payload
+        self.last_seq = seq
+        return seq
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest sequence number still held (last_seq + 1 when empty)."""
+        return max(1, self.last_seq - self.capacity + 1)
+
+    def since(self, cursor: int) -> Tuple[List[Tuple[int, Any]], int]:
+        """Entries with seq > cursor, oldest first, plus how many were already overwritten."""
+        first = self.first_seq
+        start = max(int(cursor) + 1, first)
+        missed = max(0, first - (int(cursor) + 1))
+        slots, cap = self._slots, self.capacity
+        return [(s, slots[s % cap]) for s in range(start, self.last_seq + 1)], missed
+
+
+__all__ = ["RingHistory"]
@@ -0,0 +1,56 @@
+"""Versioned latest-value cells for state channels such as 'beats'."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional, Tuple
+
+
+class StateCell:
+    """Newest snapshot of a state channel plus a version that bumps on every publish.
+
+    Watchers wait on one shared asyncio.Event, so memory per watcher is a single
+    pending future no matter how fast the producer publishes, and intermediate
+    versions are simply skipped.
+    """
+
+    __slots__ = ("version", "value", "_changed")
+
+    def __init__(self, value: Any = None, version: int = 0) -> None:
+        self.version = version
+        self.value = value
+        self._changed = asyncio.Event()
+
+    def set(self, value: Any) -> int:
+        self.version += 1
+        self.value = value
+        ev = self._changed
+        ev.set()  # wakes every current waiter...
+        ev.clear()  # ...and re-arms for the next publish
+        return self.version
+
+    def snapshot(self) -> Tuple[int, Any]:
+        return self.version, self.value
+
+    async def wait_newer(
+        self, last_version: int, timeout: Optional[float] = None
+    ) -> Tuple[int, Any]:
+        """Return (version, value) once version > last_version.
+
+        Raises asyncio.TimeoutError if timeout elapses first.
+        """
+        if timeout is None:
+            while self.version <= last_version:
+                await self._changed.wait()
+        else:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while self.version <= last_version:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(self._changed.wait(), remaining)
+        return self.version, self.value
+
+
+__all__ = ["StateCell"]
@@ -0,0 +1,211 @@
+"""Per-subscriber delivery policies and drop accounting for EventBus.
+
+Policies decide what happens when a subscriber's queue is full:
+  - drop_oldest: evict the oldest queued item to make room (default, legacy behavior)
+  - drop_newest: keep the queue as-is and discard the incoming item
+  - block: wait up to `timeout` seconds for room, then discard the incoming item
+  - coalesce: items sharing a key replace the pending one in place; a full queue of
+    distinct keys falls back to drop_oldest
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+COALESCE = "coalesce"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK, COALESCE)
+
+KeySpec = Union[str, Callable[[Any], Any]]
+
+
+class CoalescingQueue(asyncio.Queue):
+    """asyncio.Queue that holds at most one pending item per key, in arrival order."""
+
+    def __init__(self, maxsize: int = 0, *, key: KeySpec) -> None:
+        if isinstance(key, str):
+            field = key
+            self._key = lambda p: p.get(field) if isinstance(p, dict) else p
+        else:
+            self._key = key
+        super().__init__(maxsize=maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: Dict[Any, Any] = {}
+
+    def _put(self, item: Any) -> None:
+        k = self._key(item)
+        if k is None:
+            k = object()  # unkeyed items never coalesce
+        self._queue[k] = item
+
+    def _get(self) -> Any:
+        k = next(iter(self._queue))
+        return self._queue.pop(k)
+
+    def replace(self, item: Any) -> bool:
+        """Overwrite a pending item with the same key; False if none is pending."""
+        k = self._key(item)
+        if k is None or k not in self._queue:
+            return False
+        self._queue[k] = item
+        return True
+
+
+class Subscription:
+    """One subscriber's queue, policy and delivery counters.
+
+    with_topic=True delivers (channel, payload) tuples, which pattern subscribers need
+    to tell concrete channels apart; with_seq=True delivers (seq, payload) for channels
+    with history. The bus builds the tuple before offer().
+    """
+
+    __slots__ = (
+        "channel",
+        "queue",
+        "policy",
+        "timeout",
+        "delivered",
+        "dropped",
+        "coalesced",
+        "waiting",
+        "with_topic",
+        "with_seq",
+        "_fast",
+    )
+
+    def __init__(
+        self,
+        channel: str,
+        maxsize: int = 32,
+        *,
+        policy: str = DROP_OLDEST,
+        timeout: float = 0.05,
+        key: Optional[KeySpec] = None,
+        with_topic: bool = False,
+        with_seq: bool = False,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}; expected one of {POLICIES}")
+        if with_topic and with_seq:
+            raise ValueError("with_topic and with_seq are mutually exclusive")
+        if policy == COALESCE:
+            if key is None:
+                raise ValueError("coalesce policy requires a key (field name or callable)")
+            if with_topic or with_seq:
+                inner = key
+                if isinstance(inner, str):
+                    key = lambda item: item[1].get(inner) if isinstance(item[1], dict) else item[1]  # noqa: E731
+                else:
+                    key = lambda item: inner(item[1])  # noqa: E731
+            self.queue: asyncio.Queue = CoalescingQueue(maxsize=maxsize, key=key)
+        else:
+            self.queue = asyncio.Queue(maxsize=maxsize)
+        self.channel = channel
+        self.policy = policy
+        self.timeout = float(timeout)
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.waiting = 0
+        self.with_topic = bool(with_topic)
+        self.with_seq = bool(with_seq)
+        # Plain payloads into a drop-policy queue: eligible for the bus's inlined put
+        self._fast = policy in (DROP_OLDEST, DROP_NEWEST) and not (with_topic or with_seq)
+
+    def offer(self, payload: Any) -> bool:
+        """Deliver without waiting. Returns False only when a block-policy queue is full."""
+        q = self.queue
+        if self._fast:
+            try:
+                q.put_nowait(payload)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                if self.policy == DROP_OLDEST:
+                    q.get_nowait()
+                    q.put_nowait(payload)
+                    self.delivered += 1
+                return True
+            self.delivered += 1
+            return True
+        if self.waiting:
+            return False  # keep FIFO order behind publishers already blocked on this queue
+        if self.policy == COALESCE and q.replace(payload):
+            self.coalesced += 1
+            return True
+        try:
+            q.put_nowait(payload)
+        except asyncio.QueueFull:
+            if self.policy == BLOCK:
+                return False
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return True
+            q.get_nowait()
+            q.put_nowait(payload)
+        self.delivered += 1
+        return True
+
+    def offer_many(self, items: Sequence[Any]) -> int:
+        """Deliver a batch without waiting; returns how many items were handled.
+
+        Only a full block-policy queue stops short; the caller owes the rest to
+        put_blocking_many().
+        """
+        if self.policy in (DROP_OLDEST, DROP_NEWEST):
+            put = self.queue.put_nowait
+            ok = 0
+            for p in items:
+                try:
+                    put(p)
+                    ok += 1
+                except asyncio.QueueFull:
+                    self.offer(p)
+            self.delivered += ok
+            return len(items)
+        for i, p in enumerate(items):
+            if not self.offer(p):
+                return i
+        return len(items)
+
+    async def put_blocking_many(self, items: Sequence[Any]) -> None:
+        for p in items:
+            await self.put_blocking(p)
+
+    async def put_blocking(self, payload: Any) -> None:
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.queue.put(payload), self.timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            return
+        finally:
+            self.waiting -= 1
+        self.delivered += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channel": self.channel,
+            "policy": self.policy,
+            "maxsize": self.queue.maxsize,
+            "qsize": self.queue.qsize(),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "with_topic": self.with_topic,
+            "with_seq": self.with_seq,
+        }
+
+
+__all__ = [
+    "BLOCK",
+    "COALESCE",
+    "DROP_NEWEST",
+    "DROP_OLDEST",
+    "POLICIES",
+    "CoalescingQueue",
+    "Subscription",
+]
@@ -0,0 +1,101 @@
+"""Hierarchical topic matching for EventBus pattern subscriptions.
+
+Topics are dot-separated, e.g. ``chat.#xqc.privmsg``. In a subscription pattern a
+segment that is exactly ``*`` matches one segment and a segment that is exactly ``#``
+matches zero or more segments. Anything else is literal, so Twitch channel names such
+as ``#xqc`` never act as wildcards.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+SEP = "."
+ONE = "*"
+MANY = "#"
+
+
+def is_pattern(topic: str) -> bool:
+    return any(seg == ONE or seg == MANY for seg in topic.split(SEP))
+
+
+class _Node:
+    __slots__ = ("children", "subs")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.subs: List[Any] = []
+
+
+class TopicTrie:
+    """Pattern -> subscriber trie; match() walks one node per topic segment.
+
+    Literal segments are dict lookups, so a match costs O(depth) plus one extra branch
+    per wildcard node actually present along the path.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: str, sub: Any) -> None:
+        node = self._root
+        for seg in pattern.split(SEP):
+            nxt = node.children.get(seg)
+            if nxt is None:
+                nxt = node.children[seg] = _Node()
+            node = nxt
+        node.subs.append(sub)
+        self._size += 1
+
+    def remove(self, pattern: str, sub: Any) -> bool:
+        path = [self._root]
+        segs = pattern.split(SEP)
+        for seg in segs:
+            nxt = path[-1].children.get(seg)
+            if nxt is None:
+                return False
+            path.append(nxt)
+        leaf = path[-1]
+        try:
+            leaf.subs.remove(sub)
+        except ValueError:
+            return False
+        self._size -= 1
+        # Prune empty branches so dead patterns do not slow future matches
+        for i in range(len(segs) - 1, -1, -1):
+            node = path[i + 1]
+            if node.subs or node.children:
+                break
+            del path[i].children[segs[i]]
+        return True
+
+    def match(self, topic: str) -> List[Any]:
+        """Subscribers whose pattern matches topic, each listed once."""
+        out: List[Any] = []
+        if self._size:
+            self._walk(self._root, topic.split(SEP), 0, out)
+        # Overlapping wildcards (e.g. '#.#') can reach one leaf twice
+        return list(dict.fromkeys(out)) if len(out) > 1 else out
+
+    def _walk(self, node: _Node, segs: List[str], i: int, out: List[Any]) -> None:
+        many = node.children.get(MANY)
+        if many is not None:
+            # '#' absorbs segs[i:j] for every j, including the empty run
+            for j in range(i, len(segs) + 1):
+                self._walk(many, segs, j, out)
+        if i == len(segs):
+            out.extend(node.subs)
+            return
+        lit = node.children.get(segs[i])
+        if lit is not None:
+            self._walk(lit, segs, i + 1, out)
+        one = node.children.get(ONE)
+        if one is not None:
+            self._walk(one, segs, i + 1, out)
+
+
+__all__ = ["MANY", "ONE", "SEP", "TopicTrie", "is_pattern"]
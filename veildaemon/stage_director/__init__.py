@@ -1,20 +1,53 @@
+import asyncio
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from veildaemon.apps.bus.event_bus import EventBus
 
-from .schema_guard import validate_utterance_plan
+from .airtime import AirtimeGovernor
+from .barge_in import BargeInMeter
+from .chunk_assembler import ChunkAssembler
+from .hold_queue import HoldQueue
+from .messages import SpeakEvent, UtterancePlan, as_plan
+from .schema_guard import rejection_stats
+from .seq_tracker import SeqTracker
 
 
 class StageDirector:
     """Arbitrates utterances, priorities, and barge-in vs. hold.
 
     Inputs:
-      - beats snapshots on channel 'beats' from HRM control loop
+      - beats snapshots on channel 'beats' (beats_channel) from HRM control loop
       - utterance plans on channel 'utterance'
     Outputs:
-      - emits decided speech on channel 'speak' as {'text','priority','duration_ms','anim','overlay'}
+      - emits decided speech on channel 'speak' as a SpeakEvent (to_dict() for the dict shape)
+    Plans may arrive as UtterancePlan or as dicts, which are validated once on the way in.
     Policies are simple and configurable via constructor args.
+
+    'beats' is watched as a state channel: risk, phase and the speaking-block hysteresis
+    are updated as snapshots arrive (also while nothing is being said), so arbitrating an
+    utterance only reads local fields.
+
+    Plans gated out by boss phase or the speaking block are held (see HoldQueue) rather
+    than dropped, and re-emitted best first as soon as the block lifts (risk below
+    RISK_OFF) outside boss phase; plans whose expiry_ts passes while held are evicted.
+
+    'speak.done' (published by TTSManager when playback ends) clears the current line
+    and feeds dead-air stats. Once that feedback is flowing, a line that would not barge
+    in waits in the hold queue and starts the moment the previous one ends. A line that
+    never reports back is considered over after twice its budget_ms.
+
+    Streamed plans (several seqs of one utterance_id) go through a ChunkAssembler: each
+    complete sentence is arbitrated as soon as it exists, and later sentences of the line
+    being spoken are emitted as continuations (seq > 0) for TTS to append.
+
+    Every emitted line spends its estimated airtime (budget_ms, or its words at a
+    speaking rate) from an AirtimeGovernor; when airtime runs short, new lines are
+    shed lowest priority first instead of piling up in TTS.
+
+    A barge-in cancels the line on air synchronously through
+    HandleRegistry.cancel_nowait when tts_manager has one; arrival -> stopped and
+    arrival -> silent (its speak.done) latencies are kept as histograms (BargeInMeter).
     """
 
     RISK_ON = 0.45
@@ -22,94 +55,267 @@ class StageDirector:
     PRIO = {"raid": 5, "donation": 4, "near_miss": 3, "killstreak": 2, "banter": 1}
 
     def __init__(
-        self, bus: EventBus, risk_talk_threshold: float = 0.4, tts_manager: Any | None = None
+        self,
+        bus: EventBus,
+        risk_talk_threshold: float = 0.4,
+        tts_manager: Any | None = None,
+        *,
+        clock: Optional[Callable[[], float]] = None,
+        beats_channel: str = "beats",
+        airtime: Optional[AirtimeGovernor] = None,
     ) -> None:
         self.bus = bus
+        # Monotonic seconds, same base as expiry_ts; injectable for virtual-clock runs
+        self._clock = clock or time.monotonic
         self.risk_talk_threshold = float(risk_talk_threshold)
-        self._current: Optional[Dict[str, Any]] = None
+        self._current: Optional[SpeakEvent] = None
         self._tts_cancel_cb = None  # optional callback to cancel TTS
         self._speaking_blocked = False
-        # Track latest seq per utterance_id to drop stale chunks
-        self._latest_seq: Dict[str, int] = {}
+        # Beats state, kept current by _watch_beats()
+        self._risk = 0.0
+        self._phase = ""
+        self._beats_channel = beats_channel
+        self._beats_cell = bus.declare_state(beats_channel)
+        self._beats_version = 0
+        self._held = HoldQueue()
+        # Track latest seq per utterance_id to drop stale chunks (bounded, see SeqTracker)
+        self._seqs = SeqTracker()
+        self._assembler = ChunkAssembler()
         self._tts_manager = tts_manager
+        self._airtime = airtime if airtime is not None else AirtimeGovernor()
+        # Playback feedback ('speak.done'); pacing switches on with the first report
+        self._inflight: Dict[str, float] = {}  # utterance_id -> emitted at
+        self._paced = False
+        self._current_deadline = 0.0
+        self._idle_since: Optional[float] = None
+        self.dead_air_gaps = 0
+        self.dead_air_total = 0.0
+        self.last_gap = 0.0
+        # Plans discarded on arrival, by reason (held/expired/shed ones: see _held.stats();
+        # why invalid ones failed validation: rejection_stats())
+        self.drops = {"invalid": 0, "expired": 0, "stale": 0, "airtime": 0}
+        self.barge_ins = 0
+        self._barge = BargeInMeter()
+        self._arrived = 0.0  # perf_counter when the plan being decided arrived
 
     def set_tts_cancel(self, cb):
         self._tts_cancel_cb = cb
 
+    def _apply_beats(self, version: int, beats: Any) -> None:
+        self._beats_version = version
+        if isinstance(beats, dict):
+            try:
+                self._risk = float(beats.get("risk") or 0.0)
+            except (TypeError, ValueError):
+                self._risk = 0.0
+            self._phase = str(beats.get("phase") or "").lower()
+        else:
+            self._risk, self._phase = 0.0, ""
+        # Hysteresis for speaking block
+        if self._speaking_blocked:
+            if self._risk < self.RISK_OFF:
+                self._speaking_blocked = False
+        elif self._risk > self.RISK_ON:
+            self._speaking_blocked = True
+
+    def _sync_beats(self) -> None:
+        # Catch up on a snapshot published in the same loop turn as the utterance
+        cell = self._beats_cell
+        if cell.version != self._beats_version:
+            self._apply_beats(cell.version, cell.value)
+
+    async def _watch_beats(self) -> None:
+        while True:
+            version, beats = await self.bus.watch(self._beats_channel, self._beats_version)
+            await self._on_beats(version, beats)
+
+    async def _on_beats(self, version: int, beats: Any) -> None:
+        self._apply_beats(version, beats)
+        if len(self._held):
+            await self._release_held()
+
+    def _calm(self) -> bool:
+        return not self._speaking_blocked and self._phase != "boss"
+
+    def _line_playing(self, now: float) -> bool:
+        cur = self._current
+        if cur is None:
+            return False
+        if now >= self._current_deadline:
+            # No speak.done within the line's budget (lost report, TTS down): move on
+            self._inflight.pop(cur.utterance_id, None)
+            self._current = None
+            return False
+        return self._paced
+
+    async def _watch_done(self, q: asyncio.Queue) -> None:
+        while True:
+            done = await q.get()
+            uid = done.get("utterance_id") if isinstance(done, dict) else None
+            if uid:
+                await self._on_done(str(uid), self._clock())
+
+    async def _on_done(self, uid: str, now: float) -> None:
+        self._paced = True
+        self._inflight.pop(uid, None)
+        cur = self._current
+        if cur is not None and cur.utterance_id == uid:
+            self._current = None
+        self._barge.silent(uid, time.perf_counter())
+        if not self._inflight:
+            self._idle_since = now
+        if len(self._held):
+            await self._release_held()
+
+    async def _release_held(self) -> None:
+        now = self._clock()
+        self._held.expire(now)
+        while self._calm() and not self._line_playing(now):
+            nxt = self._held.pop(now)
+            if nxt is None:
+                break
+            plan, prio = nxt
+            self._arrived = time.perf_counter()  # on stage as of its release
+            await self._emit(SpeakEvent(plan, prio))
+
     async def run(self) -> None:
         q = await self.bus.subscribe("utterance")
-        while True:
-            plan = await q.get()
-            # Basic schema validation
-            if not validate_utterance_plan(plan):
-                continue
-            # Validate schema and sequence
-            utt_id = str(plan.get("utterance_id") or "")
-            seq = int(plan.get("seq") or 0)
-            exp_ts = float(plan.get("expiry_ts") or 0.0)  # monotonic epoch
-            prio = int(plan.get("priority") or 1)
-            if utt_id:
-                last_seq = self._latest_seq.get(utt_id, -1)
-                if seq <= last_seq:
-                    # stale chunk
-                    continue
-                self._latest_seq[utt_id] = seq
-            # Drop expired
-            try:
-                if exp_ts and time.monotonic() > exp_ts:
-                    continue
-            except Exception:
-                pass
-            beats = await self.bus.latest("beats") or {}
-            risk = float(beats.get("risk") or 0.0)
-            phase = str(beats.get("phase") or "")
-            # Hysteresis for speaking block
-            if self._speaking_blocked:
-                if risk < self.RISK_OFF:
-                    self._speaking_blocked = False
-            else:
-                if risk > self.RISK_ON:
-                    self._speaking_blocked = True
-            # Boss gate: allow only higher-priority quips (>=3)
-            allow = True
-            if phase.lower() == "boss" and prio < 3:
-                allow = False
-            if self._speaking_blocked and prio < 3:
-                allow = False
-            if not allow and prio < 4:
-                # Drop unless force
-                continue
-            # Infer priority from beats ladder
-            try:
-                beats_tags = plan.get("beats") or []
-                for b in beats_tags:
-                    prio = max(prio, self.PRIO.get(str(b), prio))
-                plan["priority"] = prio
-            except Exception:
-                pass
-            # Barge-in: cancel current if higher priority lands
-            if self._current is not None:
-                cur_prio = int(self._current.get("priority") or 1)
-                if prio > cur_prio:
-                    uid = self._current.get("utterance_id") or None
-                    # Prefer tts_manager.cancel(uid) if provided
-                    if uid and self._tts_manager and hasattr(self._tts_manager, "_handles"):
-                        try:
-                            import asyncio
-
-                            asyncio.create_task(self._tts_manager._handles.cancel(uid))
-                        except Exception:
-                            pass
-                    elif callable(self._tts_cancel_cb):
-                        try:
-                            if uid is not None:
-                                self._tts_cancel_cb(uid)
-                            else:
-                                self._tts_cancel_cb()
-                        except Exception:
-                            pass
-            self._current = plan
-            await self.bus.publish("speak", plan)
-
-
-__all__ = ["StageDirector"]
+        done_q = await self.bus.subscribe("speak.done", maxsize=256)
+        tasks = [
+            asyncio.create_task(self._watch_beats()),
+            asyncio.create_task(self._watch_done(done_q)),
+        ]
+        try:
+            while True:
+                await self._arbitrate(await q.get())
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    async def _arbitrate(self, raw: Any) -> None:
+        self._arrived = time.perf_counter()
+        plan = as_plan(raw)
+        if plan is None:
+            self.drops["invalid"] += 1
+            return
+        exp_ts = plan.expiry_ts  # monotonic epoch
+        # Drop expired
+        now = self._clock()
+        if exp_ts and now > exp_ts:
+            self.drops["expired"] += 1
+            return
+        # Validate sequence; drop stale chunks
+        utt_id = plan.utterance_id
+        if utt_id and not self._seqs.accept(
+            utt_id, plan.seq, final=plan.final, expiry_ts=exp_ts, now=now
+        ):
+            self.drops["stale"] += 1
+            return
+        units = self._assembler.feed(plan) if utt_id else (plan,)
+        for unit in units:
+            await self._decide(unit, now)
+
+    async def _decide(self, plan: UtterancePlan, now: float) -> None:
+        exp_ts = plan.expiry_ts
+        prio = plan.priority or 1
+        self._sync_beats()
+        if len(self._held) and self._calm():
+            await self._release_held()
+        # Boss gate: allow only higher-priority quips (>=3)
+        allow = True
+        if self._phase == "boss" and prio < 3:
+            allow = False
+        if self._speaking_blocked and prio < 3:
+            allow = False
+        # Infer priority from beats ladder
+        eff = prio
+        for b in plan.beats:
+            eff = max(eff, self.PRIO.get(str(b), eff))
+        if not allow and prio < 4:
+            # Hold for a calmer moment unless forced
+            self._held.push(plan, eff, exp_ts, now)
+            return
+        cur = self._current
+        if (
+            self._line_playing(now)
+            and eff <= cur.priority
+            and cur.utterance_id != plan.utterance_id
+        ):
+            # Not worth a barge-in: queue behind the line, released on its speak.done
+            self._held.push(plan, eff, exp_ts, now)
+            return
+        await self._emit(SpeakEvent(plan, eff))
+
+    async def _emit(self, event: SpeakEvent) -> None:
+        prio = event.priority
+        now = self._clock()
+        plan = event.plan
+        # Appended sentences of the line on air are paid for but never cut off mid-line
+        cur = self._current
+        cont = event.is_continuation and cur is not None and cur.utterance_id == plan.utterance_id
+        if not self._airtime.admit(
+            prio, self._airtime.cost(plan.text, plan.budget_ms), now, force=cont
+        ):
+            self.drops["airtime"] += 1
+            return
+        if self._idle_since is not None:
+            gap = now - self._idle_since
+            self._idle_since = None
+            self.dead_air_gaps += 1
+            self.dead_air_total += gap
+            self.last_gap = gap
+        self._line_playing(now)  # retire a current line that overran its budget
+        inflight = self._inflight
+        inflight[event.utterance_id] = now
+        if len(inflight) > 256:
+            del inflight[next(iter(inflight))]  # reports that never came
+        # Barge-in: cancel current if higher priority lands
+        if self._current is not None:
+            cur_prio = self._current.priority or 1
+            if prio > cur_prio:
+                uid = self._current.utterance_id or None
+                self.barge_ins += 1
+                stopped = False
+                handles = getattr(self._tts_manager, "_handles", None) if uid else None
+                # Prefer the tts_manager's registry, synchronously when it can
+                if handles is not None:
+                    try:
+                        if hasattr(handles, "cancel_nowait"):
+                            stopped = handles.cancel_nowait(uid)
+                        else:
+                            asyncio.create_task(handles.cancel(uid))
+                    except Exception:
+                        pass
+                elif callable(self._tts_cancel_cb):
+                    try:
+                        if uid is not None:
+                            self._tts_cancel_cb(uid)
+                            stopped = True
+                        else:
+                            self._tts_cancel_cb()
+                    except Exception:
+                        pass
+                if stopped:
+                    self._barge.stopped(uid, self._arrived, time.perf_counter())
+        self._current = event
+        self._current_deadline = now + max(1.0, 2.0 * event.plan.budget_ms / 1000.0)
+        await self.bus.publish("speak", event)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "speaking": self._current is not None,
+            "inflight": len(self._inflight),
+            "dead_air_gaps": self.dead_air_gaps,
+            "dead_air_total_s": round(self.dead_air_total, 3),
+            "last_gap_s": round(self.last_gap, 3),
+            "drops": dict(self.drops),
+            "barge_ins": self.barge_ins,
+            "barge_in_latency": self._barge.stats(),
+            "rejections": rejection_stats(),
+            "held": self._held.stats(),
+            "airtime": self._airtime.stats(),
+            "seqs": self._seqs.stats(),
+        }
+
+
+__all__ = ["SpeakEvent", "StageDirector", "UtterancePlan"]
@@ -0,0 +1,93 @@
+"""Airtime governor: a token bucket of speaking seconds.
+
+Every line the director emits costs its estimated airtime: its budget_ms, or words at
+a speaking rate (SPEAKING_WPS, ~150 words a minute) when that is longer. TTSManager's
+WPSMeter is no use here, it measures synthesis throughput rather than speech.
+The bucket refills at budget_s per window_s and holds at most burst_s, so however
+hyped chat gets, no more than burst_s + budget_s/window_s * t seconds of speech are
+ever handed to TTS and its queue stays bounded.
+
+Lower priorities must leave a reserve in the bucket (RESERVE, as a share of burst_s),
+so as airtime runs short banter is shed first, then killstreak callouts and so on,
+while raids and donations can still spend the last of it.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+# Words per second of speech, for lines longer than their budget
+SPEAKING_WPS = 2.5
+
+# priority -> share of the bucket that must remain after spending (>= 4: none)
+RESERVE: Dict[int, float] = {1: 0.5, 2: 0.3, 3: 0.1}
+
+
+class AirtimeGovernor:
+    """Token bucket of airtime seconds with priority-tiered reserves.
+
+    budget_s/window_s: sustained airtime allowed per window (0.75 = 45 s a minute).
+    burst_s: bucket size, i.e. the most speech that can be queued at once.
+    wps: speaking rate in words/sec used to estimate a line's duration.
+    min_cost: floor for one line, covering synthesis and gaps between lines.
+    """
+
+    def __init__(
+        self,
+        budget_s: float = 45.0,
+        window_s: float = 60.0,
+        *,
+        burst_s: float = 15.0,
+        wps: float = SPEAKING_WPS,
+        min_cost: float = 0.25,
+    ) -> None:
+        self.rate = float(budget_s) / float(window_s)
+        self.burst = float(burst_s)
+        self.min_cost = float(min_cost)
+        self.wps = float(wps)
+        self.tokens = self.burst
+        self._last: Optional[float] = None
+        self.admitted = 0
+        self.spent = 0.0
+        self.shed: Dict[int, int] = {}
+
+    def cost(self, text: str, budget_ms: int) -> float:
+        """Estimated airtime of a line in seconds."""
+        budget = budget_ms / 1000.0
+        est = budget
+        if self.wps > 0 and text:
+            est = max(est, (text.count(" ") + 1) / self.wps)
+            if budget > 0:
+                est = min(est, 2.0 * budget)  # the director gives up on a line after that
+        return max(self.min_cost, est)
+
+    def _refill(self, now: float) -> None:
+        last = self._last
+        if last is not None and now > last:
+            self.tokens = min(self.burst, self.tokens + (now - last) * self.rate)
+        if last is None or now > last:
+            self._last = now
+
+    def admit(self, priority: int, cost: float, now: float, *, force: bool = False) -> bool:
+        """Spend cost seconds if priority may; force always spends (may go negative)."""
+        self._refill(now)
+        reserve = RESERVE.get(priority, 0.0 if priority > 3 else RESERVE[1]) * self.burst
+        if not force and self.tokens - cost < reserve:
+            if priority < 4 or self.tokens <= 0:
+                self.shed[priority] = self.shed.get(priority, 0) + 1
+                return False
+        self.tokens -= cost
+        self.spent += cost
+        self.admitted += 1
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "tokens_s": round(self.tokens, 3),
+            "admitted": self.admitted,
+            "spent_s": round(self.spent, 3),
+            "shed": dict(self.shed),
+        }
+
+
+__all__ = ["AirtimeGovernor", "RESERVE", "SPEAKING_WPS"]
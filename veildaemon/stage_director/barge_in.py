@@ -0,0 +1,97 @@
+"""Barge-in latency: how fast a higher-priority plan silences the line on air.
+
+For every barge-in the director notes when the interrupting plan arrived, when the
+old line's stopper had run (HandleRegistry.cancel_nowait returns after it), and when
+TTS reported the old line over on 'speak.done'. The two spans, arrival -> stopped and
+arrival -> silent, go into fixed-bucket histograms; one frame at 60 fps is ~16.7 ms.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+# Upper bucket bounds in ms; the last bucket is open-ended
+BOUNDS_MS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.7, 33.3, 66.7, 125.0, 250.0, 500.0, 1000.0)
+
+
+class LatencyHistogram:
+    """Counts of latencies (seconds in, ms buckets out) with approximate percentiles."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds_ms: Sequence[float] = BOUNDS_MS) -> None:
+        self.bounds = tuple(bounds_ms)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (ms) of the bucket holding the q-th latency; max if open-ended."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def stats(self) -> Dict[str, Any]:
+        buckets = {f"le_{b:g}": n for b, n in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class BargeInMeter:
+    """Pairs each barge-in with the speak.done of the line it cut off."""
+
+    def __init__(self, max_pending: int = 64) -> None:
+        self.to_stop = LatencyHistogram()
+        self.to_silent = LatencyHistogram()
+        self.max_pending = int(max_pending)
+        self._pending: "OrderedDict[str, float]" = OrderedDict()  # cut-off uid -> arrival
+        self.unconfirmed = 0  # stopped lines that never reported silence
+
+    def stopped(self, utterance_id: str, arrived: float, stopped: float) -> None:
+        self.to_stop.add(stopped - arrived)
+        self._pending[utterance_id] = arrived
+        if len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.unconfirmed += 1
+
+    def silent(self, utterance_id: str, now: float) -> Optional[float]:
+        arrived = self._pending.pop(utterance_id, None)
+        if arrived is None:
+            return None
+        self.to_silent.add(now - arrived)
+        return now - arrived
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "arrival_to_stop": self.to_stop.stats(),
+            "arrival_to_silent": self.to_silent.stats(),
+            "awaiting_silence": len(self._pending),
+            "unconfirmed": self.unconfirmed,
+        }
+
+
+__all__ = ["BOUNDS_MS", "BargeInMeter", "LatencyHistogram"]
@@ -0,0 +1,103 @@
+"""Stitch streamed utterance chunks into sentence-sized speaking units.
+
+An LLM reply arrives on 'utterance' as consecutive seqs of one utterance_id, each
+carrying a few tokens. Voicing every fragment separately sounds choppy, while waiting
+for final=True delays the first audio by the whole reply. The assembler buffers the
+text per utterance and cuts a unit as soon as a sentence ends (or the buffer grows past
+max_chars), so the first sentence can go to TTS while the rest is still being written.
+
+Units are UtterancePlans of the same utterance_id, renumbered seq 0, 1, 2, ... with
+final=True on the last one; unit seq > 0 means "append to the line already playing".
+"""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, List
+
+from .messages import UtterancePlan
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by space
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+|\n+")
+
+
+class _Open:
+    __slots__ = ("buf", "units")
+
+    def __init__(self) -> None:
+        self.buf = ""
+        self.units = 0
+
+
+class ChunkAssembler:
+    """Per-utterance text buffers; feed() returns the units ready to speak.
+
+    min_chars: do not cut a unit shorter than this (keeps "Hi." from being its own line).
+    max_chars: cut at the last space once a sentence runs this long without ending.
+    max_open: utterances buffered at once; beyond it the least recently fed is dropped.
+    """
+
+    def __init__(self, min_chars: int = 12, max_chars: int = 160, max_open: int = 256) -> None:
+        self.min_chars = int(min_chars)
+        self.max_chars = int(max_chars)
+        self.max_open = int(max_open)
+        self._open: "OrderedDict[str, _Open]" = OrderedDict()
+        self.units = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def feed(self, plan: UtterancePlan) -> List[UtterancePlan]:
+        uid = plan.utterance_id
+        st = self._open.get(uid)
+        if st is None:
+            if plan.final and plan.seq == 0:
+                # Whole line in one plan: nothing to assemble
+                self.units += 1
+                return [plan]
+            st = self._open[uid] = _Open()
+            if len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._open.move_to_end(uid)
+        st.buf += plan.text  # streamed tokens carry their own spacing
+        texts = self._cut(st)
+        if plan.final:
+            rest = st.buf.strip()
+            if rest:
+                texts.append(rest)
+            del self._open[uid]
+        out = []
+        for i, text in enumerate(texts):
+            last = plan.final and i == len(texts) - 1
+            out.append(replace(plan, seq=st.units, final=last, text=text))
+            st.units += 1
+        self.units += len(out)
+        return out
+
+    def _cut(self, st: _Open) -> List[str]:
+        out = []
+        buf = st.buf
+        start = 0
+        for m in _SENTENCE_END.finditer(buf):
+            if m.end() - start >= self.min_chars:
+                out.append(buf[start : m.end()].strip())
+                start = m.end()
+        while len(buf) - start > self.max_chars:
+            cut = buf.rfind(" ", start, start + self.max_chars)
+            if cut <= start:
+                cut = start + self.max_chars
+            out.append(buf[start:cut].strip())
+            start = cut
+        st.buf = buf[start:]
+        return [t for t in out if t]
+
+    def stats(self) -> Dict[str, int]:
+        return {"open": len(self._open), "units": self.units, "evicted": self.evicted}
+
+
+__all__ = ["ChunkAssembler"]
@@ -0,0 +1,183 @@
+"""Hold queue for plans the director cannot voice yet (boss phase, high risk).
+
+Held plans are ordered on a heap by (priority desc, expiry_ts asc) and released best
+first once the stage is calm again. Expiry is tracked separately on a hashed timer
+wheel: each plan is filed under the tick its expiry falls in, and advancing the wheel
+only visits the slots for ticks that have passed, so eviction is O(1) amortized per
+plan instead of a heap scan. Expired entries are only marked dead on the heap and are
+skipped (and periodically compacted) when popping.
+
+All methods take `now` explicitly (monotonic seconds, same base as expiry_ts) so the
+queue can run on a virtual clock.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Held:
+    __slots__ = ("priority", "expiry", "item", "alive")
+
+    def __init__(self, priority: int, expiry: float, item: Any) -> None:
+        self.priority = priority
+        self.expiry = expiry
+        self.item = item
+        self.alive = True
+
+
+class HoldQueue:
+    """Bounded priority hold queue with timer-wheel expiry.
+
+    capacity: most plans held at once; when full, the lowest-priority (then soonest
+    to expire) plan is shed to make room, or the incoming one if it is no better.
+    max_hold: upper bound on how long any plan is held, even with a later expiry_ts.
+    tick/slots: wheel resolution and size; expiries beyond one revolution wait in
+    their slot for the right round.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 64,
+        *,
+        max_hold: float = 10.0,
+        tick: float = 0.1,
+        slots: int = 128,
+    ) -> None:
+        self.capacity = int(capacity)
+        self.max_hold = float(max_hold)
+        self.tick = float(tick)
+        self._heap: List[Tuple[int, float, int, _Held]] = []
+        self._wheel: List[List[_Held]] = [[] for _ in range(int(slots))]
+        self._cursor: Optional[int] = None  # last tick the wheel was advanced to
+        self._order = 0
+        self._live = 0
+        self.held = 0
+        self.released = 0
+        self.expired = 0
+        self.shed = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _tick_of(self, ts: float) -> int:
+        return math.ceil(ts / self.tick)
+
+    def push(self, item: Any, priority: int, expiry_ts: float, now: float) -> bool:
+        """Hold item; returns False if it was shed or has already expired."""
+        self.expire(now)
+        expiry = now + self.max_hold
+        if expiry_ts and expiry_ts < expiry:
+            expiry = float(expiry_ts)
+        if expiry <= now:
+            self.expired += 1
+            return False
+        if self._live >= self.capacity and not self._shed_for(priority, expiry):
+            self.shed += 1
+            return False
+        h = _Held(int(priority), expiry, item)
+        self._order += 1
+        heapq.heappush(self._heap, (-h.priority, expiry, self._order, h))
+        t = self._tick_of(expiry)
+        if self._cursor is not None and t <= self._cursor:
+            t = self._cursor + 1  # never file behind the cursor
+        self._wheel[t % len(self._wheel)].append(h)
+        self._live += 1
+        self.held += 1
+        return True
+
+    def _shed_for(self, priority: int, expiry: float) -> bool:
+        # Rare path (queue full): linear scan for the weakest live plan
+        worst: Optional[_Held] = None
+        for _, _, _, h in self._heap:
+            if h.alive and (
+                worst is None
+                or h.priority < worst.priority
+                or (h.priority == worst.priority and h.expiry < worst.expiry)
+            ):
+                worst = h
+        if worst is None or (worst.priority, worst.expiry) >= (priority, expiry):
+            return False
+        self._kill(worst)
+        self.shed += 1
+        return True
+
+    def _kill(self, h: _Held) -> None:
+        h.alive = False
+        h.item = None
+        self._live -= 1
+
+    def expire(self, now: float) -> int:
+        """Advance the wheel to now and drop every plan whose expiry has passed."""
+        target = self._tick_of(now) - 1  # last tick that lies entirely in the past
+        if self._cursor is None:
+            self._cursor = target
+            return 0
+        if target <= self._cursor:
+            return 0
+        n = 0
+        wheel = self._wheel
+        size = len(wheel)
+        start = self._cursor + 1
+        # A gap longer than one revolution visits each slot once
+        for t in range(start, min(target, start + size - 1) + 1):
+            slot = wheel[t % size]
+            if not slot:
+                continue
+            keep = []
+            for h in slot:
+                if not h.alive:
+                    continue
+                if h.expiry <= now:
+                    self._kill(h)
+                    n += 1
+                else:
+                    keep.append(h)  # later round of the wheel
+            wheel[t % size] = keep
+        self._cursor = target
+        self.expired += n
+        if len(self._heap) > 2 * self._live + 16:
+            self._compact()
+        return n
+
+    def _compact(self) -> None:
+        self._heap = [e for e in self._heap if e[3].alive]
+        heapq.heapify(self._heap)
+
+    def pop(self, now: float) -> Optional[Tuple[Any, int]]:
+        """Best live (item, priority) that has not expired, or None."""
+        self.expire(now)
+        heap = self._heap
+        while heap:
+            _, expiry, _, h = heapq.heappop(heap)
+            if not h.alive:
+                continue
+            item = h.item
+            self._kill(h)
+            if expiry <= now:
+                self.expired += 1  # inside the current, not yet swept tick
+                continue
+            self.released += 1
+            return item, h.priority
+        return None
+
+    def clear(self) -> None:
+        for _, _, _, h in self._heap:
+            if h.alive:
+                self._kill(h)
+        self._heap = []
+        self._wheel = [[] for _ in self._wheel]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self._live,
+            "held": self.held,
+            "released": self.released,
+            "expired": self.expired,
+            "shed": self.shed,
+        }
+
+
+__all__ = ["HoldQueue"]
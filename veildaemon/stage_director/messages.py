@@ -0,0 +1,136 @@
+"""Typed, immutable messages for the 'utterance' and 'speak' channels.
+
+Plans are validated once, when built from a dict at a process edge (bridge, event log,
+plugin packs); in-process hops pass the same frozen object to every subscriber, so no
+hop re-validates or defensively copies it and no subscriber can mutate another's view.
+
+Both types keep a read-only ``get(key, default)`` so consumers written against the dict
+shape keep working, and ``to_dict()`` restores that shape for JSON edges.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields, replace
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .schema_guard import REQUIRED_FIELDS, rejection_reason
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class UtterancePlan:
+    """One chunk of a planned line, as produced by the brain/plugins on 'utterance'.
+
+    extra holds any keys beyond REQUIRED_FIELDS (anim, overlay, ...) as a read-only
+    mapping.
+    """
+
+    utterance_id: str
+    seq: int
+    final: bool
+    priority: int
+    scene: str
+    budget_ms: int
+    expiry_ts: float
+    safe_mode: str
+    beats: Tuple[str, ...]
+    text: str
+    extra: Mapping[str, Any] = field(default_factory=lambda: _EMPTY, compare=False)
+
+    @classmethod
+    def from_dict(cls, d: Any) -> "UtterancePlan":
+        """Validate and convert a dict plan; raises ValueError if it does not validate.
+
+        The error message ends with the rejection reason, e.g. "(type:seq)".
+        """
+        reason = rejection_reason(d)
+        if reason is not None:
+            raise ValueError(f"invalid utterance plan ({reason})")
+        extra = _EMPTY
+        if len(d) > len(REQUIRED_FIELDS):
+            extra = MappingProxyType({k: v for k, v in d.items() if k not in REQUIRED_FIELDS})
+        return cls(
+            d["utterance_id"],
+            d["seq"],
+            d["final"],
+            d["priority"],
+            d["scene"],
+            d["budget_ms"],
+            float(d["expiry_ts"]),
+            d["safe_mode"],
+            tuple(d["beats"]),
+            d["text"],
+            extra,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = dict(self.extra)
+        for name in _PLAN_FIELDS:
+            out[name] = getattr(self, name)
+        out["beats"] = list(self.beats)
+        return out
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _PLAN_FIELD_SET:
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+    def with_priority(self, priority: int) -> "UtterancePlan":
+        return self if priority == self.priority else replace(self, priority=priority)
+
+
+@dataclass(frozen=True, slots=True)
+class SpeakEvent:
+    """A decided line on 'speak': the plan plus the priority arbitration settled on."""
+
+    plan: UtterancePlan
+    priority: int
+
+    @property
+    def utterance_id(self) -> str:
+        return self.plan.utterance_id
+
+    @property
+    def text(self) -> str:
+        return self.plan.text
+
+    @property
+    def is_continuation(self) -> bool:
+        """A later unit of an assembled utterance: append to the line already playing."""
+        return self.plan.seq > 0
+
+    @classmethod
+    def from_dict(cls, d: Any) -> "SpeakEvent":
+        plan = UtterancePlan.from_dict(d)
+        return cls(plan, plan.priority)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = self.plan.to_dict()
+        out["priority"] = self.priority
+        return out
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "priority":
+            return self.priority
+        return self.plan.get(key, default)
+
+
+_PLAN_FIELDS = tuple(f.name for f in fields(UtterancePlan) if f.name != "extra")
+_PLAN_FIELD_SET = frozenset(_PLAN_FIELDS)
+
+
+def as_plan(obj: Any) -> Optional[UtterancePlan]:
+    """UtterancePlan for a typed or dict plan; None if a dict plan does not validate."""
+    if isinstance(obj, UtterancePlan):
+        return obj
+    if isinstance(obj, dict):
+        try:
+            return UtterancePlan.from_dict(obj)
+        except ValueError:
+            return None
+    return None
+
+
+__all__ = ["SpeakEvent", "UtterancePlan", "as_plan"]
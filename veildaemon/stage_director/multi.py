@@ -0,0 +1,251 @@
+"""Many streams arbitrated by one director engine over a shared EventBus.
+
+Co-hosted channels share one process and one bus. Each stream gets its own lane, a
+StageDirector holding that stream's arbitration state (current line, beats hysteresis,
+hold queue, seq tracking, pacing), created on the stream's first plan. Plans are keyed
+by their "stream_id" field, falling back to scene; per-stream beats snapshots go to
+the state channel 'beats.<stream>'. Decided lines still go out on the shared 'speak'
+channel (the plan keeps its stream_id for TTS routing), and 'speak.done' reports are
+routed back to the lane that emitted the utterance.
+
+Scheduling is round-robin: the shared 'utterance' queue is drained into per-stream
+backlogs and each stream with work gets `quantum` plans per round, so a stream that
+floods (a raid, a replay gone wrong) only lengthens its own backlog instead of the
+wait of every other stream. Each backlog is bounded; past it the oldest plan of that
+stream is dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from veildaemon.apps.bus.event_bus import EventBus
+
+from . import StageDirector
+from .messages import UtterancePlan, as_plan
+
+
+def _channel_safe(stream: str) -> str:
+    # Topic separators and wildcards cannot appear inside one segment
+    return stream.replace(".", "_").replace("*", "_").replace("#", "_")
+
+
+class _Lane:
+    __slots__ = ("stream", "director", "backlog", "latency", "overflow", "task", "decided")
+
+    def __init__(self, stream: str, director: StageDirector) -> None:
+        self.stream = stream
+        self.director = director
+        self.backlog: Deque[Tuple[float, UtterancePlan]] = deque()
+        self.latency: Deque[float] = deque(maxlen=512)  # recent intake -> decision, s
+        self.overflow = 0
+        self.decided = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class MultiStageDirector:
+    """Per-stream StageDirector lanes with fair round-robin scheduling.
+
+    key: plan field naming the stream (scene is used when it is missing).
+    max_streams: lanes kept at once; the least recently active idle lane is retired.
+    quantum: plans a stream may decide per round.
+    batch: plans decided before yielding to the event loop.
+    backlog: plans queued per stream before its oldest are dropped.
+    fair: False decides in arrival order instead (for comparison).
+    Remaining keyword args (risk_talk_threshold, tts_manager, ...) go to every lane;
+    each lane gets its own AirtimeGovernor unless one is passed as airtime=, which
+    then rations a single voice across all streams.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        *,
+        key: str = "stream_id",
+        max_streams: int = 256,
+        quantum: int = 1,
+        batch: int = 128,
+        backlog: int = 64,
+        fair: bool = True,
+        clock: Optional[Callable[[], float]] = None,
+        **director_kwargs: Any,
+    ) -> None:
+        self.bus = bus
+        self.key = key
+        self.max_streams = int(max_streams)
+        self.quantum = max(1, int(quantum))
+        self.batch = max(1, int(batch))
+        self.backlog = int(backlog)
+        self.fair = bool(fair)
+        self._clock = clock or time.monotonic
+        self._director_kwargs = director_kwargs
+        self._lanes: "OrderedDict[str, _Lane]" = OrderedDict()  # recency order
+        self._ready: Deque[_Lane] = deque()  # lanes with a backlog, in service order
+        self._fifo: Deque[Tuple[_Lane, float, UtterancePlan]] = deque()  # fair=False
+        self._owner: "OrderedDict[str, _Lane]" = OrderedDict()  # utterance_id -> lane
+        self._running = False
+        self.invalid = 0
+        self.retired = 0
+
+    def __len__(self) -> int:
+        return len(self._lanes)
+
+    def stream_of(self, plan: UtterancePlan) -> str:
+        sid = plan.get(self.key)
+        return str(sid) if sid else plan.scene
+
+    def lane(self, stream: str) -> StageDirector:
+        """The director for stream, created (and its beats watched) on first use."""
+        return self._lane(stream).director
+
+    def _lane(self, stream: str) -> _Lane:
+        lane = self._lanes.get(stream)
+        if lane is not None:
+            self._lanes.move_to_end(stream)
+            return lane
+        director = StageDirector(
+            self.bus,
+            clock=self._clock,
+            beats_channel=f"beats.{_channel_safe(stream)}",
+            **self._director_kwargs,
+        )
+        lane = self._lanes[stream] = _Lane(stream, director)
+        if self._running:
+            lane.task = asyncio.create_task(director._watch_beats())
+        if len(self._lanes) > self.max_streams:
+            self._retire(stream)
+        return lane
+
+    def _retire(self, keep: str) -> None:
+        # Oldest lane with nothing queued; if every lane is busy, keep them all
+        for sid, lane in self._lanes.items():
+            if not lane.backlog and sid != keep:
+                break
+        else:
+            return
+        del self._lanes[sid]
+        if lane.task is not None:
+            lane.task.cancel()
+        self.retired += 1
+
+    def _admit(self, raw: Any, now: float) -> None:
+        plan = as_plan(raw)
+        if plan is None:
+            self.invalid += 1
+            return
+        lane = self._lane(self.stream_of(plan))
+        if plan.utterance_id:
+            owner = self._owner
+            owner[plan.utterance_id] = lane
+            owner.move_to_end(plan.utterance_id)
+            if len(owner) > 4096:
+                owner.popitem(last=False)
+        if not self.fair:
+            self._fifo.append((lane, now, plan))
+            return
+        if not lane.backlog:
+            self._ready.append(lane)
+        elif len(lane.backlog) >= self.backlog:
+            lane.backlog.popleft()
+            lane.overflow += 1
+        lane.backlog.append((now, plan))
+
+    def _intake(self, q: asyncio.Queue) -> None:
+        now = time.perf_counter()
+        while not q.empty():
+            self._admit(q.get_nowait(), now)
+
+    async def _decide(self, lane: _Lane, t_in: float, plan: UtterancePlan) -> None:
+        await lane.director._arbitrate(plan)
+        lane.latency.append(time.perf_counter() - t_in)
+        lane.decided += 1
+
+    async def _serve(self, q: asyncio.Queue) -> None:
+        # Up to `batch` decisions, taking in new arrivals between rounds
+        budget = self.batch
+        if not self.fair:
+            fifo = self._fifo
+            while fifo and budget:
+                lane, t_in, plan = fifo.popleft()
+                await self._decide(lane, t_in, plan)
+                budget -= 1
+            return
+        ready = self._ready
+        while ready and budget > 0:
+            for _ in range(len(ready)):
+                lane = ready.popleft()
+                for _ in range(self.quantum):
+                    if not lane.backlog:
+                        break
+                    t_in, plan = lane.backlog.popleft()
+                    await self._decide(lane, t_in, plan)
+                    budget -= 1
+                if lane.backlog:
+                    ready.append(lane)
+            self._intake(q)
+
+    async def _watch_done(self, q: asyncio.Queue) -> None:
+        while True:
+            done = await q.get()
+            uid = done.get("utterance_id") if isinstance(done, dict) else None
+            lane = self._owner.get(str(uid)) if uid else None
+            if lane is not None:
+                await lane.director._on_done(str(uid), self._clock())
+
+    async def run(self) -> None:
+        q = await self.bus.subscribe("utterance", maxsize=1024)
+        done_q = await self.bus.subscribe("speak.done", maxsize=256)
+        self._running = True
+        for lane in self._lanes.values():
+            lane.task = asyncio.create_task(lane.director._watch_beats())
+        done_task = asyncio.create_task(self._watch_done(done_q))
+        try:
+            while True:
+                if not (self._ready or self._fifo):
+                    self._admit(await q.get(), time.perf_counter())
+                self._intake(q)
+                await self._serve(q)
+                await asyncio.sleep(0)  # let publishers, TTS and watchers run
+        finally:
+            self._running = False
+            done_task.cancel()
+            for lane in self._lanes.values():
+                if lane.task is not None:
+                    lane.task.cancel()
+                    lane.task = None
+
+    def stats(self) -> Dict[str, Any]:
+        streams = {}
+        for sid, lane in self._lanes.items():
+            st = lane.director.stats()
+            lat = list(lane.latency)
+            streams[sid] = {
+                "decided": lane.decided,
+                "backlog": len(lane.backlog),
+                "overflow": lane.overflow,
+                "latency_p50_ms": round(_pct(lat, 0.50) * 1000, 3),
+                "latency_p99_ms": round(_pct(lat, 0.99) * 1000, 3),
+                "speaking": st["speaking"],
+                "drops": st["drops"],
+                "barge_ins": st["barge_ins"],
+                "held": st["held"]["size"],
+            }
+        return {
+            "streams": len(self._lanes),
+            "retired": self.retired,
+            "invalid": self.invalid,
+            "per_stream": streams,
+        }
+
+
+__all__ = ["MultiStageDirector"]
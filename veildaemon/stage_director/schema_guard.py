@@ -1,11 +1,21 @@
 """Lightweight schema guard for utterance plans.
 
 Validates shape and basic types to keep StageDirector robust.
+
+The checks are compiled once from REQUIRED_FIELDS into a single function with one
+unrolled lookup and type test per field (exact-class fast path, isinstance fallback),
+so validating a plan makes no allocations and no per-field loop or calls. A rejected
+plan yields a reason string, "<kind>" or "<kind>:<field>":
+  not_a_dict      the plan is not a dict
+  missing:<key>   a required key is absent
+  type:<key>      a required key has the wrong type
+Reasons are interned constants and are counted per reason (see rejection_stats()).
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple, Union
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 FieldType = Union[type, Tuple[type, ...]]
 REQUIRED_FIELDS: Dict[str, FieldType] = {
@@ -21,11 +31,52 @@ REQUIRED_FIELDS: Dict[str, FieldType] = {
     "text": str,
 }
 
+NOT_A_DICT = "not_a_dict"
+
+_MISSING = object()
+_rejections: Counter = Counter()
+
+
+def compile_validator(spec: Dict[str, FieldType]) -> Callable[[Any], Optional[str]]:
+    """Build check(plan) -> None if plan matches spec, else the rejection reason."""
+    ns: Dict[str, Any] = {"_MISSING": _MISSING, "NOT_A_DICT": NOT_A_DICT}
+    src = [
+        "def check(d):",
+        "    if d.__class__ is not dict and not isinstance(d, dict):",
+        "        return NOT_A_DICT",
+        "    get = d.get",
+    ]
+    for i, (key, ftype) in enumerate(spec.items()):
+        types = ftype if isinstance(ftype, tuple) else (ftype,)
+        ns[f"T{i}"] = types
+        ns[f"M{i}"] = f"missing:{key}"
+        ns[f"W{i}"] = f"type:{key}"
+        exact = []
+        for j, t in enumerate(types):
+            ns[f"C{i}_{j}"] = t
+            exact.append(f"c is not C{i}_{j}")
+        src += [
+            f"    v = get({key!r}, _MISSING)",
+            "    if v is _MISSING:",
+            f"        return M{i}",
+            "    c = v.__class__",
+            f"    if {' and '.join(exact)} and not isinstance(v, T{i}):",
+            f"        return W{i}",
+        ]
+    src.append("    return None")
+    exec(compile("\n".join(src), f"<validator {len(spec)} fields>", "exec"), ns)
+    return ns["check"]
+
+
+_check = compile_validator(REQUIRED_FIELDS)
+
 
-def _is_instance(v: Any, t: FieldType) -> bool:
-    if isinstance(t, tuple):
-        return isinstance(v, t)
-    return isinstance(v, t)
+def rejection_reason(plan: Any) -> Optional[str]:
+    """None if plan is valid, else why it is not (counted in rejection_stats())."""
+    reason = _check(plan)
+    if reason is not None:
+        _rejections[reason] += 1
+    return reason
 
 
 def validate_utterance_plan(plan: Any) -> bool:
@@ -33,14 +84,39 @@ def validate_utterance_plan(plan: Any) -> bool:
 
     Any extra keys are allowed; only presence and basic typing are checked.
     """
-    if not isinstance(plan, dict):
-        return False
-    for key, ftype in REQUIRED_FIELDS.items():
-        if key not in plan:
-            return False
-        if not _is_instance(plan.get(key), ftype):
-            return False
-    return True
+    reason = _check(plan)
+    if reason is None:
+        return True
+    _rejections[reason] += 1
+    return False
+
+
+def validate_utterance_plans(plans: Iterable[Any]) -> List[Optional[str]]:
+    """Rejection reason (None when valid) for each plan, in order."""
+    check = _check
+    out = [check(p) for p in plans]
+    for reason in out:
+        if reason is not None:
+            _rejections[reason] += 1
+    return out
+
+
+def rejection_stats() -> Dict[str, int]:
+    """Rejected plans per reason since start (or the last reset), process-wide."""
+    return dict(_rejections)
+
+
+def reset_rejection_stats() -> None:
+    _rejections.clear()
 
 
-__all__ = ["validate_utterance_plan", "REQUIRED_FIELDS"]
+__all__ = [
+    "NOT_A_DICT",
+    "REQUIRED_FIELDS",
+    "compile_validator",
+    "rejection_reason",
+    "rejection_stats",
+    "reset_rejection_stats",
+    "validate_utterance_plan",
+    "validate_utterance_plans",
+]
@@ -0,0 +1,82 @@
+"""Bounded per-utterance sequence tracking for dropping stale chunks.
+
+The director remembers the last seq it accepted for each utterance_id so that late or
+duplicated chunks are discarded. Ids are forgotten once they can no longer matter:
+  - after the plan's expiry_ts (later chunks of it are dropped as expired anyway),
+  - `final_grace` seconds after the final chunk, to absorb reordered stragglers,
+  - `ttl` seconds after the last chunk when the plan carries no expiry,
+  - and least recently used first whenever more than `max_ids` are tracked.
+
+Entries live in an OrderedDict kept in recency order. Deadline eviction is a lazy
+sweep from the old end, so every call does O(1) amortized work and memory stays
+bounded by max_ids however long the stream runs.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+
+class SeqTracker:
+    """Last accepted seq per utterance_id with LRU and deadline eviction."""
+
+    def __init__(self, max_ids: int = 4096, *, ttl: float = 60.0, final_grace: float = 2.0):
+        self.max_ids = int(max_ids)
+        self.ttl = float(ttl)
+        self.final_grace = float(final_grace)
+        self._seqs: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self.peak = 0
+        self.stale = 0
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+
+    def __len__(self) -> int:
+        return len(self._seqs)
+
+    def accept(
+        self, utterance_id: str, seq: int, *, final: bool, expiry_ts: float, now: float
+    ) -> bool:
+        """Record seq for utterance_id; False if it is not newer than the last one."""
+        seqs = self._seqs
+        self._sweep(now)
+        last = seqs.get(utterance_id)
+        if last is not None and seq <= last[0]:
+            self.stale += 1
+            return False
+        deadline = expiry_ts if expiry_ts else now + self.ttl
+        if final:
+            deadline = min(deadline, now + self.final_grace)
+        seqs[utterance_id] = (seq, deadline)
+        if last is not None:
+            seqs.move_to_end(utterance_id)
+        elif len(seqs) > self.max_ids:
+            seqs.popitem(last=False)
+            self.evicted_lru += 1
+        if len(seqs) > self.peak:
+            self.peak = len(seqs)
+        return True
+
+    def _sweep(self, now: float, budget: int = 8) -> None:
+        # Oldest entries first; an unexpired head ends the sweep (rest are swept later)
+        seqs = self._seqs
+        while budget and seqs:
+            uid, (_, deadline) = next(iter(seqs.items()))
+            if deadline > now:
+                return
+            del seqs[uid]
+            self.evicted_ttl += 1
+            budget -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._seqs),
+            "peak": self.peak,
+            "max_ids": self.max_ids,
+            "stale": self.stale,
+            "evicted_ttl": self.evicted_ttl,
+            "evicted_lru": self.evicted_lru,
+        }
+
+
+__all__ = ["SeqTracker"]
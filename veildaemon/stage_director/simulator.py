@@ -0,0 +1,278 @@
+"""Deterministic virtual-clock simulator for StageDirector.
+
+Replays a trace of timed 'utterance' and 'beats' events straight into the director
+with its clock pinned to the trace, and emulates TTS playback: every emitted line
+"plays" for its budget_ms and reports 'speak.done' when it ends (immediately when a
+newer line cuts it off). Nothing sleeps, so an hour of stream replays in well under
+a second and two runs of the same trace make the same decisions.
+
+A trace is a list of TraceEvent(t, kind, data) with kind "utterance" (a plan dict or
+UtterancePlan) or "beats" (a beats snapshot dict), times in virtual seconds. Use
+random_trace() for a seeded raid/donation/banter mix or write one by hand; scenario()
+returns a small scripted boss fight.
+
+simulate() returns a report dict. Everything in it depends only on the trace except
+the wall-clock fields "decision_us" and "utt_per_s".
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from veildaemon.event_bus import EventBus
+
+from . import StageDirector
+from .messages import SpeakEvent
+
+START = 1000.0  # virtual epoch; keeps expiry_ts clear of 0 ("no expiry")
+
+# kind -> (plan priority, beats, budget_ms, weight in random traces)
+MIX: Dict[str, Tuple[int, Tuple[str, ...], int, float]] = {
+    "banter": (1, ("banter",), 1800, 0.70),
+    "killstreak": (2, ("killstreak",), 1200, 0.12),
+    "near_miss": (3, ("near_miss",), 900, 0.08),
+    "donation": (2, ("donation",), 2200, 0.07),
+    "raid": (5, ("raid",), 2500, 0.03),
+}
+
+
+class TraceEvent(NamedTuple):
+    t: float
+    kind: str  # "utterance" | "beats"
+    data: Any
+
+
+class VirtualClock:
+    """Callable clock whose time only moves when the simulator sets it."""
+
+    __slots__ = ("now",)
+
+    def __init__(self, start: float = START) -> None:
+        self.now = float(start)
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def plan(
+    uid: str,
+    t: float,
+    kind: str = "banter",
+    *,
+    seq: int = 0,
+    final: bool = True,
+    text: str = "line.",
+    ttl: float = 4.0,
+) -> Dict[str, Any]:
+    """Plan dict of one of the MIX kinds, arriving at t and expiring ttl later."""
+    prio, beats, budget, _ = MIX[kind]
+    return {
+        "utterance_id": uid,
+        "seq": seq,
+        "final": final,
+        "priority": prio,
+        "scene": "Gaming",
+        "budget_ms": budget,
+        "expiry_ts": t + ttl,
+        "safe_mode": "clean",
+        "beats": list(beats),
+        "text": text,
+    }
+
+
+def random_trace(
+    n: int = 10_000,
+    *,
+    rate: float = 0.5,
+    seed: int = 0,
+    stream_share: float = 0.2,
+    dup_share: float = 0.02,
+    beats_every: float = 1.0,
+    start: float = START,
+) -> List[TraceEvent]:
+    """n seeded utterances at ~rate/s with a random-walk beats feed.
+
+    stream_share of the utterances arrive as 2-4 streamed chunks, dup_share repeat a
+    chunk (dropped as stale), and risk wanders across the hysteresis band with the odd
+    boss phase so gating and holding get exercised.
+    """
+    rng = random.Random(seed)
+    kinds = list(MIX)
+    weights = [MIX[k][3] for k in kinds]
+    out: List[TraceEvent] = []
+    t = start
+    next_beats = start
+    risk, phase = 0.2, "explore"
+    for i in range(n):
+        t += rng.expovariate(rate)
+        while next_beats <= t:
+            # Mean-reverting around 0.25, so gated stretches come and go
+            risk += 0.1 * (0.25 - risk) + rng.uniform(-0.08, 0.08)
+            risk = min(1.0, max(0.0, risk))
+            if rng.random() < 0.02:
+                phase = "explore" if phase == "boss" else "boss"
+            out.append(TraceEvent(next_beats, "beats", {"risk": round(risk, 3), "phase": phase}))
+            next_beats += beats_every
+        kind = rng.choices(kinds, weights)[0]
+        uid = f"{kind[0]}{i}"
+        if rng.random() < stream_share:
+            chunks = rng.randint(2, 4)
+            for seq in range(chunks):
+                text = f"Part {seq} of line {i}. "
+                p = plan(uid, t, kind, seq=seq, final=seq == chunks - 1, text=text)
+                out.append(TraceEvent(t + 0.05 * seq, "utterance", p))
+        else:
+            out.append(TraceEvent(t, "utterance", plan(uid, t, kind, text=f"Line {i}.")))
+        if rng.random() < dup_share:
+            out.append(TraceEvent(t + 0.01, "utterance", plan(uid, t, kind, text="dup")))
+    out.sort(key=lambda e: e.t)  # stable: same-time events keep their order
+    return out
+
+
+def scenario(start: float = START) -> List[TraceEvent]:
+    """Scripted boss fight: banter, a gated stretch, a raid barge-in, then calm again."""
+    s = start
+    return [
+        TraceEvent(s, "beats", {"risk": 0.2, "phase": "explore"}),
+        TraceEvent(s + 0.1, "utterance", plan("b1", s + 0.1, "banter")),
+        TraceEvent(s + 0.3, "utterance", plan("b1", s + 0.3, "banter", text="dup")),
+        TraceEvent(s + 0.5, "utterance", plan("b2", s + 0.5, "banter")),
+        TraceEvent(s + 1.0, "beats", {"risk": 0.6, "phase": "boss"}),
+        TraceEvent(s + 1.5, "utterance", plan("k1", s + 1.5, "killstreak")),
+        TraceEvent(s + 2.0, "utterance", plan("r1", s + 2.0, "raid")),
+        TraceEvent(s + 2.2, "utterance", plan("b3", s + 2.2, "banter", ttl=1.0)),
+        TraceEvent(s + 6.0, "beats", {"risk": 0.3, "phase": "explore"}),
+        TraceEvent(s + 6.5, "utterance", plan("b4", s + 6.5, "banter")),
+    ]
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def simulate(
+    trace: Iterable[TraceEvent],
+    *,
+    director: Optional[StageDirector] = None,
+    speed: float = 1.0,
+) -> Dict[str, Any]:
+    """Replay trace through a director on a virtual clock and report what it decided.
+
+    director: bring your own (e.g. with other thresholds); it must have been built with
+    clock=VirtualClock(). speed: emulated TTS speaks budget_ms * speed per line.
+    """
+    if director is None:
+        director = StageDirector(EventBus(), clock=VirtualClock())
+    clock = director._clock
+    if not isinstance(clock, VirtualClock):
+        raise ValueError("director must be built with clock=VirtualClock()")
+    bus = director.bus
+    speak_q = await bus.subscribe("speak", maxsize=0)
+    pending: List[Tuple[float, int, str, Any]] = [
+        (e.t, i, e.kind, e.data) for i, e in enumerate(trace)
+    ]
+    heapq.heapify(pending)
+    order = len(pending)
+    playing: Optional[str] = None
+    play_end = 0.0
+    token = 0  # bumps on every (re)schedule; stale "done" entries are skipped
+    arrived: Dict[str, float] = {}
+    waits: List[float] = []
+    decision: List[float] = []
+    spoken = continuations = 0
+    busy = 0.0  # virtual seconds with a line playing
+    n_utt = 0
+    t_first = t_last = None
+
+    def drain_speak(now: float) -> None:
+        nonlocal playing, play_end, token, order, spoken, continuations, busy
+        while not speak_q.empty():
+            ev: SpeakEvent = speak_q.get_nowait()
+            uid = ev.utterance_id
+            dur = ev.plan.budget_ms / 1000.0 * speed
+            if ev.is_continuation and uid == playing:
+                continuations += 1
+                play_end = max(play_end, now) + dur
+                busy += dur
+            else:
+                if playing is not None and play_end > now:
+                    # Cut off: TTS reports the old line done right away
+                    busy -= play_end - now
+                    order += 1
+                    heapq.heappush(pending, (now, order, "done", (playing, -1)))
+                spoken += 1
+                start = arrived.pop(uid, None)
+                if start is not None:
+                    waits.append(now - start)
+                playing, play_end = uid, now + dur
+                busy += dur
+            token += 1
+            order += 1
+            heapq.heappush(pending, (play_end, order, "done", (uid, token)))
+
+    wall0 = time.perf_counter()
+    while pending:
+        t, _, kind, data = heapq.heappop(pending)
+        clock.now = t
+        if t_first is None:
+            t_first = t
+        t_last = t
+        if kind == "utterance":
+            n_utt += 1
+            uid = data.get("utterance_id") if isinstance(data, dict) else data.utterance_id
+            if uid and uid not in arrived:
+                arrived[uid] = t
+            d0 = time.perf_counter()
+            await director._arbitrate(data)
+            decision.append(time.perf_counter() - d0)
+        elif kind == "beats":
+            await bus.publish("beats", data)
+            await director._on_beats(*bus.snapshot("beats"))
+        elif kind == "done":
+            uid, tok = data
+            if tok != -1 and (tok != token or uid != playing):
+                continue  # superseded by a cut-off or an appended segment
+            if tok != -1:
+                playing = None
+            await director._on_done(uid, t)
+        drain_speak(t)
+    wall = time.perf_counter() - wall0
+    await bus.unsubscribe("speak", speak_q)
+
+    st = director.stats()
+    held = st["held"]
+    span = (t_last - t_first) if t_first is not None else 0.0
+    return {
+        "utterances": n_utt,
+        "spoken": spoken,
+        "continuations": continuations,
+        "barge_ins": st["barge_ins"],
+        "drops": {
+            **st["drops"],
+            "hold_expired": held["expired"],
+            "hold_shed": held["shed"],
+        },
+        "held": held["held"],
+        "virtual_s": round(span, 3),
+        "airtime_share": round(busy / span, 3) if span else 0.0,
+        "wait_p50_s": round(_pct(waits, 0.50), 3),
+        "wait_p99_s": round(_pct(waits, 0.99), 3),
+        "dead_air_gaps": st["dead_air_gaps"],
+        "dead_air_total_s": st["dead_air_total_s"],
+        # Wall-clock, machine dependent
+        "decision_us": {
+            "p50": round(_pct(decision, 0.50) * 1e6, 1),
+            "p99": round(_pct(decision, 0.99) * 1e6, 1),
+            "max": round(max(decision, default=0.0) * 1e6, 1),
+        },
+        "utt_per_s": round(n_utt / wall) if wall > 0 else 0,
+    }
+
+
+__all__ = ["MIX", "TraceEvent", "VirtualClock", "plan", "random_trace", "scenario", "simulate"]
@@ -0,0 +1,401 @@
+import asyncio
+
+from veildaemon.event_bus import EventBus
+
+
+def test_publish_fanout_and_latest():
+    async def run():
+        bus = EventBus()
+        a = await bus.subscribe("beats")
+        b = await bus.subscribe("beats")
+        other = await bus.subscribe("speak")
+        await bus.publish("beats", {"risk": 0.2})
+        assert a.get_nowait() == {"risk": 0.2}
+        assert b.get_nowait() == {"risk": 0.2}
+        assert other.empty()
+        assert bus.latest_nowait("beats") == {"risk": 0.2}
+        assert await bus.latest("beats") == {"risk": 0.2}
+        assert bus.latest_nowait("missing") is None
+
+    asyncio.run(run())
+
+
+def test_unsubscribe_swaps_table():
+    async def run():
+        bus = EventBus()
+        a = await bus.subscribe("beats")
+        b = await bus.subscribe("beats")
+        await bus.unsubscribe("beats", a)
+        await bus.publish("beats", 1)
+        assert a.empty()
+        assert b.get_nowait() == 1
+        await bus.unsubscribe("beats", b)
+        await bus.unsubscribe("beats", b)
+        await bus.publish("beats", 2)
+        assert b.empty()
+
+    asyncio.run(run())
+
+
+def test_full_queue_drops_oldest():
+    async def run():
+        bus = EventBus()
+        q = await bus.subscribe("utterance", maxsize=2)
+        for i in range(4):
+            await bus.publish("utterance", i)
+        assert [q.get_nowait(), q.get_nowait()] == [2, 3]
+
+    asyncio.run(run())
+
+
+def test_policies_account_for_drops():
+    async def run():
+        bus = EventBus()
+        oldest = await bus.subscribe("speak", maxsize=2)
+        newest = await bus.subscribe("speak", maxsize=2, policy="drop_newest")
+        for i in range(5):
+            await bus.publish("speak", i)
+        assert [oldest.get_nowait(), oldest.get_nowait()] == [3, 4]
+        assert [newest.get_nowait(), newest.get_nowait()] == [0, 1]
+        assert bus.stats(oldest)["dropped"] == 3
+        assert bus.stats(newest)["delivered"] == 2
+        assert bus.stats(newest)["dropped"] == 3
+
+    asyncio.run(run())
+
+
+def test_drop_newest_with_topic_keeps_the_queue():
+    async def run():
+        bus = EventBus()
+        q = await bus.subscribe("speak", maxsize=2, policy="drop_newest", with_topic=True)
+        for i in range(1, 5):
+            await bus.publish("speak", i)
+        assert [q.get_nowait(), q.get_nowait()] == [("speak", 1), ("speak", 2)]
+        st = bus.stats(q)
+        assert st["delivered"] == 2 and st["dropped"] == 2
+
+    asyncio.run(run())
+
+
+def test_coalesce_replaces_pending_item_by_key():
+    async def run():
+        bus = EventBus()
+        q = await bus.subscribe("utterance", maxsize=4, policy="coalesce", key="utterance_id")
+        await bus.publish("utterance", {"utterance_id": "a", "seq": 0})
+        await bus.publish("utterance", {"utterance_id": "b", "seq": 0})
+        await bus.publish("utterance", {"utterance_id": "a", "seq": 1})
+        assert q.get_nowait() == {"utterance_id": "a", "seq": 1}
+        assert q.get_nowait() == {"utterance_id": "b", "seq": 0}
+        stats = bus.stats(q)
+        assert stats["coalesced"] == 1 and stats["delivered"] == 2 and stats["dropped"] == 0
+
+    asyncio.run(run())
+
+
+def test_block_policy_waits_then_drops():
+    async def run():
+        bus = EventBus()
+        q = await bus.subscribe("speak", maxsize=1, policy="block", timeout=0.01)
+        await bus.publish("speak", 1)
+        await bus.publish("speak", 2)  # times out: nobody is reading
+        assert bus.stats(q)["dropped"] == 1
+
+        async def consume():
+            await asyncio.sleep(0.001)
+            return q.get_nowait()
+
+        reader = asyncio.create_task(consume())
+        await bus.publish("speak", 3)  # waits for the reader to make room
+        assert await reader == 1
+        assert q.get_nowait() == 3
+        assert bus.stats(q)["delivered"] == 2
+
+    asyncio.run(run())
+
+
+def test_topic_trie_wildcards():
+    from veildaemon.event_bus import TopicTrie
+
+    trie = TopicTrie()
+    for pat in ("chat.*.privmsg", "chat.#", "#", "beats.*", "chat.#xqc.privmsg"):
+        trie.add(pat, pat)
+    assert set(trie.match("chat.#xqc.privmsg")) == {
+        "chat.*.privmsg",
+        "chat.#",
+        "#",
+        "chat.#xqc.privmsg",
+    }
+    assert set(trie.match("chat")) == {"chat.#", "#"}
+    assert set(trie.match("beats.main")) == {"beats.*", "#"}
+    assert set(trie.match("beats")) == {"#"}
+    assert trie.remove("#", "#") and not trie.remove("#", "#")
+    assert trie.match("beats") == []
+
+
+def test_pattern_subscription_routes_families():
+    async def run():
+        bus = EventBus()
+        fam = await bus.subscribe("chat.*.privmsg")
+        exact = await bus.subscribe("chat.#xqc.privmsg")
+        await bus.publish("chat.#xqc.privmsg", "a")
+        await bus.publish("chat.#shroud.privmsg", "b")
+        await bus.publish("chat.#shroud.join", "c")
+        assert [fam.get_nowait(), fam.get_nowait()] == ["a", "b"]
+        assert exact.get_nowait() == "a" and exact.empty()
+        await bus.unsubscribe("chat.*.privmsg", fam)
+        await bus.publish("chat.#xqc.privmsg", "d")
+        assert fam.empty() and exact.get_nowait() == "d"
+
+    asyncio.run(run())
+
+
+def test_publish_many_and_drain():
+    from veildaemon.event_bus import drain
+
+    async def run():
+        bus = EventBus()
+        q = await bus.subscribe("chat.#xqc.privmsg", maxsize=8)
+        small = await bus.subscribe("chat.*.privmsg", maxsize=2, policy="drop_newest")
+        await bus.publish_many("chat.#xqc.privmsg", [f"m{i}" for i in range(5)])
+        assert bus.latest_nowait("chat.#xqc.privmsg") == "m4"
+        assert await drain(q, max_items=3) == ["m0", "m1", "m2"]
+        assert await drain(q, max_items=10, timeout=0) == ["m3", "m4"]
+        assert await drain(q, max_items=10, timeout=0.01) == []
+        assert await drain(small, timeout=0) == ["m0", "m1"]
+        assert bus.stats(small)["dropped"] == 3
+
+    asyncio.run(run())
+
+
+def test_unix_socket_bridge_roundtrip():
+    import os
+    import socket
+    import tempfile
+
+    import pytest
+
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix domain sockets unavailable")
+    from veildaemon.event_bus.bridge import BridgePublisher, BusBridgeClient, BusBridgeServer
+
+    path = os.path.join(tempfile.mkdtemp(), "bus.sock")
+
+    async def run():
+        bus = EventBus()
+        local = await bus.subscribe("beats")
+        async with BusBridgeServer(bus, path), BusBridgeClient(path) as client:
+            chat = await client.subscribe("chat.*.privmsg", with_topic=True)
+            speak = await client.subscribe("speak")
+            await asyncio.sleep(0.01)  # let the server register the subscriptions
+            await client.publish("beats", {"risk": 0.5})
+            assert await asyncio.wait_for(local.get(), 1.0) == {"risk": 0.5}
+            await bus.publish("speak", {"text": "hi"})
+            assert await asyncio.wait_for(speak.get(), 1.0) == {"text": "hi"}
+            # Blocking publisher, as used by the socket watchers
+            pub = BridgePublisher(path)
+            await asyncio.to_thread(
+                pub.publish_many, "chat.#xqc.privmsg", [{"m": 1}, {"m": 2}]
+            )
+            pub.close()
+            got = [await asyncio.wait_for(chat.get(), 1.0) for _ in range(2)]
+            assert got == [("chat.#xqc.privmsg", {"m": 1}), ("chat.#xqc.privmsg", {"m": 2})]
+            assert client.stats(chat)["delivered"] == 2
+
+    asyncio.run(run())
+
+
+def test_history_replay_then_live():
+    async def run():
+        bus = EventBus()
+        bus.enable_history("speak", capacity=4)
+        for i in range(6):
+            await bus.publish("speak", f"s{i}")
+        assert bus.seq("speak") == 6
+        assert bus.history("speak", since=4) == [(5, "s4"), (6, "s5")]
+        # Restarted worker last saw seq 1; seqs 2 and 3 were overwritten
+        q = await bus.subscribe("speak", since=1, with_seq=True)
+        await bus.publish_many("speak", ["s6", "s7"])
+        got = [q.get_nowait() for _ in range(q.qsize())]
+        assert got == [(3, "s2"), (4, "s3"), (5, "s4"), (6, "s5"), (7, "s6"), (8, "s7")]
+        assert bus.stats(q)["dropped"] == 1
+        plain = await bus.subscribe("speak", since=7)
+        assert plain.get_nowait() == "s7"
+
+    asyncio.run(run())
+
+
+def test_event_log_segments_index_and_replay(tmp_path):
+    from veildaemon.event_bus.event_log import (
+        EventLogReader,
+        EventLogWriter,
+        EventRecorder,
+        replay,
+    )
+
+    w = EventLogWriter(tmp_path, segment_bytes=256)
+    for i in range(50):
+        w.append("beats" if i % 2 else "utterance", {"i": i}, ts=1000.0 + i)
+    w.close()
+    assert len(list(tmp_path.glob("events-*.log"))) > 1
+    with EventLogReader(tmp_path) as r:
+        assert len(r) == 50
+        tail = list(r.records(start_ts=1040.0))
+        assert [rec[2]["i"] for rec in tail] == list(range(40, 50))
+        window = list(r.records(start_ts=1010.5, end_ts=1012.0))
+        assert [(rec[1], rec[2]["i"]) for rec in window] == [("beats", 11), ("utterance", 12)]
+
+    async def run():
+        bus = EventBus()
+        rec = EventRecorder(bus, tmp_path / "live")
+        await rec.start()
+        await bus.publish("speak", {"text": "hi"})
+        await bus.publish("chat.#xqc.privmsg", {"m": 1})
+        await asyncio.sleep(0)
+        await rec.stop()
+        out = EventBus()
+        q = await out.subscribe("#", with_topic=True)
+        with EventLogReader(tmp_path / "live") as r:
+            assert await replay(r, out, speed=0) == 2
+        assert [q.get_nowait(), q.get_nowait()] == [
+            ("speak", {"text": "hi"}),
+            ("chat.#xqc.privmsg", {"m": 1}),
+        ]
+
+    asyncio.run(run())
+
+
+def test_publish_threadsafe_batches_wakeups():
+    import threading
+
+    async def run():
+        bus = EventBus()
+        q = await bus.subscribe("chat.ui.reply", maxsize=0)
+        other = await bus.subscribe("speak.done", maxsize=0)
+
+        def producer(tag):
+            for i in range(200):
+                bus.publish_threadsafe("chat.ui.reply", (tag, i))
+            bus.publish_threadsafe("speak.done", tag)
+
+        threads = [threading.Thread(target=producer, args=(t,)) for t in range(4)]
+        for t in threads:
+            t.start()
+        await asyncio.to_thread(lambda: [t.join() for t in threads])
+        for _ in range(5):
+            await asyncio.sleep(0)
+        got = [q.get_nowait() for _ in range(q.qsize())]
+        assert len(got) == 800
+        for tag in range(4):
+            assert [i for t, i in got if t == tag] == list(range(200))
+        assert sorted(other.get_nowait() for _ in range(4)) == [0, 1, 2, 3]
+        assert bus._ts_wakeups < 804
+
+    asyncio.run(run())
+
+
+def test_publish_threadsafe_requires_loop():
+    import pytest
+
+    with pytest.raises(RuntimeError):
+        EventBus().publish_threadsafe("speak", 1)
+
+
+def test_bridge_survives_unencodable_payload_and_bad_frames():
+    import os
+    import socket
+    import struct
+    import tempfile
+
+    import pytest
+
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix domain sockets unavailable")
+    from veildaemon.event_bus.bridge import BusBridgeClient, BusBridgeServer
+
+    path = os.path.join(tempfile.mkdtemp(), "bus.sock")
+
+    async def run():
+        bus = EventBus()
+        async with BusBridgeServer(bus, path) as server, BusBridgeClient(path) as client:
+            q = await client.subscribe("speak")
+            await asyncio.sleep(0.01)
+            await bus.publish("speak", {"blob": b"abc"})
+            await bus.publish("speak", {"text": "still here"})
+            assert await asyncio.wait_for(q.get(), 1.0) == {"text": "still here"}
+            assert server.dropped == 1
+            # Undecodable and malformed frames are skipped, not fatal
+            body = b"{not json"
+            client._writer.write(struct.pack(">I", len(body)) + body)
+            for body in (b'["zz"]', b'["p", 5, {}]', b'["m", "speak", 5]', b'["m", [], []]'):
+                client._writer.write(struct.pack(">I", len(body)) + body)
+            await client.publish("speak", {"text": "after"})
+            assert await asyncio.wait_for(q.get(), 1.0) == {"text": "after"}
+            assert server.bad_frames == 5
+
+    asyncio.run(run())
+
+
+def test_event_log_writer_resumes_timestamp_clamp(tmp_path):
+    from veildaemon.event_bus.event_log import EventLogReader, EventLogWriter
+
+    w = EventLogWriter(tmp_path)
+    w.append("beats", {"i": 0}, ts=2000.0)
+    w.close()
+    # Restarted writer with a clock that stepped backwards
+    w = EventLogWriter(tmp_path)
+    w.append("beats", {"i": 1}, ts=1500.0)
+    w.close()
+    with EventLogReader(tmp_path) as r:
+        assert [rec[0] for rec in r.records()] == [2000.0, 2000.0]
+        assert [rec[2]["i"] for rec in r.records(start_ts=2000.0)] == [0, 1]
+
+
+def test_publish_threadsafe_disarms_when_loop_is_closed():
+    import pytest
+
+    bus = EventBus()
+    dead = asyncio.new_event_loop()
+    dead.close()
+    bus.bind_loop(dead)
+    with pytest.raises(RuntimeError):
+        bus.publish_threadsafe("speak", 1)
+    assert not bus._ts_armed
+
+    async def run():
+        q = await bus.subscribe("speak", maxsize=1, policy="block", timeout=0.01)
+        bus.bind_loop()
+        # The pending event from the failed call is flushed with the next wakeup
+        await asyncio.to_thread(bus.publish_threadsafe, "speak", 2)
+        await asyncio.sleep(0)
+        assert q.get_nowait() == 1
+        assert len(bus._ts_blocked) == 1  # 2 is waiting for room, not discarded
+        assert await asyncio.wait_for(q.get(), 1.0) == 2
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert not bus._ts_blocked and bus._ts_failures == 0
+
+    asyncio.run(run())
+
+
+def test_state_channel_watch_skips_intermediate_versions():
+    import pytest
+
+    async def run():
+        bus = EventBus()
+        await bus.publish("beats", {"risk": 0.1})
+        bus.declare_state("beats")
+        assert await bus.watch("beats", 0) == (1, {"risk": 0.1})
+
+        waiter = asyncio.create_task(bus.watch("beats", 1))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        for i in range(100):
+            await bus.publish("beats", {"risk": i / 100})
+        # publish() never yields, so the waiter resumes after the whole burst and
+        # sees only the newest snapshot; versions 2..100 were skipped
+        assert await waiter == (101, {"risk": 0.99})
+        assert bus.snapshot("beats") == (101, {"risk": 0.99})
+        with pytest.raises(asyncio.TimeoutError):
+            await bus.watch("beats", 101, timeout=0.01)
+
+    asyncio.run(run())
@@ -0,0 +1,422 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from veildaemon.event_bus import EventBus
+from veildaemon.stage_director import SpeakEvent, StageDirector, UtterancePlan
+
+
+def _plan(uid="u1", seq=0, priority=1, beats=("banter",), text="hello", **extra):
+    d = {
+        "utterance_id": uid,
+        "seq": seq,
+        "final": True,
+        "priority": priority,
+        "scene": "Gaming",
+        "budget_ms": 900,
+        "expiry_ts": time.monotonic() + 30,
+        "safe_mode": "clean",
+        "beats": list(beats),
+        "text": text,
+    }
+    d.update(extra)
+    return d
+
+
+def test_utterance_plan_roundtrip_and_validation():
+    d = _plan(anim="wave")
+    plan = UtterancePlan.from_dict(d)
+    assert plan.beats == ("banter",) and plan.get("anim") == "wave"
+    assert plan.get("missing", 7) == 7
+    assert plan.to_dict() == d
+    with pytest.raises(ValueError):
+        UtterancePlan.from_dict({**d, "seq": "0"})
+    with pytest.raises(AttributeError):
+        plan.priority = 5  # type: ignore[misc]
+    ev = SpeakEvent(plan, 4)
+    assert ev.get("priority") == 4 and ev.to_dict()["priority"] == 4
+    assert plan.priority == 1
+
+
+def test_compiled_validator_reports_and_counts_reasons():
+    from veildaemon.stage_director import schema_guard as sg
+
+    sg.reset_rejection_stats()
+    good = _plan()
+    assert sg.validate_utterance_plan(good)
+    assert sg.validate_utterance_plan({**good, "seq": True})  # bool is an int, as before
+    bad = [
+        good,
+        {**good, "seq": "0"},
+        {k: v for k, v in good.items() if k != "text"},
+        ["not", "a", "plan"],
+        {**good, "beats": "banter"},
+        {**good, "seq": 1.5},
+    ]
+    assert sg.validate_utterance_plans(bad) == [
+        None,
+        "type:seq",
+        "missing:text",
+        sg.NOT_A_DICT,
+        "type:beats",
+        "type:seq",
+    ]
+    assert sg.rejection_stats() == {
+        "type:seq": 2,
+        "missing:text": 1,
+        "not_a_dict": 1,
+        "type:beats": 1,
+    }
+    with pytest.raises(ValueError, match=r"\(missing:text\)"):
+        UtterancePlan.from_dict(bad[2])
+    check = sg.compile_validator({"a": int, "b": (str, bytes)})
+    assert check({"a": 1, "b": b"x"}) is None and check({"a": 1, "b": 2}) == "type:b"
+
+
+def test_director_emits_typed_event_without_mutating_plan():
+    async def run():
+        bus = EventBus()
+        spy = await bus.subscribe("utterance")
+        speak = await bus.subscribe("speak")
+        director = StageDirector(bus)
+        task = asyncio.create_task(director.run())
+        await asyncio.sleep(0)
+        raw = _plan(uid="r", beats=("raid",))
+        await bus.publish("utterance", raw)
+        await bus.publish("utterance", {"utterance_id": "bad"})
+        ev = await asyncio.wait_for(speak.get(), 1.0)
+        task.cancel()
+        assert isinstance(ev, SpeakEvent)
+        assert ev.priority == 5 and ev.utterance_id == "r"
+        # Other subscribers still see the plan exactly as published
+        assert spy.get_nowait()["priority"] == 1 and raw["priority"] == 1
+        assert speak.empty()
+
+    asyncio.run(run())
+
+
+def test_director_tracks_beats_hysteresis_while_idle():
+    async def run():
+        bus = EventBus()
+        speak = await bus.subscribe("speak")
+        director = StageDirector(bus)
+        task = asyncio.create_task(director.run())
+        await asyncio.sleep(0)
+        await bus.publish("beats", {"risk": 0.5})
+        await asyncio.sleep(0)
+        assert director._speaking_blocked  # no utterance needed to trip the block
+        await bus.publish("beats", {"risk": 0.4})
+        await asyncio.sleep(0)
+        assert director._speaking_blocked  # still above RISK_OFF
+        # Same loop turn: all three plans are arbitrated against the newest beats (boss)
+        await bus.publish("utterance", _plan(uid="b1"))
+        await bus.publish("beats", {"risk": 0.1, "phase": "Boss"})
+        await bus.publish("utterance", _plan(uid="b2"))
+        await bus.publish("utterance", _plan(uid="k", beats=("near_miss",), priority=3))
+        got = [(await asyncio.wait_for(speak.get(), 1.0)).utterance_id]
+        await asyncio.sleep(0)
+        task.cancel()
+        assert got == ["k"] and speak.empty()
+        assert not director._speaking_blocked and director._phase == "boss"
+
+    asyncio.run(run())
+
+
+def test_hold_queue_orders_and_expires_on_wheel():
+    from veildaemon.stage_director.hold_queue import HoldQueue
+
+    hq = HoldQueue(capacity=3, max_hold=100.0, tick=0.1, slots=8)
+    assert hq.push("low", 1, 10.0, now=0.0)
+    assert hq.push("soon", 3, 0.5, now=0.0)
+    assert hq.push("late", 3, 50.0, now=0.0)  # beyond one wheel revolution
+    assert not hq.push("weaker", 1, 5.0, now=0.0)  # full; "low" outlives it
+    assert hq.push("mid", 2, 20.0, now=0.0)  # sheds "low"
+    assert hq.expire(1.0) == 1 and len(hq) == 2  # "soon" swept from its slot
+    assert hq.expire(30.0) == 1  # "mid"; "late" survives its earlier passes
+    assert hq.pop(30.0) == ("late", 3)
+    assert hq.pop(30.0) is None
+    assert hq.stats() == {"size": 0, "held": 4, "released": 1, "expired": 2, "shed": 2}
+
+
+def test_director_holds_gated_plans_until_calm():
+    async def run():
+        bus = EventBus()
+        speak = await bus.subscribe("speak")
+        director = StageDirector(bus)
+        task = asyncio.create_task(director.run())
+        await asyncio.sleep(0)
+        await bus.publish("beats", {"risk": 0.2, "phase": "boss"})
+        await asyncio.sleep(0)
+        now = time.monotonic()
+        await bus.publish("utterance", _plan(uid="stale", expiry_ts=now + 0.02))
+        await bus.publish("utterance", _plan(uid="low"))
+        await bus.publish("utterance", _plan(uid="hype", beats=("killstreak",)))
+        await asyncio.sleep(0.05)
+        assert speak.empty() and len(director._held) == 3
+        await bus.publish("beats", {"risk": 0.2, "phase": "explore"})
+        got = [(await asyncio.wait_for(speak.get(), 1.0)) for _ in range(2)]
+        task.cancel()
+        assert [(e.utterance_id, e.priority) for e in got] == [("hype", 2), ("low", 1)]
+        assert director._held.stats()["expired"] == 1
+
+    asyncio.run(run())
+
+
+def test_seq_tracker_bounds_and_deadlines():
+    from veildaemon.stage_director.seq_tracker import SeqTracker
+
+    t = SeqTracker(max_ids=3, ttl=10.0, final_grace=1.0)
+    assert t.accept("a", 0, final=False, expiry_ts=0.0, now=0.0)
+    assert not t.accept("a", 0, final=False, expiry_ts=0.0, now=0.1)  # duplicate
+    assert t.accept("a", 1, final=True, expiry_ts=0.0, now=0.2)  # forgotten at 1.2
+    assert t.accept("b", 0, final=False, expiry_ts=5.0, now=0.3)
+    assert not t.accept("a", 1, final=False, expiry_ts=0.0, now=1.0)  # straggler in grace
+    assert t.accept("c", 0, final=False, expiry_ts=0.0, now=2.0)  # sweeps "a"
+    assert len(t) == 2 and "a" not in t._seqs
+    for uid in ("d", "e"):
+        assert t.accept(uid, 0, final=False, expiry_ts=0.0, now=3.0)
+    assert len(t) == 3 and "b" not in t._seqs  # least recently used went first
+    assert t.stats() == {
+        "size": 3,
+        "peak": 3,
+        "max_ids": 3,
+        "stale": 2,
+        "evicted_ttl": 1,
+        "evicted_lru": 1,
+    }
+
+
+def test_director_paces_lines_on_speak_done():
+    async def run():
+        bus = EventBus()
+        speak = await bus.subscribe("speak")
+        director = StageDirector(bus)
+        task = asyncio.create_task(director.run())
+        await asyncio.sleep(0)
+        await bus.publish("utterance", _plan(uid="a"))
+        assert (await asyncio.wait_for(speak.get(), 1.0)).utterance_id == "a"
+        await bus.publish("speak.done", {"utterance_id": "a", "status": "finished"})
+        await asyncio.sleep(0)
+        assert director.stats()["speaking"] is False  # _current cleared
+        await bus.publish("utterance", _plan(uid="b"))
+        await bus.publish("utterance", _plan(uid="c"))  # waits for "b" to end
+        assert (await asyncio.wait_for(speak.get(), 1.0)).utterance_id == "b"
+        await asyncio.sleep(0.01)
+        assert speak.empty() and len(director._held) == 1
+        await bus.publish("utterance", _plan(uid="r", beats=("raid",)))  # barges in
+        assert (await asyncio.wait_for(speak.get(), 1.0)).utterance_id == "r"
+        await bus.publish("speak.done", {"utterance_id": "b", "status": "cancelled"})
+        await bus.publish("speak.done", {"utterance_id": "r", "status": "finished"})
+        assert (await asyncio.wait_for(speak.get(), 1.0)).utterance_id == "c"
+        task.cancel()
+        stats = director.stats()
+        assert stats["dead_air_gaps"] == 2 and stats["inflight"] == 1
+
+    asyncio.run(run())
+
+
+def test_chunk_assembler_cuts_sentences():
+    from veildaemon.stage_director.chunk_assembler import ChunkAssembler
+
+    asm = ChunkAssembler(max_chars=40)
+    tokens = ["Well that", " was close! I thought", " we were done. Anyway", " gg"]
+    units = []
+    for i, tok in enumerate(tokens):
+        plan = UtterancePlan.from_dict(_plan(uid="s", seq=i, final=i == 3, text=tok))
+        units.append([(u.seq, u.final, u.text) for u in asm.feed(plan)])
+    assert units == [
+        [],
+        [(0, False, "Well that was close!")],
+        [(1, False, "I thought we were done.")],
+        [(2, True, "Anyway gg")],
+    ]
+    assert len(asm) == 0
+    long = UtterancePlan.from_dict(_plan(uid="l", seq=0, final=False, text="word " * 20))
+    assert [len(u.text) <= 40 for u in asm.feed(long)] == [True, True]
+    whole = UtterancePlan.from_dict(_plan(uid="w"))
+    assert asm.feed(whole) == [whole]
+
+
+def test_director_streams_first_sentence_and_appends_rest():
+    async def run():
+        bus = EventBus()
+        speak = await bus.subscribe("speak")
+        director = StageDirector(bus)
+        task = asyncio.create_task(director.run())
+        await asyncio.sleep(0)
+        director._paced = True  # feedback loop live: other lines would wait
+        chunks = ["First one is", " done. Second", " is here.", ""]
+        for i, text in enumerate(chunks):
+            await bus.publish("utterance", _plan(uid="s", seq=i, final=i == 3, text=text))
+            if i == 1:
+                first = await asyncio.wait_for(speak.get(), 1.0)
+                assert first.text == "First one is done." and not first.is_continuation
+        rest = await asyncio.wait_for(speak.get(), 1.0)
+        task.cancel()
+        assert rest.text == "Second is here." and rest.is_continuation and rest.plan.final
+
+    asyncio.run(run())
+
+
+def test_simulator_is_deterministic_on_virtual_clock():
+    from veildaemon.stage_director.simulator import random_trace, scenario, simulate
+
+    rep = asyncio.run(simulate(scenario()))
+    assert rep["drops"]["stale"] == 1  # b1 repeated
+    assert rep["barge_ins"] == 1  # raid over the killstreak gate
+    assert rep["drops"]["hold_expired"] == 2  # killstreak and banter held through the boss
+
+    def virtual(r):
+        return {k: v for k, v in r.items() if k not in ("decision_us", "utt_per_s")}
+
+    trace = random_trace(2000, seed=3)
+    a = asyncio.run(simulate(trace))
+    b = asyncio.run(simulate(trace))
+    assert virtual(a) == virtual(b)
+    assert a["utterances"] > 2000 and a["spoken"] > 0 and a["drops"]["stale"] > 0
+
+
+def test_multi_director_keeps_streams_apart_and_fair():
+    from veildaemon.stage_director.multi import MultiStageDirector
+
+    async def run():
+        bus = EventBus()
+        speak = await bus.subscribe("speak", maxsize=0)
+        multi = MultiStageDirector(bus)
+        task = asyncio.create_task(multi.run())
+        await asyncio.sleep(0)
+        # Stream a is in a boss fight; b is calm
+        await bus.publish("beats.a", {"risk": 0.9, "phase": "boss"})
+        flood = [_plan(f"a{i}", stream_id="a") for i in range(40)]
+        await bus.publish_many("utterance", flood + [_plan("b0", stream_id="b")])
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert [ev.utterance_id for ev in _drain(speak)] == ["b0"]
+        st = multi.stats()
+        assert st["streams"] == 2 and st["per_stream"]["a"]["held"] > 0
+        # Fair rounds: b's plan is not stuck behind c's burst
+        await bus.publish_many(
+            "utterance",
+            [_plan(f"c{i}", stream_id="c") for i in range(20)]
+            + [_plan("b1", stream_id="b", priority=5)],
+        )
+        for _ in range(30):
+            await asyncio.sleep(0)
+        order = [ev.utterance_id for ev in _drain(speak)]
+        assert order.index("b1") == 1
+        # c's burst outruns its airtime; the rest of it is shed, not queued
+        c_drops = multi.stats()["per_stream"]["c"]["drops"]
+        assert len(order) - 1 + c_drops["airtime"] == 20 and c_drops["airtime"] > 0
+        # speak.done goes back to the lane that emitted the line
+        await bus.publish("speak.done", {"utterance_id": "b1", "status": "done"})
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert multi.lane("b").stats()["speaking"] is False
+        task.cancel()
+
+    asyncio.run(run())
+
+
+def _drain(q):
+    out = []
+    while not q.empty():
+        out.append(q.get_nowait())
+    return out
+
+
+def test_airtime_governor_sheds_lowest_priority_first():
+    from veildaemon.stage_director.airtime import AirtimeGovernor
+
+    gov = AirtimeGovernor(budget_s=30, window_s=60, burst_s=10)
+    assert gov.cost("one two three four", 5000) == 5.0  # budget_ms covers the words
+    assert gov.cost(" ".join(["word"] * 5), 1000) == 2.0  # 5 words at 2.5 words/s
+    assert gov.cost(" ".join(["word"] * 20), 1000) == 2.0  # at most twice the budget
+    assert AirtimeGovernor(wps=4.0).cost("one two three four", 500) == 1.0
+    now = 0.0
+    assert gov.admit(1, 4.0, now)  # 10 -> 6
+    assert not gov.admit(1, 2.0, now)  # banter must leave 5 s
+    assert gov.admit(3, 4.0, now)  # 6 -> 2, above the 1 s reserve
+    assert not gov.admit(2, 1.0, now)
+    assert gov.admit(5, 3.0, now)  # raids spend the last of it
+    assert not gov.admit(5, 1.0, now)
+    assert gov.admit(1, 1.0, now, force=True)
+    assert gov.stats()["shed"] == {1: 1, 2: 1, 5: 1}
+    # Refills at budget/window = 0.5 s per second up to burst
+    assert gov.admit(1, 4.0, now + 40.0) and gov.tokens == 6.0
+
+
+def test_director_governs_airtime_under_a_flood():
+    from veildaemon.stage_director.airtime import AirtimeGovernor
+
+    async def run():
+        bus = EventBus()
+        speak = await bus.subscribe("speak", maxsize=0)
+        director = StageDirector(bus, airtime=AirtimeGovernor(burst_s=10))
+        task = asyncio.create_task(director.run())
+        await asyncio.sleep(0)
+        await bus.publish_many("utterance", [_plan(f"b{i}") for i in range(20)])
+        await bus.publish("utterance", _plan("raid", priority=5, beats=("raid",)))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        spoken = [ev.utterance_id for ev in _drain(speak)]
+        # 0.9 s lines: banter stops once 5 s of the 10 s bucket are left
+        assert spoken == [f"b{i}" for i in range(5)] + ["raid"]
+        assert director.stats()["drops"]["airtime"] == 15
+        task.cancel()
+
+    asyncio.run(run())
+
+
+def test_barge_in_cancels_synchronously_and_records_latency(monkeypatch):
+    import veildaemon.tts.manager as tts_manager
+    from veildaemon.stage_director.barge_in import LatencyHistogram
+
+    hist = LatencyHistogram()
+    for s in (0.0002, 0.003, 0.003, 0.020, 2.0):
+        hist.add(s)
+    st = hist.stats()
+    assert st["count"] == 5 and st["buckets"]["le_0.25"] == 1 and st["buckets"]["inf"] == 1
+    assert st["p50_ms"] == 4.0 and st["max_ms"] == 2000.0
+
+    async def endless_edge(text, voice, rate, visemes, words):
+        yield b"\xff" * 64
+        await asyncio.sleep(30)  # still synthesizing while the line plays
+
+    monkeypatch.setattr(tts_manager, "_edge_tts_stream", endless_edge)
+
+    async def run():
+        bus = EventBus()
+        mgr = tts_manager.TTSManager(bus)
+        mgr.priority, mgr.cache = ["edge"], None
+        # A player that plays until it is killed
+        mgr._stream_argv = [sys.executable, "-c", "import sys; sys.stdin.buffer.read()"]
+        director = StageDirector(bus, tts_manager=mgr)
+        task = asyncio.create_task(director.run())
+        await asyncio.sleep(0)
+        await bus.publish("utterance", _plan("chat"))
+        await asyncio.sleep(0)
+        h = await mgr.speak("hello", "chat")
+        await h._task  # returns once playback has started
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert mgr._handles._by_id.get("chat") is h  # still cancellable while on air
+        await bus.publish("utterance", _plan("raid", priority=5, beats=("raid",)))
+        await asyncio.sleep(0)
+        assert director.barge_ins == 1
+        lat = director.stats()["barge_in_latency"]
+        assert lat["arrival_to_stop"]["count"] == 1
+        assert lat["arrival_to_stop"]["max_ms"] < 16.7  # within one frame
+        for _ in range(100):  # the killed player reports speak.done
+            if director.stats()["barge_in_latency"]["arrival_to_silent"]["count"]:
+                break
+            await asyncio.sleep(0.01)
+        lat = director.stats()["barge_in_latency"]
+        assert lat["arrival_to_silent"]["count"] == 1 and lat["awaiting_silence"] == 0
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert "chat" not in mgr._handles._by_id
+        task.cancel()
+
+    asyncio.run(run())
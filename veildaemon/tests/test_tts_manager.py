@@ -0,0 +1,281 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from veildaemon.event_bus import EventBus
+
+
+def _manager(monkeypatch, play_s=0.03):
+    import veildaemon.tts.manager as tts_manager
+
+    log = []
+
+    async def fake_piper(text, exe, model, verbose=False):
+        log.append(("synth", text, time.perf_counter()))
+        return text.encode()
+
+    def fake_play(path):
+        log.append(("play", path, time.perf_counter()))
+        time.sleep(play_s)
+        log.append(("end", path, time.perf_counter()))
+
+    monkeypatch.setattr(tts_manager, "_piper_bytes", fake_piper)
+    monkeypatch.setattr(tts_manager, "_play_bytes", lambda audio, suffix: fake_play(audio.decode()))
+    monkeypatch.setattr(tts_manager, "_play_and_cleanup", fake_play)
+    mgr = tts_manager.TTSManager()
+    mgr.priority = ["piper"]
+    mgr.cache = None
+    monkeypatch.setattr(mgr, "_ensure_mixer", lambda: None)
+    return mgr, log
+
+
+def test_play_file_reports_playback_end_on_bus(monkeypatch):
+    async def run():
+        bus = EventBus()
+        done = await bus.subscribe("speak.done")
+        mgr, log = _manager(monkeypatch)
+        mgr.set_bus(bus)
+        mgr._play_file("x.wav", "u1")
+        ev = await asyncio.wait_for(done.get(), 1.0)
+        assert [e[:2] for e in log] == [("play", "x.wav"), ("end", "x.wav")]
+        assert ev["utterance_id"] == "u1" and ev["status"] == "finished"
+
+    asyncio.run(run())
+
+
+def test_appended_segments_play_in_order_with_one_done(monkeypatch):
+    async def run():
+        bus = EventBus()
+        done = await bus.subscribe("speak.done")
+        mgr, log = _manager(monkeypatch)
+        mgr.set_bus(bus)
+        h1 = await mgr.speak("one", "u")
+        h2 = await mgr.speak("two", "u", append=True)
+        assert h1 is h2
+        ev = await asyncio.wait_for(done.get(), 2.0)
+        assert ev["status"] == "finished" and done.empty()
+        # "two" is synthesized while "one" plays, and starts only after it ended
+        kinds = [(k, p) for k, p, _ in log]
+        assert kinds.index(("synth", "two")) < kinds.index(("end", "one"))
+        assert kinds.index(("end", "one")) < kinds.index(("play", "two"))
+
+    asyncio.run(run())
+
+
+def test_synth_cache_evicts_least_recently_used(tmp_path):
+    from veildaemon.tts.synth_cache import SynthCache, cache_key
+
+    audio = b"x" * 400
+    cache = SynthCache(tmp_path / "cache", max_bytes=1000)
+    keys = [cache_key("piper", "", "m", t) for t in ("a", "b", "c")]
+    assert cache.put(keys[0], audio, ".wav", words=[{"t": 0.0, "text": "a"}])
+    assert cache.put(keys[1], audio, ".wav")
+    hit = cache.get(keys[0])  # a is now the most recent
+    assert hit.words == [{"t": 0.0, "text": "a"}] and hit.audio == audio and hit.suffix == ".wav"
+    assert cache.put(keys[2], audio, ".wav")  # over budget: b goes
+    assert cache.get(keys[1]) is None and cache.stats()["evicted"] == 1
+    # The index is rebuilt from disk
+    again = SynthCache(tmp_path / "cache", max_bytes=1000)
+    assert again.stats()["entries"] == 2 and again.bytes == 800
+
+
+def test_repeated_line_plays_from_cache(monkeypatch, tmp_path):
+    from veildaemon.tts.synth_cache import SynthCache
+
+    async def run():
+        mgr, log = _manager(monkeypatch, play_s=0.0)
+        import veildaemon.tts.manager as tts_manager
+
+        async def fake_piper(text, exe, model, verbose=False):
+            log.append(("synth", text, time.perf_counter()))
+            return b"RIFF" + bytes(2000)
+
+        def fake_play(audio, suffix):
+            log.append(("play", len(audio), 0))
+            log.append(("end", len(audio), 0))
+
+        monkeypatch.setattr(tts_manager, "_piper_bytes", fake_piper)
+        monkeypatch.setattr(tts_manager, "_play_bytes", fake_play)
+        mgr._debug_dir = str(tmp_path / "debug")
+        mgr.cache = SynthCache(tmp_path / "cache")
+        for uid in ("u1", "u2"):
+            h = await mgr.speak("gg no re", uid)
+            await h._task
+        for _ in range(100):  # players run in executor threads
+            if [e[0] for e in log].count("end") == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert [e[0] for e in log].count("synth") == 1
+        assert [e[0] for e in log].count("play") == 2
+        st = mgr.cache.stats()
+        assert st["hits"] == 1 and st["hit_rate"] == 0.5 and st["bytes_saved"] == 2004
+        assert os.listdir(tmp_path / "debug") == ["u1_piper.wav"]  # only the synthesized line
+
+    asyncio.run(run())
+
+
+_FAKE_PIPER = """#!{python}
+import os, sys
+out = sys.argv[sys.argv.index("--output_dir") + 1]
+n = 0
+for line in sys.stdin:
+    if line.strip() == "crash":
+        sys.exit(3)
+    n += 1
+    path = os.path.join(out, "%d_%d.wav" % (os.getpid(), n))
+    with open(path, "wb") as f:
+        f.write(b"RIFF" + bytes(2048))
+    print(path, flush=True)
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake piper is a shebang script")
+def test_piper_pool_stays_warm_and_restarts_on_crash(tmp_path):
+    from veildaemon.tts.piper_pool import PiperPool
+
+    exe = tmp_path / "piper"
+    exe.write_text(_FAKE_PIPER.format(python=sys.executable))
+    exe.chmod(0o755)
+    model = tmp_path / "voice.onnx"
+    model.write_bytes(b"")
+
+    async def run():
+        pool = PiperPool(str(exe), timeout=5.0)
+        await pool.start(str(model))
+        a = await pool.synth("hello there", str(model))
+        b = await pool.synth("general kenobi", str(model))
+        pid = os.path.basename(a).split("_")[0]
+        assert os.path.basename(b).split("_")[0] == pid  # same warm process
+        assert os.path.basename(b).endswith("_3.wav")  # after the probe and "a"
+        with pytest.raises(RuntimeError):
+            await pool.synth("crash", str(model))  # crashes again on the retry
+        c = await pool.synth("back again", str(model))
+        assert os.path.basename(c).split("_")[0] != pid
+        st = pool.stats()
+        assert st["restarts"] == 2 and st["failures"] == 1 and st["spawns"] == 3
+        assert await pool.check(probe=True) == {str(model): True}
+        out_dir = pool._workers[str(model)].out_dir
+        before = len(os.listdir(out_dir))
+        with pytest.raises(asyncio.TimeoutError):  # abandoned mid-request
+            await asyncio.wait_for(pool.synth("too late", str(model)), 0.0)
+        wav = await pool.synth_bytes("in memory", str(model))
+        assert wav.startswith(b"RIFF") and len(os.listdir(out_dir)) == before
+        assert pool.stats()["restarts"] == 2  # the worker survived the cancellation
+        await pool.close()
+
+    asyncio.run(run())
+
+
+_FAKE_PLAYER = """import sys
+with open(sys.argv[1], "wb") as f:
+    for chunk in iter(lambda: sys.stdin.buffer.read1(64), b""):
+        f.write(chunk)
+        f.flush()
+"""
+
+
+def test_streamed_line_starts_playing_before_synthesis_ends(monkeypatch, tmp_path):
+    from veildaemon.tts.synth_cache import SynthCache
+
+    out = tmp_path / "played.mp3"
+
+    async def run():
+        bus = EventBus()
+        done = await bus.subscribe("speak.done")
+        mgr, log = _manager(monkeypatch)
+        import veildaemon.tts.manager as tts_manager
+
+        async def fake_edge(text, voice, rate, visemes, words):
+            yield b"a" * 100
+            words.append({"t": 0.0, "text": "first", "dur": 0.1})
+            for _ in range(200):  # the player has the first chunk before the second exists
+                if out.exists() and out.stat().st_size:
+                    break
+                await asyncio.sleep(0.01)
+            log.append(("heard", out.stat().st_size if out.exists() else 0, 0))
+            yield b"b" * 100
+
+        monkeypatch.setattr(tts_manager, "_edge_tts_stream", fake_edge)
+        mgr.set_bus(bus)
+        mgr.priority = ["edge"]
+        mgr.cache = SynthCache(tmp_path / "cache")
+        mgr._stream_argv = [sys.executable, "-c", _FAKE_PLAYER, str(out)]
+        await mgr.speak("stream me", "u1")
+        ev = await asyncio.wait_for(done.get(), 5.0)
+        assert ev["status"] == "finished"
+        assert ("heard", 100, 0) in log
+        assert out.read_bytes() == b"a" * 100 + b"b" * 100
+        key, hit = mgr._cache_lookup("edge", mgr.edge_voice, mgr.edge_rate, "stream me")
+        assert hit.audio == out.read_bytes() and hit.words[0]["text"] == "first"
+
+    asyncio.run(run())
+
+
+def test_stopping_a_stream_kills_the_player_and_the_download(monkeypatch, tmp_path):
+    from veildaemon.tts.synth_cache import SynthCache
+
+    out = tmp_path / "played.mp3"
+
+    async def run():
+        bus = EventBus()
+        done = await bus.subscribe("speak.done")
+        mgr, log = _manager(monkeypatch)
+        import veildaemon.tts.manager as tts_manager
+
+        async def fake_edge(text, voice, rate, visemes, words):
+            try:
+                yield b"a" * 100
+                await asyncio.sleep(30)  # a stalled backend
+                yield b"b" * 100
+            finally:
+                log.append(("closed", text, 0))
+
+        monkeypatch.setattr(tts_manager, "_edge_tts_stream", fake_edge)
+        mgr.set_bus(bus)
+        mgr.priority = ["edge"]
+        mgr.cache = SynthCache(tmp_path / "cache")
+        mgr._stream_argv = [sys.executable, "-c", _FAKE_PLAYER, str(out)]
+        h = await mgr.speak("cut me off", "u2")
+        await h._task
+        assert mgr._handles.cancel_nowait("u2")
+        ev = await asyncio.wait_for(done.get(), 2.0)
+        assert ev["status"] == "cancelled"
+        await asyncio.sleep(0.05)
+        assert ("closed", "cut me off", 0) in log
+        # The cut-off half of the line must not replay from the cache later
+        assert mgr.cache.stats()["entries"] == 0
+
+    asyncio.run(run())
+
+
+def test_slow_backend_is_hedged_and_the_loser_cancelled(monkeypatch):
+    async def run():
+        bus = EventBus()
+        done = await bus.subscribe("speak.done")
+        mgr, log = _manager(monkeypatch, play_s=0.0)
+        import veildaemon.tts.manager as tts_manager
+
+        async def slow_edge(text, voice, rate):
+            try:
+                await asyncio.sleep(30)  # a degraded API
+            except asyncio.CancelledError:
+                log.append(("edge cancelled", text, time.perf_counter()))
+                raise
+
+        monkeypatch.setattr(tts_manager, "_edge_tts_bytes", slow_edge)
+        mgr.set_bus(bus)
+        mgr.priority = ["edge", "piper"]
+        mgr._stream_argv = None
+        t0 = time.perf_counter()
+        await mgr.speak("hold the line", "u1", budget_ms=300)  # hedge after 0.3 s
+        ev = await asyncio.wait_for(done.get(), 3.0)
+        assert ev["status"] == "finished" and time.perf_counter() - t0 < 1.5
+        kinds = [k for k, _, _ in log]
+        assert kinds.count("play") == 1 and "edge cancelled" in kinds
+        st = mgr.hedge_stats()
+        assert st["hedged"] == 1 and st["won_after_hedge"] == {"piper": 1}
+
+    asyncio.run(run())
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import time
-from dataclasses import dataclass
-from typing import Callable, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
 
 
 @dataclass
@@ -12,6 +12,15 @@ class PlaybackHandle:
     started_at: float
     _task: asyncio.Task | None
     _stopper: Optional[Callable[[], None]] = None
+    # Tasks of segments appended to this utterance after the first one
+    _more: list = field(default_factory=list)
+    # Held handles stay registered past their tasks, until release_threadsafe()
+    _held: bool = False
+    _loop: Any = None
+
+    def active(self) -> bool:
+        t = self._task
+        return bool(self._held or (t and not t.done()) or any(not m.done() for m in self._more))
 
     def cancel(self) -> None:
         # Stop playback if possible, then cancel task
@@ -20,9 +29,9 @@ class PlaybackHandle:
                 self._stopper()
         except Exception:
             pass
-        t = self._task
-        if t and not t.done():
-            t.cancel()
+        for t in (self._task, *self._more):
+            if t and not t.done():
+                t.cancel()
 
 
 class HandleRegistry:
@@ -35,24 +44,72 @@ class HandleRegistry:
         utterance_id: str,
         task: asyncio.Task | None,
         stopper: Optional[Callable[[], None]] = None,
+        *,
+        hold: bool = False,
     ) -> PlaybackHandle:
+        """Register a cancellable utterance; it is dropped once task (and appended ones) end.
+
+        hold=True keeps it registered after that, until release_threadsafe(): TTS tasks
+        return when playback starts, while the audio they started is still cancellable.
+        """
         h = PlaybackHandle(
-            utterance_id=utterance_id, started_at=time.perf_counter(), _task=task, _stopper=stopper
+            utterance_id=utterance_id,
+            started_at=time.perf_counter(),
+            _task=task,
+            _stopper=stopper,
+            _held=hold,
+            _loop=asyncio.get_running_loop(),
         )
         async with self._lock:
             self._by_id[utterance_id] = h
         if task is not None:
+            task.add_done_callback(lambda _: asyncio.create_task(self._release(h)))
+        return h
 
-            def _done(_):
-                asyncio.create_task(self.remove(utterance_id))
-
-            task.add_done_callback(_done)
+    async def attach(self, h: PlaybackHandle, task: asyncio.Task) -> PlaybackHandle:
+        """Add an appended segment's task to h; the handle stays registered until it ends."""
+        h._more.append(task)
+        async with self._lock:
+            self._by_id[h.utterance_id] = h
+        task.add_done_callback(lambda _: asyncio.create_task(self._release(h)))
         return h
 
+    async def _release(self, h: PlaybackHandle) -> None:
+        if h.active():
+            return
+        async with self._lock:
+            if self._by_id.get(h.utterance_id) is h:
+                del self._by_id[h.utterance_id]
+
+    def release_threadsafe(self, h: PlaybackHandle) -> None:
+        """Playback of a held handle ended; drop it once its tasks are done. Any thread."""
+        try:
+            h._loop.call_soon_threadsafe(self._unhold, h)
+        except RuntimeError:
+            pass  # loop closed
+
+    def _unhold(self, h: PlaybackHandle) -> None:
+        h._held = False
+        # Loop thread: same lock-free reasoning as cancel_nowait()
+        if not h.active() and self._by_id.get(h.utterance_id) is h:
+            del self._by_id[h.utterance_id]
+
     async def remove(self, utterance_id: str) -> None:
         async with self._lock:
             self._by_id.pop(utterance_id, None)
 
+    def cancel_nowait(self, utterance_id: str) -> bool:
+        """Stop utterance_id now, from the event loop thread; its stopper has run on return.
+
+        Lookups need no lock on the loop thread (registrations only change the dict there),
+        so a barge-in does not wait for a task switch before the audio is cut.
+        """
+        h = self._by_id.get(utterance_id)
+        if not h:
+            return False
+        h.cancel()
+        return True
+
     async def cancel(self, utterance_id: str) -> bool:
         async with self._lock:
             h = self._by_id.get(utterance_id)
@@ -1,17 +1,24 @@
 import asyncio
 import configparser
+import functools
+import io
 import json
 import os
 import pathlib
 import platform
 import tempfile
+import threading
 import time
+import wave
 from pathlib import Path
-from typing import Callable
+from typing import Any, AsyncIterator, Callable
 from urllib import request as urlrequest
 from urllib.error import HTTPError, URLError
 
 from .handles import HandleRegistry, PlaybackHandle
+from .piper_pool import PiperPool
+from .stream_player import StreamPlayer, find_stream_player
+from .synth_cache import CachedSynth, SynthCache, cache_key
 from .wps_meter import WPSMeter
 
 try:
@@ -27,50 +34,58 @@ RATE = os.environ.get("EDGE_RATE", "+0%")
 
 
 # ---- Backend helpers (adapted from StreamDaemon/tts_audition.py) ----
-async def _edge_tts_to_file(text: str, voice: str, rate: str) -> tuple[str, list[dict], list[dict]]:
+# Backends return the encoded audio in memory; nothing touches the disk unless the
+# synthesis cache or TTS_DEBUG_AUDIO_DIR asks for a copy.
+async def _edge_tts_stream(
+    text: str, voice: str, rate: str, visemes: list[dict], words: list[dict]
+) -> AsyncIterator[bytes]:
+    """Yield MP3 chunks as Edge sends them; viseme/word events are appended on the way."""
     from edge_tts import (
         Communicate,  # lazy import to avoid mandatory dep at import time
     )
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-        out_path = tmp.name
-    visemes: list[dict] = []
-    words: list[dict] = []
     try:
         comm = Communicate(text=text, voice=voice, rate=rate)
-        with open(out_path, "wb") as f:
-            async for chunk in comm.stream():
-                ctype = (chunk.get("type") or chunk.get("Type") or "").lower()
-                if ctype == "audio":
-                    f.write(chunk.get("data") or chunk.get("Data") or b"")
-                elif ctype == "viseme":
-                    try:
-                        offset = float(chunk.get("offset", 0))
-                        vid = int(chunk.get("viseme_id") or chunk.get("id") or 0)
-                        t_sec = offset / 10_000_000.0
-                        visemes.append({"t": t_sec, "id": vid})
-                    except Exception:
-                        pass
-                elif ctype == "wordboundary":
-                    try:
-                        offset = float(chunk.get("offset", 0))
-                        duration = float(chunk.get("duration", 0))
-                        word = str(chunk.get("text") or "")
-                        t_sec = offset / 10_000_000.0
-                        d_sec = duration / 10_000_000.0 if duration else 0.12
-                        words.append({"t": t_sec, "text": word, "dur": d_sec})
-                    except Exception:
-                        pass
+        async for chunk in comm.stream():
+            ctype = (chunk.get("type") or chunk.get("Type") or "").lower()
+            if ctype == "audio":
+                data = chunk.get("data") or chunk.get("Data") or b""
+                if data:
+                    yield data
+            elif ctype == "viseme":
+                try:
+                    offset = float(chunk.get("offset", 0))
+                    vid = int(chunk.get("viseme_id") or chunk.get("id") or 0)
+                    t_sec = offset / 10_000_000.0
+                    visemes.append({"t": t_sec, "id": vid})
+                except Exception:
+                    pass
+            elif ctype == "wordboundary":
+                try:
+                    offset = float(chunk.get("offset", 0))
+                    duration = float(chunk.get("duration", 0))
+                    word = str(chunk.get("text") or "")
+                    t_sec = offset / 10_000_000.0
+                    d_sec = duration / 10_000_000.0 if duration else 0.12
+                    words.append({"t": t_sec, "text": word, "dur": d_sec})
+                except Exception:
+                    pass
     except Exception as e:
-        try:
-            os.remove(out_path)
-        except Exception:
-            pass
         raise RuntimeError(f"edge-tts failed: {e}")
-    return out_path, visemes, words
 
 
-async def _elevenlabs_to_file(text: str, voice: str, model_id: str) -> str:
+async def _edge_tts_bytes(text: str, voice: str, rate: str) -> tuple[bytes, list[dict], list[dict]]:
+    visemes: list[dict] = []
+    words: list[dict] = []
+    audio = bytearray()
+    async for data in _edge_tts_stream(text, voice, rate, visemes, words):
+        audio += data
+    return bytes(audio), visemes, words
+
+
+async def _elevenlabs_request(
+    text: str, voice: str, model_id: str, *, stream: bool = False
+) -> urlrequest.Request:
     from secrets_store import get_secret  # type: ignore
 
     api_key = (get_secret("elevenlabs.api.key") or "").strip()
@@ -88,31 +103,71 @@ async def _elevenlabs_to_file(text: str, voice: str, model_id: str) -> str:
     if not voice_id:
         raise RuntimeError("Provide ELEVENLABS_VOICE env var to use ElevenLabs.")
     mdl = model_id or "eleven_multilingual_v2"
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+    # /stream answers with chunked MP3 as it is generated
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}" + ("/stream" if stream else "")
     payload = {
         "text": text,
         "model_id": mdl,
         "voice_settings": {"stability": 0.5, "similarity_boost": 0.8},
     }
     headers = {"xi-api-key": api_key, "accept": "audio/mpeg", "content-type": "application/json"}
+    return urlrequest.Request(
+        url, data=json.dumps(payload).encode("utf-8"), headers=headers, method="POST"
+    )
+
+
+async def _elevenlabs_bytes(text: str, voice: str, model_id: str) -> bytes:
+    req = await _elevenlabs_request(text, voice, model_id)
 
     def fetch_bytes():
-        req = urlrequest.Request(
-            url, data=json.dumps(payload).encode("utf-8"), headers=headers, method="POST"
-        )
         with urlrequest.urlopen(req, timeout=30) as resp:
             return resp.read()
 
     try:
-        mp3_bytes = await asyncio.get_running_loop().run_in_executor(None, fetch_bytes)
+        return await asyncio.get_running_loop().run_in_executor(None, fetch_bytes)
     except (HTTPError, URLError, TimeoutError) as e:
         raise RuntimeError(f"ElevenLabs error: {e}")
     except Exception as e:
         raise RuntimeError(f"ElevenLabs error: {e}")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-        out_path = tmp.name
-        tmp.write(mp3_bytes)
-    return out_path
+
+
+async def _elevenlabs_stream(text: str, voice: str, model_id: str) -> AsyncIterator[bytes]:
+    """Yield MP3 chunks of the ElevenLabs streaming endpoint as they are received."""
+    req = await _elevenlabs_request(text, voice, model_id, stream=True)
+    loop = asyncio.get_running_loop()
+    q: asyncio.Queue = asyncio.Queue()
+    quit_ = threading.Event()
+
+    def put(item) -> None:
+        try:
+            loop.call_soon_threadsafe(q.put_nowait, item)
+        except RuntimeError:
+            quit_.set()  # loop closed
+
+    def pump():
+        # urllib blocks: read in an executor thread and hand chunks to the loop
+        try:
+            with urlrequest.urlopen(req, timeout=30) as resp:
+                while not quit_.is_set():
+                    data = resp.read1(16384)
+                    if not data:
+                        break
+                    put(data)
+            put(None)
+        except Exception as e:
+            put(e)
+
+    loop.run_in_executor(None, pump)
+    try:
+        while True:
+            item = await q.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise RuntimeError(f"ElevenLabs error: {item}")
+            yield item
+    finally:
+        quit_.set()
 
 
 async def _elevenlabs_resolve_voice_id_by_name(api_key: str, name: str) -> str:
@@ -138,14 +193,34 @@ async def _elevenlabs_resolve_voice_id_by_name(api_key: str, name: str) -> str:
     return name  # fall back to original
 
 
-async def _piper_to_file(text: str, piper_exe: str, piper_model: str, verbose: bool = False) -> str:
+@functools.lru_cache(maxsize=8)
+def _piper_sample_rate(piper_model: str) -> int:
+    # Piper voices ship <model>.onnx.json with the output rate
+    try:
+        with open(piper_model + ".json", encoding="utf-8") as f:
+            return int(json.load(f)["audio"]["sample_rate"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 22050
+
+
+def _wav_bytes(pcm: bytes, rate: int) -> bytes:
+    """Wrap 16-bit mono PCM in a WAV header."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+async def _piper_bytes(text: str, piper_exe: str, piper_model: str, verbose: bool = False) -> bytes:
+    """One Piper process for one line (see PiperPool for warm workers); WAV bytes."""
     if not (piper_exe and os.path.exists(piper_exe)):
         raise RuntimeError("PIPER_EXE path invalid or missing")
     if not (piper_model and os.path.exists(piper_model)):
         raise RuntimeError("PIPER_MODEL path invalid or missing")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-        out_path = tmp.name
-    cmd = [piper_exe, "-m", piper_model, "-f", out_path]
+    cmd = [piper_exe, "-m", piper_model, "--output_raw"]
     if not verbose:
         cmd.append("-q")
     proc = await asyncio.create_subprocess_exec(
@@ -154,26 +229,45 @@ async def _piper_to_file(text: str, piper_exe: str, piper_model: str, verbose: b
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
-    if proc.stdin:
-        proc.stdin.write(text.encode("utf-8", errors="ignore") + b"\n")
-        await proc.stdin.drain()
-        proc.stdin.close()
-    stdout_b, stderr_b = await proc.communicate()
+    try:
+        pcm, stderr_b = await proc.communicate(text.encode("utf-8", errors="ignore") + b"\n")
+    except asyncio.CancelledError:
+        # Timed out or lost a hedged race: do not leave the process running
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+        raise
     if proc.returncode != 0:
         se = (stderr_b or b"").decode("utf-8", errors="ignore")
         raise RuntimeError(f"piper exited with {proc.returncode}: {se.strip()}")
-    try:
-        size = os.path.getsize(out_path)
-        if size < 1024:
-            raise RuntimeError(f"piper produced a tiny WAV ({size} bytes)")
-    except Exception:
-        raise
-    return out_path
+    if len(pcm) < 1024:
+        raise RuntimeError(f"piper produced tiny audio ({len(pcm)} bytes)")
+    return _wav_bytes(pcm, _piper_sample_rate(piper_model))
 
 
 # (SAPI backend intentionally disabled by default)
 
 
+def _play_bytes(audio: bytes, suffix: str) -> None:
+    """Blocking playback of in-memory audio when pygame is unavailable."""
+    if platform.system() == "Windows" and suffix == ".wav":
+        try:
+            import winsound  # type: ignore
+
+            winsound.PlaySound(audio, winsound.SND_MEMORY)
+            return
+        except Exception:
+            pass
+    if playsound is None:
+        print(f"[TTS] no audio player for {len(audio)} bytes of {suffix}")
+        return
+    # playsound only takes a path: the one case that still needs a file
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        tmp.write(audio)
+    _play_and_cleanup(tmp.name)
+
+
 def _play_and_cleanup(path: str) -> None:
     try:
         if platform.system() == "Windows" and pathlib.Path(path).suffix.lower() == ".wav":
@@ -205,19 +299,112 @@ def _play_and_cleanup(path: str) -> None:
 
 # moved to top for lint compliance
 
+# A stream that delivers nothing for this long after its first chunk is given up
+_STREAM_STALL_S = 10.0
+# Hedge delay = budget_ms * TTS_HEDGE_FACTOR, clamped; lines without a budget use the default
+_HEDGE_MIN_S = 0.25
+_HEDGE_MAX_S = 4.0
+_HEDGE_DEFAULT_MS = 1500
+
+
+async def _open_stream(
+    chunks: AsyncIterator[bytes], first_timeout: float
+) -> tuple[bytes, AsyncIterator[bytes]]:
+    """Wait (at most first_timeout) for the first chunk; the stream stays open after it.
+
+    A backend that fails before producing audio thus fails here, while the next one can
+    still be tried.
+    """
+    it = chunks.__aiter__()
+    try:
+        return await asyncio.wait_for(it.__anext__(), first_timeout), it
+    except StopAsyncIteration:
+        raise RuntimeError("stream ended before any audio")
+    except BaseException:
+        await it.aclose()
+        raise
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+async def _discard(got: "_Synth") -> None:
+    # A losing backend that had already opened its stream
+    if got.stream is not None:
+        await got.stream.aclose()
+
+
+class _Synth:
+    """One backend's audio for a line, ready to play: buffered bytes or an opened stream."""
+
+    __slots__ = (
+        "backend",
+        "suffix",
+        "t0",
+        "key",
+        "cached",
+        "audio",
+        "first",
+        "stream",
+        "visemes",
+        "words",
+    )
+
+    def __init__(self, backend: str, suffix: str, t0: float, key: str | None) -> None:
+        self.backend = backend
+        self.suffix = suffix
+        self.t0 = t0  # when this backend was started
+        self.key = key
+        self.cached = False
+        self.audio = b""
+        self.first = b""
+        self.stream: AsyncIterator[bytes] | None = None
+        self.visemes: list[dict] | None = None  # Edge only
+        self.words: list[dict] | None = None
+
+
+class _Utterance:
+    """Playback state shared by every segment of one utterance_id (speak(append=True))."""
+
+    __slots__ = ("stopper_box", "handle", "pending", "tail", "finished")
+
+    def __init__(self, stopper_box: dict) -> None:
+        self.stopper_box = stopper_box
+        self.handle: PlaybackHandle | None = None
+        self.pending = 1  # segments queued or playing
+        self.tail: asyncio.Task | None = None  # newest segment's task
+        self.finished: asyncio.Future | None = None  # resolves when that audio ends
+
 
 class TTSManager:
     """Orchestrate TTS with fallbacks: ElevenLabs -> Piper -> Edge.
     Configure via environment variables:
       - TTS_PRIORITY (csv): default 'elevenlabs,piper,edge'
       - ELEVENLABS_VOICE, ELEVENLABS_MODEL_ID
-      - PIPER_EXE, PIPER_MODEL
+      - PIPER_EXE, PIPER_MODEL, PIPER_WARM=1 for a warm Piper worker instead of one per line
       - EDGE_VOICE, EDGE_RATE
+      - TTS_CACHE_DIR, TTS_CACHE_MB: synthesis cache location and size (0 disables)
+      - TTS_DEBUG_AUDIO_DIR: also write every synthesized line there
+      - TTS_STREAM_PLAYER, TTS_STREAM=0: stdin player for streamed lines, or buffer them
+      - TTS_HEDGE_FACTOR: hedge delay as a multiple of the line's budget_ms (0 disables)
     Secrets:
       - elevenlabs.api.key (secrets_store)
+    With a bus (constructor or set_bus), publishes 'speak.done'
+    {'utterance_id', 'status': finished|cancelled|failed, 'ts'} when playback really ends.
+    Synthesized lines are cached on disk (see SynthCache); a repeated line plays from
+    the cache without touching the backend.
+    With ffplay/mpv on PATH, Edge and ElevenLabs lines start playing from their first
+    audio chunk while the rest is still being synthesized.
+    Backends are hedged: when the preferred one has produced no audio within the line's
+    budget_ms (scaled by TTS_HEDGE_FACTOR), the next one is raced against it and the
+    first to deliver plays; the other is cancelled.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, bus: Any | None = None) -> None:
+        # Optional EventBus for playback events (published from player threads)
+        self.bus = bus
         # Defaults/env
         env_priority = (os.environ.get("TTS_PRIORITY") or "").strip()
         # Edge
@@ -301,10 +488,119 @@ class TTSManager:
         self._wps = WPSMeter()
         self._viseme_sink = None  # optional callable(utterance_id:str, event:dict)
         self._mixer_ready = False
+        self._live: dict[str, _Utterance] = {}
+        self._seg_lock = threading.Lock()  # players end segments from their own threads
+        # Warm Piper process per model (see PiperPool); None -> spawn per line
+        self._piper_pool: PiperPool | None = None
+        # Opt-in: Piper's raw output has no per-line framing, so a warm worker hands its
+        # audio back through a WAV file (on /dev/shm where there is one); the default
+        # cold --output_raw run keeps every line in memory.
+        if _piper_ok and os.environ.get("PIPER_WARM", "0").strip() == "1":
+            self._piper_pool = PiperPool(self.piper_exe)
+        # Stdin player for streamed Edge/ElevenLabs lines (see stream_player); None -> buffer
+        self._stream_argv = find_stream_player()
+        # Race the next backend when one is slow (see _race); 0 -> strictly one after another
+        try:
+            self.hedge_factor = float(os.environ.get("TTS_HEDGE_FACTOR", "1.0") or 0)
+        except ValueError:
+            self.hedge_factor = 1.0
+        self.hedges = 0
+        self.hedge_winners: dict[str, int] = {}
+        # Audio stays in memory; files only for the cache and the debug dump
+        self._debug_dir = os.environ.get("TTS_DEBUG_AUDIO_DIR", "").strip()
+        self.cache: SynthCache | None = None
+        try:
+            cache_mb = float(os.environ.get("TTS_CACHE_MB", "256") or 0)
+            if cache_mb > 0:
+                cache_dir = os.environ.get("TTS_CACHE_DIR") or os.path.join(
+                    tempfile.gettempdir(), "veildaemon-tts-cache"
+                )
+                self.cache = SynthCache(cache_dir, int(cache_mb * 1024 * 1024))
+        except (OSError, ValueError):
+            self.cache = None
 
     def set_viseme_sink(self, sink):
         self._viseme_sink = sink
 
+    def set_bus(self, bus) -> None:
+        self.bus = bus
+
+    def _cache_lookup(
+        self, backend: str, voice: str, variant: str, text: str
+    ) -> tuple[str | None, CachedSynth | None]:
+        cache = self.cache
+        if cache is None:
+            return None, None
+        key = cache_key(backend, voice, variant, text)
+        return key, cache.get(key)
+
+    def _cache_store(
+        self,
+        key: str | None,
+        audio: bytes,
+        suffix: str,
+        visemes: list | None = None,
+        words: list | None = None,
+    ) -> None:
+        if key is not None and self.cache is not None:
+            self.cache.put(key, audio, suffix, visemes, words)
+
+    def _publish_done(self, utterance_id: str | None, status: str) -> None:
+        """Publish speak.done (finished | cancelled | failed); safe from any thread."""
+        bus = self.bus
+        if bus is None or utterance_id is None:
+            return
+        payload = {"utterance_id": utterance_id, "status": status, "ts": time.monotonic()}
+        try:
+            bus.publish_threadsafe("speak.done", payload)
+        except RuntimeError:
+            pass  # bus loop gone
+
+    def _end_segment(
+        self, utterance_id: str, status: str, finished: asyncio.Future | None = None
+    ) -> None:
+        """A segment stopped playing (any thread); speak.done follows the last one."""
+        with self._seg_lock:
+            u = self._live.get(utterance_id)
+            last = True
+            if u is not None:
+                u.pending -= 1
+                last = u.pending <= 0 or status != "finished"
+                if last:
+                    del self._live[utterance_id]
+        if finished is not None:
+            finished.get_loop().call_soon_threadsafe(_resolve, finished)
+        if last:
+            if u is not None and u.handle is not None:
+                self._handles.release_threadsafe(u.handle)
+            self._publish_done(utterance_id, status)
+
+    async def _await_turn(self, utterance_id: str, after: asyncio.Task | None) -> None:
+        """An appended segment starts once the previous one has finished playing."""
+        if after is None:
+            return
+        await asyncio.wait({after})
+        u = self._live.get(utterance_id)
+        fut = u.finished if u is not None else None
+        if fut is not None and not fut.done():
+            await asyncio.wait({fut})
+
+    async def _watch_mixer(
+        self, utterance_id: str, stopped: dict, finished: asyncio.Future, wake: asyncio.Event
+    ) -> None:
+        import pygame  # type: ignore
+
+        try:
+            while pygame.mixer.music.get_busy():
+                try:
+                    # Poll for the natural end; a stop wakes us at once
+                    await asyncio.wait_for(wake.wait(), 0.02)
+                except asyncio.TimeoutError:
+                    pass
+        except Exception:
+            pass
+        self._end_segment(utterance_id, "cancelled" if stopped else "finished", finished)
+
     def _ensure_mixer(self) -> None:
         if self._mixer_ready:
             return
@@ -316,35 +612,53 @@ class TTSManager:
         except Exception:
             self._mixer_ready = False
 
-    def _play_file(self, path: str):
-        """Play audio with best-effort stoppable backend. Returns stopper callable."""
-        stopper = None
-        # Try pygame mixer first
+    def _begin_playback(self, utterance_id: str | None):
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future() if utterance_id is not None else None
+        u = self._live.get(utterance_id) if utterance_id is not None else None
+        if u is not None:
+            u.finished = finished
+        return loop, finished
+
+    def _play_mixer(self, source: Any, namehint: str, utterance_id, loop, finished):
+        """Start pygame playback of a path or file object; stopper, or None if unavailable."""
         self._ensure_mixer()
-        if self._mixer_ready:
-            try:
-                import pygame  # type: ignore
-
-                pygame.mixer.music.load(path)
-                pygame.mixer.music.play()
+        if not self._mixer_ready:
+            return None
+        try:
+            import pygame  # type: ignore
 
-                def _stop():
-                    try:
-                        pygame.mixer.music.stop()
-                    except Exception:
-                        pass
+            pygame.mixer.music.load(source, namehint)
+            pygame.mixer.music.play()
+        except Exception:
+            return None
+        stopped: dict = {}
+        wake = asyncio.Event()
 
-                stopper = _stop
-                return stopper
+        def _stop():
+            stopped["at"] = time.perf_counter()
+            try:
+                pygame.mixer.music.stop()
             except Exception:
                 pass
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass  # loop closed
+
+        if utterance_id is not None:
+            loop.create_task(self._watch_mixer(utterance_id, stopped, finished, wake))
+        return _stop
 
-        # Fallback: winsound/playsound (no real stop)
+    def _play_in_thread(self, play: Callable[[], None], utterance_id, loop, finished):
+        # Fallback players (winsound/playsound) block and cannot be stopped
         def _ps():
-            _play_and_cleanup(path)
+            try:
+                play()
+            finally:
+                if utterance_id is not None:
+                    self._end_segment(utterance_id, "finished", finished)
 
-        # Launch in threadpool to avoid blocking task
-        loop = asyncio.get_running_loop()
         loop.run_in_executor(None, _ps)
 
         def _noop():
@@ -352,6 +666,156 @@ class TTSManager:
 
         return _noop
 
+    def _play_audio(self, audio: bytes, suffix: str, utterance_id: str | None = None):
+        """Play encoded audio (.mp3/.wav) straight from memory. Returns stopper callable."""
+        loop, finished = self._begin_playback(utterance_id)
+        stopper = self._play_mixer(
+            io.BytesIO(audio), suffix.lstrip("."), utterance_id, loop, finished
+        )
+        if stopper is not None:
+            return stopper
+        return self._play_in_thread(
+            lambda: _play_bytes(audio, suffix), utterance_id, loop, finished
+        )
+
+    def _play_file(self, path: str, utterance_id: str | None = None):
+        """Play an audio file (removed afterwards by the fallback players). Returns stopper."""
+        loop, finished = self._begin_playback(utterance_id)
+        stopper = self._play_mixer(path, "", utterance_id, loop, finished)
+        if stopper is not None:
+            return stopper
+        return self._play_in_thread(lambda: _play_and_cleanup(path), utterance_id, loop, finished)
+
+    async def _play_stream(
+        self,
+        first: bytes,
+        it: AsyncIterator[bytes],
+        utterance_id: str | None,
+        after: asyncio.Task | None,
+        on_complete: Callable[[bytes], None],
+    ) -> tuple[Callable[[], None], asyncio.Task]:
+        """Play an opened stream (see _open_stream) through the stream player.
+
+        Later chunks are fed while synthesis continues. Returns the stopper and the task
+        feeding the player; on_complete gets the whole line once synthesis finished
+        cleanly.
+        """
+        q: asyncio.Queue = asyncio.Queue()
+        q.put_nowait(first)
+        errors: list[BaseException] = []
+
+        async def pump():
+            try:
+                while True:
+                    q.put_nowait(await asyncio.wait_for(it.__anext__(), _STREAM_STALL_S))
+            except StopAsyncIteration:
+                pass
+            except Exception as e:
+                errors.append(e)
+            finally:
+                q.put_nowait(None)
+                await it.aclose()
+
+        pump_task = asyncio.create_task(pump())
+        player = StreamPlayer(self._stream_argv or ())
+        try:
+            # An appended segment keeps downloading while the previous one plays
+            await self._await_turn(utterance_id, after)
+            await player.start()
+        except OSError as e:
+            pump_task.cancel()
+            raise RuntimeError(f"stream player failed: {e}")
+        except BaseException:
+            pump_task.cancel()
+            raise
+        loop, finished = self._begin_playback(utterance_id)
+
+        stop_mark = object()  # queued by the stopper; None means the stream ended
+
+        async def feed():
+            audio = bytearray()
+            complete = False
+            try:
+                while True:
+                    chunk = await q.get()
+                    if chunk is stop_mark:
+                        break  # cut off: never cache or measure a partial line
+                    if chunk is None:
+                        complete = not errors
+                        break
+                    audio += chunk
+                    if not await player.feed(chunk):
+                        break
+                await player.finish()
+            finally:
+                if not pump_task.done():
+                    pump_task.cancel()
+                if player.stopped:
+                    status = "cancelled"
+                elif complete:
+                    status = "finished"
+                else:
+                    status = "failed"
+                    print(f"[TTS] stream cut short: {errors[0] if errors else 'player exited'}")
+                if utterance_id is not None:
+                    self._end_segment(utterance_id, status, finished)
+            if complete:
+                on_complete(bytes(audio))
+
+        def _stop():
+            player.stop()
+            try:
+                loop.call_soon_threadsafe(q.put_nowait, stop_mark)  # wake the feeder at once
+            except RuntimeError:
+                pass  # loop closed
+
+        return _stop, loop.create_task(feed())
+
+    def _schedule_events(
+        self,
+        utterance_id: str,
+        sink: Callable[[str, dict], Any],
+        visemes: list[dict],
+        word_events: list[dict],
+        more: asyncio.Task | None = None,
+    ) -> None:
+        """Fire viseme (else word) events on the playback clock.
+
+        With more (a streaming line), the lists are still growing until that task ends.
+        """
+        loop = asyncio.get_running_loop()
+        start_ts = loop.time() + 0.05
+
+        async def _emit():
+            i = 0
+            try:
+                while True:
+                    # prefer visemes, fallback to words
+                    seq = visemes if visemes else word_events
+                    if i >= len(seq):
+                        if more is None or more.done():
+                            return
+                        await asyncio.wait({more}, timeout=0.05)
+                        continue
+                    ev = seq[i]
+                    i += 1
+                    when = start_ts + float(ev.get("t") or 0.0)
+                    await asyncio.sleep(max(0.0, when - loop.time()))
+                    try:
+                        payload = dict(ev)
+                        payload["utterance_id"] = utterance_id
+                        maybe = sink(utterance_id, payload)
+                        if asyncio.iscoroutine(maybe):
+                            await maybe
+                    except Exception:
+                        pass
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass
+
+        asyncio.create_task(_emit())
+
     async def speak(
         self,
         text: str,
@@ -360,12 +824,48 @@ class TTSManager:
         voice: str | None = None,
         on_viseme: Callable[[str, dict], None] | None = None,
         on_done: Callable[[str, str, float], None] | None = None,
+        append: bool = False,
+        budget_ms: int | None = None,
     ) -> PlaybackHandle | None:
+        """Synthesize and play text; returns a handle that can cancel it.
+
+        append=True adds text as the next segment of utterance_id if that utterance is
+        still playing: it is synthesized right away and starts when the previous segment
+        ends, under the same handle and a single speak.done. Otherwise it is a new line.
+        budget_ms (the plan's) sets how long a slow backend gets before the next is raced.
+        """
         # Ensure sane text
         if not (text and str(text).strip()):
             return None
         if utterance_id is None:
             utterance_id = f"utt-{int(asyncio.get_running_loop().time()*1000)}"
+        seg: dict = {}
+
+        def _cancelled_early(t: asyncio.Task) -> None:
+            # Cancelled before playback started: no player will report completion
+            if t.cancelled() and "played" not in seg:
+                self._end_segment(utterance_id, "cancelled")
+
+        live = self._live.get(utterance_id) if append else None
+        if live is not None and live.handle is not None:
+            with self._seg_lock:
+                live.pending += 1
+            task = asyncio.create_task(
+                self._speak_inner(
+                    text,
+                    utterance_id,
+                    live.stopper_box,
+                    voice_override=voice,
+                    on_viseme=on_viseme,
+                    on_done=on_done,
+                    after=live.tail,
+                    seg=seg,
+                    budget_ms=budget_ms,
+                )
+            )
+            live.tail = task
+            task.add_done_callback(_cancelled_early)
+            return await self._handles.attach(live.handle, task)
         lock = getattr(self, "_lock", None)
         stopper_box: dict[str, Callable[[], None]] = {}
 
@@ -387,6 +887,8 @@ class TTSManager:
                         voice_override=voice,
                         on_viseme=on_viseme,
                         on_done=on_done,
+                        seg=seg,
+                        budget_ms=budget_ms,
                     )
                 )
         else:
@@ -398,9 +900,233 @@ class TTSManager:
                     voice_override=voice,
                     on_viseme=on_viseme,
                     on_done=on_done,
+                    seg=seg,
+                    budget_ms=budget_ms,
+                )
+            )
+        u = self._live[utterance_id] = _Utterance(stopper_box)
+        u.tail = task
+        task.add_done_callback(_cancelled_early)
+        # Held until the audio ends (_end_segment), so a barge-in can still stop it
+        u.handle = await self._handles.register(
+            utterance_id, task, stopper=dynamic_stopper, hold=True
+        )
+        if self._live.get(utterance_id) is not u:  # already over while registering
+            self._handles.release_threadsafe(u.handle)
+        return u.handle
+
+    async def run(self, bus: Any | None = None) -> None:
+        """Voice decided lines from the bus 'speak' channel (SpeakEvent or dict).
+
+        Units with seq > 0 (see stage_director.chunk_assembler) are appended to the
+        utterance already playing. Also binds this manager to bus for speak.done.
+        """
+        if bus is not None:
+            self.bus = bus
+        q = await self.bus.subscribe("speak", maxsize=64)
+        if self._piper_pool is not None and "piper" in self.priority:
+            asyncio.create_task(self._warm_piper())
+        while True:
+            ev = await q.get()
+            get = getattr(ev, "get", None)
+            if not callable(get):
+                continue
+            await self.speak(
+                get("text") or "",
+                get("utterance_id"),
+                append=bool(get("seq")),
+                budget_ms=get("budget_ms"),
+            )
+
+    async def _warm_piper(self) -> None:
+        # Load the voice before the first line needs it
+        try:
+            await self._piper_pool.start(self.piper_model)
+        except (OSError, RuntimeError) as e:
+            print(f"[TTS] piper warm-up failed: {e}")
+
+    async def _piper_synth(self, text: str) -> bytes:
+        pool = self._piper_pool
+        if pool is not None:
+            return await pool.synth_bytes(text, self.piper_model)
+        return await asyncio.wait_for(
+            _piper_bytes(text, self.piper_exe, self.piper_model), timeout=20.0
+        )
+
+    def _debug_dump(self, utterance_id: str, backend: str, audio: bytes, suffix: str) -> None:
+        # TTS_DEBUG_AUDIO_DIR keeps a copy of every synthesized line
+        d = self._debug_dir
+        if not d:
+            return
+        try:
+            os.makedirs(d, exist_ok=True)
+            with open(os.path.join(d, f"{utterance_id}_{backend}{suffix}"), "wb") as f:
+                f.write(audio)
+        except OSError as e:
+            print(f"[TTS] debug dump failed: {e}")
+
+    def _streamed(self, got: _Synth, utterance_id: str, words: int) -> Callable[[bytes], None]:
+        """Bookkeeping for a streamed line once its last chunk arrived."""
+
+        def done(audio: bytes) -> None:
+            # WPS measures whole synthesis, as for buffered lines
+            dt = max(0.001, time.perf_counter() - got.t0)
+            self._wps.update(words, dt)
+            self._wps.update_for(got.backend, words, dt)
+            self._cache_store(got.key, audio, got.suffix, got.visemes, got.words)
+            self._debug_dump(utterance_id, got.backend, audio, got.suffix)
+
+        return done
+
+    async def _synth(
+        self, be: str, text: str, utterance_id: str, voice_override: str | None = None
+    ) -> _Synth:
+        """Audio for text from backend be (cache first); raises when the backend fails."""
+        t0 = time.perf_counter()
+        if be == "elevenlabs":
+            el_voice = voice_override or self.el_voice
+            if not el_voice:
+                raise RuntimeError("ELEVENLABS_VOICE not set")
+            key, hit = self._cache_lookup(be, el_voice, self.el_model, text)
+            got = _Synth(be, ".mp3", t0, key)
+            if hit is not None:
+                print(f"[TTS] backend=elevenlabs voice={el_voice} (cached)")
+                got.audio, got.cached = hit.audio, True
+                return got
+            # Pre-check key to avoid misleading backend log
+            try:
+                from secrets_store import get_secret  # type: ignore
+
+                if not (get_secret("elevenlabs.api.key") or "").strip():
+                    raise RuntimeError("elevenlabs.api.key missing")
+            except Exception:
+                raise RuntimeError("elevenlabs.api.key missing")
+            print(f"[TTS] backend=elevenlabs voice={el_voice}")
+            if self._stream_argv:
+                got.first, got.stream = await _open_stream(
+                    _elevenlabs_stream(text, el_voice, self.el_model), 25.0
+                )
+                return got
+            got.audio = await asyncio.wait_for(
+                _elevenlabs_bytes(text, el_voice, self.el_model), timeout=25.0
+            )
+        elif be == "piper":
+            key, hit = self._cache_lookup(be, "", self.piper_model, text)
+            got = _Synth(be, ".wav", t0, key)
+            if hit is not None:
+                print("[TTS] backend=piper (cached)")
+                got.audio, got.cached = hit.audio, True
+                return got
+            print("[TTS] backend=piper")
+            got.audio = await self._piper_synth(text)
+        elif be == "edge":
+            edge_voice = voice_override or self.edge_voice
+            key, hit = self._cache_lookup(be, edge_voice, self.edge_rate, text)
+            got = _Synth(be, ".mp3", t0, key)
+            if hit is not None:
+                print("[TTS] backend=edge (cached)")
+                got.audio, got.cached = hit.audio, True
+                got.visemes, got.words = hit.visemes, hit.words
+                return got
+            if self._stream_argv:
+                print("[TTS] backend=edge (streaming)")
+                got.visemes, got.words = [], []
+                got.first, got.stream = await _open_stream(
+                    _edge_tts_stream(text, edge_voice, self.edge_rate, got.visemes, got.words),
+                    12.0,
                 )
+                return got
+            print("[TTS] backend=edge")
+            got.audio, got.visemes, got.words = await asyncio.wait_for(
+                _edge_tts_bytes(text, edge_voice, self.edge_rate), timeout=12.0
             )
-        return await self._handles.register(utterance_id, task, stopper=dynamic_stopper)
+        else:
+            raise RuntimeError(f"unknown backend {be!r}")
+        self._cache_store(key, got.audio, got.suffix, got.visemes, got.words)
+        self._debug_dump(utterance_id, be, got.audio, got.suffix)
+        return got
+
+    def _hedge_delay(self, budget_ms: int | None) -> float | None:
+        """Seconds to wait on a backend before racing the next one; None: never hedge."""
+        if self.hedge_factor <= 0:
+            return None
+        ms = budget_ms if budget_ms and budget_ms > 0 else _HEDGE_DEFAULT_MS
+        return min(_HEDGE_MAX_S, max(_HEDGE_MIN_S, ms * self.hedge_factor / 1000.0))
+
+    async def _race(
+        self,
+        prio: list[str],
+        text: str,
+        utterance_id: str,
+        voice_override: str | None,
+        hedge: float | None,
+    ) -> tuple[_Synth | None, BaseException | None]:
+        """First backend in prio to produce audio, hedging down the list.
+
+        The next backend starts when the running ones have all failed, or when hedge
+        seconds passed since the last start without audio. The first result wins and
+        the others are cancelled. Returns (winner or None, last error).
+        """
+        loop = asyncio.get_running_loop()
+        backends = iter(prio)
+        pending: dict[asyncio.Task, str] = {}
+        last_error: BaseException | None = None
+        started = 0.0
+        hedged = False
+
+        def launch() -> bool:
+            nonlocal started
+            be = next(backends, None)
+            if be is None:
+                return False
+            task = asyncio.create_task(self._synth(be, text, utterance_id, voice_override))
+            pending[task] = be
+            started = loop.time()
+            return True
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if hedge is not None:
+                    timeout = max(0.0, started + hedge - loop.time())
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    if launch():
+                        hedged = True
+                        self.hedges += 1
+                        print(f"[TTS] no audio after {hedge:.2f}s, racing {list(pending.values())}")
+                    else:
+                        hedge = None  # nothing left to race
+                    continue
+                winner = None
+                for task in sorted(done, key=lambda t: prio.index(pending[t])):
+                    be = pending.pop(task)
+                    if task.cancelled():
+                        continue
+                    e = task.exception()
+                    if e is not None:
+                        # Explain why a backend was skipped
+                        print(f"[TTS] {be} failed: {e}")
+                        last_error = e
+                    elif winner is None:
+                        winner = task.result()
+                    else:
+                        await _discard(task.result())
+                if winner is not None:
+                    if hedged:
+                        self.hedge_winners[winner.backend] = (
+                            self.hedge_winners.get(winner.backend, 0) + 1
+                        )
+                    return winner, last_error
+                if not pending:
+                    launch()
+            return None, last_error
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def _speak_inner(
         self,
@@ -411,116 +1137,67 @@ class TTSManager:
         voice_override: str | None = None,
         on_viseme: Callable[[str, dict], None] | None = None,
         on_done: Callable[[str, str, float], None] | None = None,
+        after: asyncio.Task | None = None,
+        seg: dict | None = None,
+        budget_ms: int | None = None,
     ) -> None:
-        last_error = None
         # Skip network TTS when offline
         prio = self.priority
         if os.environ.get("VEIL_MODE", "").strip().lower() == "offline":
             prio = [p for p in prio if p != "elevenlabs"]
         words = len((text or "").split())
-        for be in prio:
+        t0 = time.perf_counter()
+        got, last_error = await self._race(
+            prio, text, utterance_id, voice_override, self._hedge_delay(budget_ms)
+        )
+        if got is None:
+            # All backends failed
+            msg = f"[TTS error] {last_error}" if last_error else "[TTS error] No backends available"
+            print(msg)
+            self._end_segment(utterance_id, "failed")
+            return
+        feeding = None
+        if got.stream is not None:
             try:
-                t0 = time.perf_counter()
-                if be == "elevenlabs":
-                    el_voice = voice_override or self.el_voice
-                    if not el_voice:
-                        raise RuntimeError("ELEVENLABS_VOICE not set")
-                    # Pre-check key to avoid misleading backend log
-                    try:
-                        from secrets_store import get_secret  # type: ignore
+                stopper, feeding = await self._play_stream(
+                    got.first,
+                    got.stream,
+                    utterance_id,
+                    after,
+                    self._streamed(got, utterance_id, words),
+                )
+            except RuntimeError as e:
+                print(f"[TTS error] {e}")
+                self._end_segment(utterance_id, "failed")
+                return
+        else:
+            await self._await_turn(utterance_id, after)
+            stopper = self._play_audio(got.audio, got.suffix, utterance_id)
+        stopper_box["stopper"] = stopper
+        if seg is not None:
+            seg["played"] = True
+        # Schedule viseme/word callbacks tagged with utterance_id
+        sink = on_viseme or self._viseme_sink
+        if callable(sink) and got.visemes is not None:
+            if got.visemes or got.words or feeding is not None:
+                self._schedule_events(utterance_id, sink, got.visemes, got.words, feeding)
+        if not got.cached and feeding is None:
+            synth_dt = max(0.001, time.perf_counter() - got.t0)
+            self._wps.update(words, synth_dt)
+            self._wps.update_for(got.backend, words, synth_dt)
+        dt = max(0.001, time.perf_counter() - t0)
+        try:
+            if callable(on_done):
+                on_done(utterance_id, text, dt)
+        except Exception:
+            pass
 
-                        if not (get_secret("elevenlabs.api.key") or "").strip():
-                            raise RuntimeError("elevenlabs.api.key missing")
-                    except Exception:
-                        raise RuntimeError("elevenlabs.api.key missing")
-                    print(f"[TTS] backend=elevenlabs voice={el_voice}")
-                    path = await asyncio.wait_for(
-                        _elevenlabs_to_file(text, el_voice, self.el_model), timeout=25.0
-                    )
-                    stopper = self._play_file(path)
-                    stopper_box["stopper"] = stopper
-                    dt = max(0.001, time.perf_counter() - t0)
-                    self._wps.update(words, dt)
-                    self._wps.update_for("elevenlabs", words, dt)
-                    try:
-                        if callable(on_done):
-                            on_done(utterance_id, text, dt)
-                    except Exception:
-                        pass
-                    return
-                if be == "piper":
-                    print("[TTS] backend=piper")
-                    path = await asyncio.wait_for(
-                        _piper_to_file(text, self.piper_exe, self.piper_model), timeout=20.0
-                    )
-                    stopper = self._play_file(path)
-                    stopper_box["stopper"] = stopper
-                    dt = max(0.001, time.perf_counter() - t0)
-                    self._wps.update(words, dt)
-                    self._wps.update_for("piper", words, dt)
-                    try:
-                        if callable(on_done):
-                            on_done(utterance_id, text, dt)
-                    except Exception:
-                        pass
-                    return
-                if be == "edge":
-                    print("[TTS] backend=edge")
-                    edge_voice = voice_override or self.edge_voice
-                    path, visemes, word_events = await asyncio.wait_for(
-                        _edge_tts_to_file(text, edge_voice, self.edge_rate), timeout=12.0
-                    )
-                    stopper = self._play_file(path)
-                    stopper_box["stopper"] = stopper
-                    # Schedule viseme/word callbacks tagged with utterance_id
-                    sink = on_viseme or self._viseme_sink
-                    if callable(sink) and (visemes or word_events):
-                        loop = asyncio.get_running_loop()
-                        start_ts = loop.time() + 0.05
-
-                        async def _emit():
-                            try:
-                                # prefer visemes, fallback to words
-                                seq = visemes if visemes else word_events
-                                for ev in seq:
-                                    when = start_ts + float(ev.get("t") or 0.0)
-                                    await asyncio.sleep(max(0.0, when - loop.time()))
-                                    try:
-                                        payload = dict(ev)
-                                        payload["utterance_id"] = utterance_id
-                                        local_sink = sink
-                                        if callable(local_sink):
-                                            maybe = local_sink(utterance_id, payload)
-                                            if asyncio.iscoroutine(maybe):
-                                                await maybe
-                                    except Exception:
-                                        pass
-                            except asyncio.CancelledError:
-                                pass
-                            except Exception:
-                                pass
-
-                        asyncio.create_task(_emit())
-                    dt = max(0.001, time.perf_counter() - t0)
-                    self._wps.update(words, dt)
-                    self._wps.update_for("edge", words, dt)
-                    try:
-                        if callable(on_done):
-                            on_done(utterance_id, text, dt)
-                    except Exception:
-                        pass
-                    return
-            except Exception as e:
-                # Explain why a backend was skipped
-                try:
-                    print(f"[TTS] {be} failed: {e}")
-                except Exception:
-                    pass
-                last_error = e
-                continue
-        # If we got here, all backends failed
-        msg = f"[TTS error] {last_error}" if last_error else "[TTS error] No backends available"
-        print(msg)
+    def hedge_stats(self) -> dict:
+        return {
+            "hedge_factor": self.hedge_factor,
+            "hedged": self.hedges,
+            "won_after_hedge": dict(self.hedge_winners),
+        }
 
 
 # Default manager to preserve simple import usage
@@ -545,11 +1222,24 @@ async def cancel(utterance_id: str) -> bool:
     return await _manager._handles.cancel(utterance_id)
 
 
+def cancel_nowait(utterance_id: str) -> bool:
+    return _manager._handles.cancel_nowait(utterance_id)
+
+
 def mark_final(utterance_id: str) -> None:
     # Placeholder: hook for future per-utterance finalization (metrics, cleanup)
     pass
 
 
+def get_cache_stats() -> dict:
+    cache = _manager.cache
+    return cache.stats() if cache is not None else {}
+
+
+def get_hedge_stats() -> dict:
+    return _manager.hedge_stats()
+
+
 def get_wps() -> float:
     return _manager._wps.get()
 
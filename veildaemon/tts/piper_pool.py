@@ -0,0 +1,231 @@
+"""Warm Piper worker processes, one per voice model.
+
+Spawning Piper per line reloads the ONNX voice every time, which dominates the latency
+of short lines. A worker keeps one Piper process running in --output_dir mode: each
+line written to its stdin is synthesized into a WAV in that directory and the path is
+printed on stdout, so the model is loaded once and a request is one pipe round trip.
+synth_bytes() reads the WAV back and removes it; the directory lives on /dev/shm
+where available, so the round trip never reaches a disk. Elsewhere (Windows, macOS) it
+is a regular temp dir, which is why TTSManager only uses the pool with PIPER_WARM=1:
+Piper's --output_raw has no per-line framing to return audio over the pipe instead.
+
+Requests to one worker are serialized (Piper answers lines in order). A worker whose
+process exited, closed its pipes or missed the deadline is killed and respawned, and
+the request is retried once on the fresh process. check() reports dead workers and
+can probe the live ones with a short line. Cancelling a request does not disturb the
+worker: the line finishes in the background and its WAV is dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+_PROBE_TEXT = "ok."
+# Piper's --output_dir mode needs a directory; keep it in RAM where the OS offers one
+_SHM = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+
+class PiperWorker:
+    """One long-lived Piper process for one model."""
+
+    def __init__(self, exe: str, model: str, *, out_dir: Optional[str] = None) -> None:
+        self.exe = exe
+        self.model = model
+        self.out_dir = out_dir or tempfile.mkdtemp(prefix="piper-", dir=_SHM)
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        self.started_at = 0.0
+        self.served = 0
+
+    def alive(self) -> bool:
+        p = self._proc
+        return p is not None and p.returncode is None
+
+    async def start(self) -> None:
+        if not (self.exe and os.path.exists(self.exe)):
+            raise RuntimeError("PIPER_EXE path invalid or missing")
+        if not (self.model and os.path.exists(self.model)):
+            raise RuntimeError("PIPER_MODEL path invalid or missing")
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._proc = await asyncio.create_subprocess_exec(
+            self.exe,
+            "-m",
+            self.model,
+            "--output_dir",
+            self.out_dir,
+            "-q",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self.started_at = time.monotonic()
+
+    async def stop(self) -> None:
+        p, self._proc = self._proc, None
+        if p is None or p.returncode is not None:
+            return
+        try:
+            p.kill()
+        except ProcessLookupError:
+            pass
+        await p.wait()
+
+    async def synth(self, text: str, timeout: float = 20.0) -> str:
+        """Synthesize one line; returns the WAV path (caller owns and removes it).
+
+        A cancelled caller (say, the loser of a hedged race) must not leave Piper's
+        answer in the pipe for the next request, so the round trip runs to completion
+        and its WAV is removed if nobody is waiting for it any more.
+        """
+        task = asyncio.ensure_future(self._synth(text, timeout))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            task.add_done_callback(_discard_wav)
+            raise
+
+    async def _synth(self, text: str, timeout: float) -> str:
+        line = " ".join((text or "").split())  # one request per line
+        async with self._lock:
+            if not self.alive():
+                raise RuntimeError("piper worker not running")
+            p = self._proc
+            try:
+                p.stdin.write(line.encode("utf-8", errors="ignore") + b"\n")
+                await p.stdin.drain()
+                out = await asyncio.wait_for(p.stdout.readline(), timeout)
+            except (asyncio.TimeoutError, BrokenPipeError, ConnectionResetError) as e:
+                await self.stop()
+                raise RuntimeError(f"piper worker failed: {e!r}")
+            if not out:
+                await self.stop()
+                raise RuntimeError(f"piper worker exited ({p.returncode})")
+        path = out.decode("utf-8", errors="ignore").strip()
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            raise RuntimeError(f"piper worker returned no file: {path!r}")
+        if size < 1024:
+            raise RuntimeError(f"piper produced a tiny WAV ({size} bytes)")
+        self.served += 1
+        return path
+
+
+class PiperPool:
+    """Warm PiperWorker per model, restarted on crash.
+
+    timeout: seconds a request may take before its worker is considered hung.
+    """
+
+    def __init__(self, exe: str, *, timeout: float = 20.0) -> None:
+        self.exe = exe
+        self.timeout = float(timeout)
+        self._workers: Dict[str, PiperWorker] = {}
+        self._start_lock = asyncio.Lock()
+        self.spawns = 0
+        self.restarts = 0
+        self.requests = 0
+        self.failures = 0
+
+    async def _worker(self, model: str) -> PiperWorker:
+        w = self._workers.get(model)
+        if w is not None and w.alive():
+            return w
+        async with self._start_lock:
+            w = self._workers.get(model)
+            if w is None:
+                w = self._workers[model] = PiperWorker(self.exe, model)
+            elif w.alive():
+                return w
+            else:
+                self.restarts += 1
+            await w.start()
+            self.spawns += 1
+            return w
+
+    async def start(self, model: str, *, probe: bool = True) -> None:
+        """Spawn the worker for model ahead of time; probe=True also loads the voice."""
+        w = await self._worker(model)
+        if probe:
+            path = await w.synth(_PROBE_TEXT, self.timeout)
+            _remove(path)
+
+    async def synth(self, text: str, model: str) -> str:
+        """WAV path for text in model's voice, retrying once on a fresh worker."""
+        self.requests += 1
+        w = await self._worker(model)
+        try:
+            return await w.synth(text, self.timeout)
+        except RuntimeError:
+            if w.alive():  # bad output, not a crash: a new process would not help
+                self.failures += 1
+                raise
+        w = await self._worker(model)
+        try:
+            return await w.synth(text, self.timeout)
+        except RuntimeError:
+            self.failures += 1
+            raise
+
+    async def synth_bytes(self, text: str, model: str) -> bytes:
+        """Like synth(), but returns the WAV bytes and removes the file at once."""
+        path = await self.synth(text, model)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            _remove(path)
+
+    async def check(self, *, probe: bool = False) -> Dict[str, bool]:
+        """Health per model; dead (or, with probe, unresponsive) workers are restarted."""
+        health = {}
+        for model, w in list(self._workers.items()):
+            ok = w.alive()
+            if ok and probe:
+                try:
+                    _remove(await w.synth(_PROBE_TEXT, self.timeout))
+                except RuntimeError:
+                    ok = False
+            if not ok:
+                await w.stop()
+                try:
+                    await self._worker(model)
+                except (OSError, RuntimeError):
+                    pass
+            health[model] = ok
+        return health
+
+    async def close(self) -> None:
+        for w in self._workers.values():
+            await w.stop()
+            shutil.rmtree(w.out_dir, ignore_errors=True)
+        self._workers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": {m: w.alive() for m, w in self._workers.items()},
+            "spawns": self.spawns,
+            "restarts": self.restarts,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+def _discard_wav(task: asyncio.Future) -> None:
+    if not task.cancelled() and task.exception() is None:
+        _remove(task.result())
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+__all__ = ["PiperPool", "PiperWorker"]
@@ -0,0 +1,97 @@
+"""Streaming playback through an external player fed on stdin.
+
+pygame.mixer and winsound want the whole file before they start, so a line from a
+network backend would still wait for its last byte. ffplay and mpv decode MP3 from a
+pipe as it arrives: TTSManager writes each chunk the backend delivers straight into
+the player, and playback begins with the first decodable frames while synthesis
+carries on.
+
+TTS_STREAM_PLAYER overrides the command (it must read audio on stdin and exit at
+EOF); TTS_STREAM=0 turns streaming off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shlex
+import shutil
+from typing import List, Optional, Sequence
+
+_CANDIDATES = (
+    ("ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "-"),
+    ("mpv", "--no-video", "--really-quiet", "--no-terminal", "-"),
+)
+
+
+def find_stream_player() -> Optional[List[str]]:
+    """Command line of a stdin player, or None when streaming is off or unavailable."""
+    if os.environ.get("TTS_STREAM", "1").strip() == "0":
+        return None
+    custom = os.environ.get("TTS_STREAM_PLAYER", "").strip()
+    if custom:
+        return shlex.split(custom, posix=os.name != "nt")
+    for exe, *args in _CANDIDATES:
+        path = shutil.which(exe)
+        if path:
+            return [path, *args]
+    return None
+
+
+class StreamPlayer:
+    """One player process for one line; stop() may be called from any thread."""
+
+    def __init__(self, argv: Sequence[str]) -> None:
+        self.argv = list(argv)
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self.stopped = False
+        self.fed = 0
+
+    async def start(self) -> None:
+        self._proc = await asyncio.create_subprocess_exec(
+            *self.argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+    def alive(self) -> bool:
+        p = self._proc
+        return p is not None and p.returncode is None and not self.stopped
+
+    async def feed(self, chunk: bytes) -> bool:
+        """Hand chunk to the player; False once it is gone (stopped or exited)."""
+        if not self.alive():
+            return False
+        try:
+            self._proc.stdin.write(chunk)
+            await self._proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            return False
+        self.fed += len(chunk)
+        return True
+
+    async def finish(self) -> Optional[int]:
+        """Close stdin and wait until the player has played what it was given."""
+        p = self._proc
+        if p is None:
+            return None
+        try:
+            if not p.stdin.is_closing():
+                p.stdin.close()
+            await p.stdin.wait_closed()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        return await p.wait()
+
+    def stop(self) -> None:
+        self.stopped = True
+        p = self._proc
+        if p is not None and p.returncode is None:
+            try:
+                p.kill()
+            except ProcessLookupError:
+                pass
+
+
+__all__ = ["StreamPlayer", "find_stream_player"]
@@ -0,0 +1,149 @@
+"""Content-addressed on-disk cache of synthesized lines.
+
+Stream quips, interrupt acks and showcase lines repeat all stream; synthesizing them
+again costs a network round trip (ElevenLabs, Edge) or a Piper subprocess each time.
+Entries are keyed by sha256 of (backend, voice, rate/model, text) and hold the audio
+plus the viseme and word-boundary events Edge produced with it, so a hit replays lip
+sync too.
+
+Layout: <root>/<key[:2]>/<key><ext> for the audio and <key>.json next to it for the
+events. Recency is kept in memory (rebuilt from mtimes on start) and the least
+recently used entries are evicted once the audio exceeds max_bytes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class CachedSynth:
+    audio: bytes
+    suffix: str  # ".mp3" / ".wav"
+    visemes: List[dict] = field(default_factory=list)
+    words: List[dict] = field(default_factory=list)
+
+
+def cache_key(backend: str, voice: str, variant: str, text: str) -> str:
+    raw = json.dumps([backend, voice, variant, text], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SynthCache:
+    """LRU byte-budgeted cache of synthesized audio files and their timing events."""
+
+    def __init__(self, root: str | os.PathLike, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self._index: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()  # key -> (size, ext)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evicted = 0
+        self._load()
+
+    def _load(self) -> None:
+        found = []
+        if self.root.is_dir():
+            for meta in self.root.glob("??/*.json"):
+                key = meta.stem
+                try:
+                    ext = json.loads(meta.read_text(encoding="utf-8")).get("ext", "")
+                    st = (meta.parent / f"{key}{ext}").stat()
+                except (OSError, ValueError, AttributeError):
+                    continue
+                found.append((st.st_mtime, key, st.st_size, ext))
+        for _, key, size, ext in sorted(found):
+            self._index[key] = (size, ext)
+            self.bytes += size
+
+    def _paths(self, key: str, ext: str) -> Tuple[Path, Path]:
+        d = self.root / key[:2]
+        return d / f"{key}{ext}", d / f"{key}.json"
+
+    def get(self, key: str) -> Optional[CachedSynth]:
+        """The cached audio plus its events, or None (counted as a miss)."""
+        entry = self._index.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        size, ext = entry
+        audio, meta = self._paths(key, ext)
+        try:
+            events = json.loads(meta.read_text(encoding="utf-8"))
+            data = audio.read_bytes()
+            os.utime(audio)  # recency survives a restart
+        except (OSError, ValueError):
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._index.move_to_end(key)
+        self.hits += 1
+        self.bytes_saved += size
+        return CachedSynth(
+            data, ext, list(events.get("visemes") or ()), list(events.get("words") or ())
+        )
+
+    def put(
+        self,
+        key: str,
+        data: bytes,
+        ext: str,
+        visemes: Optional[List[dict]] = None,
+        words: Optional[List[dict]] = None,
+    ) -> bool:
+        """Store encoded audio (ext like ".mp3") with its events; False on I/O errors."""
+        audio, meta = self._paths(key, ext)
+        size = len(data)
+        if size > self.max_bytes:
+            return False
+        try:
+            audio.parent.mkdir(parents=True, exist_ok=True)
+            audio.write_bytes(data)
+            payload = {"ext": ext, "visemes": visemes or [], "words": words or []}
+            meta.write_text(json.dumps(payload), encoding="utf-8")
+        except OSError:
+            return False
+        old = self._index.pop(key, None)
+        if old is not None:
+            self.bytes -= old[0]
+            if old[1] != ext:
+                self._paths(key, old[1])[0].unlink(missing_ok=True)
+        self._index[key] = (size, ext)
+        self.bytes += size
+        while self.bytes > self.max_bytes and self._index:
+            self._drop(next(iter(self._index)))
+            self.evicted += 1
+        return True
+
+    def _drop(self, key: str) -> None:
+        size, ext = self._index.pop(key, (0, ""))
+        self.bytes -= size
+        for p in self._paths(key, ext):
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "evicted": self.evicted,
+        }
+
+
+__all__ = ["CachedSynth", "SynthCache", "cache_key"]